@@ -0,0 +1,288 @@
+import pandas as pd
+import streamlit as st
+
+from db import get_all_sellers, save_seller
+from ui import (
+    create_error_message,
+    create_header,
+    create_nav_breadcrumb,
+    create_stats_card,
+    create_success_message,
+    go_to_diagnostics,
+    go_to_method_selection,
+    go_to_search_seller,
+)
+
+
+# Enhanced main dashboard with role-based access
+def show_dashboard():
+    user_type = st.session_state.get("user_type", "admin")
+
+    if user_type == "guest":
+        show_guest_dashboard()
+        return
+
+    # Original admin dashboard code (keep existing implementation)
+    create_nav_breadcrumb("dashboard")
+    create_header(
+        "Professional Invoice Management System",
+        "Streamlined FBR invoice processing with modern interface",
+    )
+
+    # Statistics Dashboard
+    sellers = get_all_sellers()
+
+    st.markdown("### 📊 System Overview")
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        create_stats_card(len(sellers), "Total Sellers")
+    with col2:
+        create_stats_card("2", "Processing Methods")
+    with col3:
+        create_stats_card("100%", "FBR Compliance")
+    with col4:
+        create_stats_card("24/7", "System Availability")
+
+    # Main Actions
+    st.markdown("### 🎯 Quick Actions")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown(
+            """
+        <div class="custom-card" style="height: 200px;">
+            <h3>🧾 Create Invoice</h3>
+            <p>Generate FBR-compliant invoices using our advanced processing methods</p>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+        if st.button(
+            "🚀 Start Invoice Creation",
+            type="primary",
+            use_container_width=True,
+            key="admin_invoice_btn",
+        ):
+            go_to_method_selection()
+            st.rerun()
+
+    with col2:
+        st.markdown(
+            """
+        <div class="custom-card" style="height: 200px;">
+            <h3>✏️ Update Seller</h3>
+            <p>Modify existing seller information and authentication tokens</p>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+        if st.button(
+            "📝 Update Seller Info", use_container_width=True, key="admin_update_btn"
+        ):
+            go_to_search_seller("update")
+            st.rerun()
+
+    # Seller Registration Sidebar (Admin only)
+    with st.sidebar:
+        st.markdown("### ➕ Register New Seller")
+        st.markdown("*Add new sellers to the system*")
+
+        with st.form("seller_form"):
+            seller_ntn_cnic = st.text_input(
+                "🆔 Seller NTN/CNIC", placeholder="Enter NTN or CNIC"
+            )
+            seller_business_name = st.text_input(
+                "🏢 Business Name", placeholder="Enter business name"
+            )
+            seller_province = st.selectbox(
+                "🌍 Province",
+                [
+                    "",
+                    "Sindh",
+                    "Punjab",
+                    "Khyber Pakhtunkhwa",
+                    "Balochistan",
+                    "Gilgit-Baltistan",
+                    "Azad Kashmir",
+                    "Islamabad Capital Territory",
+                ],
+            )
+            seller_address = st.text_area(
+                "📍 Address", placeholder="Enter complete address"
+            )
+            bearer_token = st.text_input(
+                "🔑 Bearer Token", placeholder="Enter API bearer token", type="password"
+            )
+
+            submitted = st.form_submit_button(
+                "💾 Register Seller", use_container_width=True
+            )
+
+            if submitted:
+                if (
+                    seller_ntn_cnic
+                    and seller_business_name
+                    and seller_province
+                    and seller_address
+                    and bearer_token
+                ):
+                    seller_data = {
+                        "seller_ntn_cnic": seller_ntn_cnic,
+                        "seller_business_name": seller_business_name,
+                        "seller_province": seller_province,
+                        "seller_address": seller_address,
+                        "bearer_token": bearer_token,
+                    }
+
+                    seller_id = save_seller(seller_data)
+                    create_success_message(
+                        f"Seller registered successfully! ID: {seller_id}"
+                    )
+                    st.rerun()
+                else:
+                    create_error_message("Please fill all required fields")
+
+        # Diagnostics (admin only)
+        if st.button(
+            "📈 Diagnostics", use_container_width=True, key="admin_diagnostics_btn"
+        ):
+            go_to_diagnostics()
+            st.rerun()
+
+        # Logout button
+        if st.button("🚪 Logout", use_container_width=True, type="secondary"):
+            for key in list(st.session_state.keys()):
+                del st.session_state[key]
+            st.rerun()
+
+
+    st.markdown(
+            """
+        <div style="height: 100px;"/>
+        """,
+            unsafe_allow_html=True,
+        )
+
+    # Sellers Table (existing code)
+    st.markdown("### 📋 Registered Sellers")
+
+    if sellers:
+        df_data = []
+        for seller in sellers:
+            df_data.append(
+                {
+                    "ID": seller[0],
+                    "NTN/CNIC": seller[1],
+                    "Business Name": seller[2],
+                    "Province": seller[3],
+                    "Address": (
+                        seller[4][:50] + "..." if len(seller[4]) > 50 else seller[4]
+                    ),
+                    "Created": seller[6] if len(seller) > 6 else "N/A",
+                }
+            )
+
+        df = pd.DataFrame(df_data)
+
+        
+
+        st.dataframe(
+            df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "ID": st.column_config.NumberColumn("ID", width="small"),
+                "NTN/CNIC": st.column_config.TextColumn("NTN/CNIC", width="medium"),
+                "Business Name": st.column_config.TextColumn(
+                    "Business Name", width="large"
+                ),
+                "Province": st.column_config.TextColumn("Province", width="medium"),
+                "Address": st.column_config.TextColumn("Address", width="large"),
+                "Created": st.column_config.TextColumn("Created", width="medium"),
+            },
+        )
+
+        st.markdown("</div>", unsafe_allow_html=True)
+        st.info(
+            "💡 Use the Quick Actions above to create invoices or update seller information"
+        )
+    else:
+        st.markdown(
+            """
+        <div class="custom-card" style="text-align: center; padding: 3rem;">
+            <h3>📝 No Sellers Registered</h3>
+            <p>Get started by registering your first seller using the sidebar form</p>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+
+# New Guest Dashboard
+def show_guest_dashboard():
+    guest_seller = st.session_state.guest_seller_data
+
+    create_nav_breadcrumb("dashboard")
+    create_header(f"Welcome {guest_seller[2]}", "Guest Invoice Creation Portal")
+
+    # Guest info display
+    st.markdown(
+        f"""
+    <div class="success-card">
+        <h4>👤 Your Business Information</h4>
+        <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 2rem;">
+            <div><strong>Business Name:</strong> {guest_seller[2]}</div>
+            <div><strong>NTN/CNIC:</strong> {guest_seller[1]}</div>
+            <div><strong>Province:</strong> {guest_seller[3]}</div>
+        </div>
+        <div style="margin-top: 1rem;">
+            <strong>Address:</strong> {guest_seller[4]}
+        </div>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    # Guest actions (invoice creation only)
+    st.markdown("### 🎯 Available Actions")
+
+    st.markdown(
+        """
+    <div class="custom-card" style="text-align: center;">
+        <div style="font-size: 4rem; margin-bottom: 1rem;">🧾</div>
+        <h3>Create Invoice</h3>
+        <p>Generate FBR-compliant invoices for your business</p>
+        <p style="color: #6b7280; font-size: 0.9rem;">Choose between manual form entry or bulk Excel processing</p>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    if st.button(
+        "🚀 Start Invoice Creation",
+        type="primary",
+        use_container_width=True,
+        key="guest_invoice_btn",
+    ):
+        go_to_method_selection()
+        st.rerun()
+
+    # Guest sidebar
+    with st.sidebar:
+        st.markdown("### 👤 Guest Session")
+        st.markdown(f"**Logged in as:** {guest_seller[2]}")
+        st.markdown(f"**NTN/CNIC:** {guest_seller[1]}")
+
+        st.markdown("---")
+        st.markdown("### ℹ️ Guest Limitations")
+        st.info(
+            "As a guest user, you can:\n- Create invoices\n- Use form and Excel methods\n- Download PDFs\n\nFor administrative access, contact the system administrator."
+        )
+
+        if st.button(
+            "🚪 Logout", use_container_width=True, type="secondary", key="guest_logout"
+        ):
+            for key in list(st.session_state.keys()):
+                del st.session_state[key]
+            st.rerun()
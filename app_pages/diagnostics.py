@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from db import get_ledger_writer_stats
+from instrumentation import export_stats_json, get_stage_stats, reset_stats
+from ui import create_header, create_nav_breadcrumb, create_stats_card, go_to_dashboard
+
+
+def show_diagnostics():
+    if st.session_state.get("user_type") != "admin":
+        go_to_dashboard()
+        st.rerun()
+        return
+
+    create_nav_breadcrumb("diagnostics")
+    create_header(
+        "Performance Diagnostics",
+        "Per-stage timings collected by this server process across all sessions",
+    )
+
+    col1, col2 = st.columns([5, 1])
+    with col2:
+        if st.button("⬅️ Dashboard", use_container_width=True, key="diag_dash_btn"):
+            go_to_dashboard()
+            st.rerun()
+
+    writer_stats = get_ledger_writer_stats()
+    if writer_stats:
+        st.markdown("### 🗄️ Ledger Write-Behind Queue")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            create_stats_card(writer_stats["pending"], "Pending Writes")
+        with col2:
+            create_stats_card(writer_stats["written"], "Rows Written")
+        with col3:
+            create_stats_card(writer_stats["failed"], "Failed Writes")
+        if writer_stats["last_error"]:
+            st.warning(f"Last write error: {writer_stats['last_error']}")
+
+    st.markdown("### ⏱️ Stage Timings")
+    stats = get_stage_stats()
+    if not stats:
+        st.info("No timings recorded yet. Use the app and come back to this page.")
+        return
+
+    stats_df = pd.DataFrame(stats)
+    st.dataframe(
+        stats_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "stage": st.column_config.TextColumn("Stage", width="large"),
+            "count": st.column_config.NumberColumn("Count"),
+            "total_ms": st.column_config.NumberColumn("Total (ms)", format="%.1f"),
+            "mean_ms": st.column_config.NumberColumn("Mean (ms)", format="%.2f"),
+            "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%.2f"),
+            "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%.2f"),
+            "max_ms": st.column_config.NumberColumn("Max (ms)", format="%.2f"),
+        },
+    )
+
+    col_export, col_reset = st.columns(2)
+    with col_export:
+        st.download_button(
+            label="⬇️ Export as JSON",
+            data=export_stats_json(),
+            file_name=f"diagnostics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json",
+            use_container_width=True,
+        )
+    with col_reset:
+        if st.button("🔄 Reset Timings", use_container_width=True):
+            reset_stats()
+            st.rerun()
@@ -0,0 +1,818 @@
+import functools
+import time
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from db import (
+    delete_mapping_profile,
+    get_seller_by_id,
+    queue_ledger_result,
+    save_mapping_profile,
+)
+from excel_import import (
+    COLUMN_MAPPINGS,
+    find_main_sheet,
+    get_column_mapping,
+    get_header_signature,
+    get_missing_required_fields,
+    process_excel_rows,
+    read_invoice_workbook,
+    to_profile_mapping,
+)
+from fbr_api import (
+    BulkJob,
+    get_fbr_error_summary,
+    post_invoice_api,
+    validate_invoice_api,
+)
+from instrumentation import format_progress
+from invoice_batch import InvoiceBatch
+from invoice_pdf import (
+    generate_combined_invoice_pdf,
+    generate_invoice_pdf,
+    generate_invoice_pdf_zip,
+    get_fbr_invoice_number,
+    get_invoice_pdf_filename,
+)
+from prevalidation import prevalidate_invoices
+from sales_tax import get_tax_issues, reconcile_taxes
+from ui import (
+    ProgressReporter,
+    create_error_message,
+    create_header,
+    create_nav_breadcrumb,
+    create_pagination,
+    create_stats_card,
+    create_success_message,
+    go_to_dashboard,
+    go_to_excel_seller_search,
+)
+
+
+def show_bulk_results(results, key_prefix, success_label, failed_label):
+    """Render bulk API results as one paginated, filterable table with a drill-down"""
+    successful = sum(1 for r in results if r["success"])
+
+    col_success, col_failed = st.columns(2)
+    with col_success:
+        create_stats_card(successful, success_label)
+    with col_failed:
+        create_stats_card(len(results) - successful, failed_label)
+
+    results_df = pd.DataFrame(
+        {
+            "Row": [r["row_number"] for r in results],
+            "Buyer": [r["buyer_name"] for r in results],
+            "Status": ["✅ Success" if r["success"] else "❌ Failed" for r in results],
+            "Status Code": pd.array([r["status_code"] for r in results], dtype="Int64"),
+            "FBR Invoice No.": [
+                str(get_fbr_invoice_number(r["response"], "")) for r in results
+            ],
+            "Error": [
+                "" if r["success"] else get_fbr_error_summary(r["response"])
+                for r in results
+            ],
+        }
+    )
+
+    col_status, col_search, col_page_size = st.columns([1, 2, 1])
+    with col_status:
+        status_filter = st.selectbox(
+            "Status", ["All", "Success", "Failed"], key=f"{key_prefix}_status_filter"
+        )
+    with col_search:
+        search_term = st.text_input(
+            "🔎 Filter by buyer, FBR invoice number or error",
+            key=f"{key_prefix}_search",
+        )
+    with col_page_size:
+        page_size = st.selectbox(
+            "Rows per page", [25, 50, 100, 250], key=f"{key_prefix}_page_size"
+        )
+
+    mask = pd.Series(True, index=results_df.index)
+    if status_filter == "Success":
+        mask &= results_df["Status"] == "✅ Success"
+    elif status_filter == "Failed":
+        mask &= results_df["Status"] == "❌ Failed"
+    if search_term:
+        term = search_term.lower()
+        mask &= (
+            results_df["Buyer"].str.lower().str.contains(term, regex=False)
+            | results_df["FBR Invoice No."].str.lower().str.contains(term, regex=False)
+            | results_df["Error"].str.lower().str.contains(term, regex=False)
+        )
+    filtered_df = results_df[mask]
+
+    start, end = create_pagination(
+        len(filtered_df), f"{key_prefix}_page", page_size=page_size
+    )
+    page_df = filtered_df.iloc[start:end]
+
+    st.dataframe(
+        page_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Row": st.column_config.NumberColumn("Row", width="small"),
+            "Buyer": st.column_config.TextColumn("Buyer", width="medium"),
+            "Status": st.column_config.TextColumn("Status", width="small"),
+            "Status Code": st.column_config.NumberColumn("Status Code", width="small"),
+            "FBR Invoice No.": st.column_config.TextColumn(
+                "FBR Invoice No.", width="medium"
+            ),
+            "Error": st.column_config.TextColumn("Error", width="large"),
+        },
+    )
+
+    # Drill-down into a single row's full response
+    if len(page_df):
+        results_by_row = {r["row_number"]: r for r in results}
+        selected_row = st.selectbox(
+            "🔍 Show full FBR response for row",
+            page_df["Row"].tolist(),
+            key=f"{key_prefix}_inspect_row",
+        )
+        with st.expander(f"Row {selected_row} - full response"):
+            st.json(results_by_row[selected_row]["response"])
+
+
+def show_mapping_editor(seller_id, df_columns, mapping):
+    """Let the user correct the column mapping and save it for this layout"""
+    header_signature = get_header_signature(df_columns)
+    not_mapped = "— Not mapped —"
+    options = [not_mapped] + list(df_columns)
+
+    with st.expander("✏️ Edit column mapping"):
+        with st.form(f"mapping_form_{header_signature}"):
+            edited_mapping = {}
+            for field_key in COLUMN_MAPPINGS:
+                current = mapping.get(field_key, not_mapped)
+                selected = st.selectbox(
+                    field_key.replace("_", " ").title(),
+                    options,
+                    index=options.index(current) if current in options else 0,
+                    key=f"mapping_{header_signature}_{field_key}",
+                )
+                if selected != not_mapped:
+                    edited_mapping[field_key] = selected
+
+            if st.form_submit_button("💾 Save mapping profile"):
+                save_mapping_profile(
+                    seller_id,
+                    header_signature,
+                    to_profile_mapping(edited_mapping),
+                    "user",
+                )
+                st.rerun()
+
+        if st.button(
+            "🔄 Re-run auto-detection", key=f"mapping_reset_{header_signature}"
+        ):
+            delete_mapping_profile(seller_id, header_signature)
+            for field_key in COLUMN_MAPPINGS:
+                st.session_state.pop(f"mapping_{header_signature}_{field_key}", None)
+            st.rerun()
+
+
+def show_tax_issues(tax_issues):
+    """Summarize the rows whose taxes or totals do not match the rate"""
+    filled = int(tax_issues["filled"].sum())
+    st.markdown("### 🧮 Tax Reconciliation")
+    col_flagged, col_filled = st.columns(2)
+    with col_flagged:
+        create_stats_card(len(tax_issues) - filled, "Rows to Review")
+    with col_filled:
+        create_stats_card(filled, "Taxes Filled In")
+
+    with st.expander(f"🔍 Rows with tax differences ({len(tax_issues)})"):
+        st.dataframe(
+            tax_issues[
+                [
+                    "row_number",
+                    "rate",
+                    "value_excl_st",
+                    "sales_tax",
+                    "expected_sales_tax",
+                    "further_tax",
+                    "expected_further_tax",
+                    "total_values",
+                    "filled",
+                    "issues",
+                ]
+            ].rename(
+                columns={
+                    "row_number": "Row",
+                    "rate": "Rate",
+                    "value_excl_st": "Value Excl. ST",
+                    "sales_tax": "Sales Tax",
+                    "expected_sales_tax": "Expected Sales Tax",
+                    "further_tax": "Further Tax",
+                    "expected_further_tax": "Expected Further Tax",
+                    "total_values": "Total",
+                    "filled": "Filled In",
+                    "issues": "Issues",
+                }
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+
+@st.fragment(run_every=1.0)
+def show_bulk_job_progress():
+    """Poll the running BulkJob, showing the results so far, and publish its
+    results once it finishes"""
+    job = st.session_state.bulk_job
+    if job is None:
+        return
+
+    results = job.get_results()
+    if job.kind == "validation":
+        # Rows rejected by the local rules are listed with FBR's results
+        results = sorted(
+            st.session_state.prevalidation_failures + results,
+            key=lambda r: r["row_number"],
+        )
+
+    if not job.finished:
+        st.progress(
+            job.done / job.total if job.total else 1.0,
+            text=format_progress(
+                job.label, job.done, job.total, time.perf_counter() - job.started_at
+            ),
+        )
+        if st.button("⏹️ Cancel", key="cancel_bulk_job"):
+            job.cancel()
+        if results:
+            show_bulk_results(
+                results,
+                f"live_{job.kind}",
+                "Successful so far",
+                "Failed so far",
+            )
+        return
+
+    st.session_state.bulk_job = None
+    if job.error:
+        st.toast(f"⚠️ Results could not be saved to the invoice ledger: {job.error}")
+    if job.kind == "validation":
+        st.session_state.validation_results = results
+    else:
+        st.session_state.posting_results = results
+        st.session_state.invoice_pdf_cache = {}
+    st.rerun()
+
+
+def show_excel_invoice_auto():
+    seller = get_seller_by_id(st.session_state.selected_seller_id)
+
+    if not seller:
+        st.error("Seller not found!")
+        if st.button("⬅️ Back to Dashboard"):
+            go_to_dashboard()
+            st.rerun()
+        return
+
+    create_nav_breadcrumb("excel_invoice")
+    create_header("Smart Excel Processing", f"Bulk invoice processing for {seller[2]}")
+
+    # Check user type to show appropriate back button
+    user_type = st.session_state.get("user_type", "admin")
+
+    col1, col2 = st.columns([5, 1])
+    with col2:
+        if user_type == "guest":
+            # Guest users go back to dashboard
+            if st.button(
+                "⬅️ Back", use_container_width=True, key="guest_excel_back_btn"
+            ):
+                go_to_dashboard()
+                st.rerun()
+        else:
+            # Admin users go back to excel seller search
+            if st.button(
+                "⬅️ Back to Search", use_container_width=True, key="admin_excel_back_btn"
+            ):
+                go_to_excel_seller_search()
+                st.rerun()
+
+    # Display seller info
+    st.markdown(
+        f"""
+    <div class="success-card">
+        <h4>🏢 Processing for Seller</h4>
+        <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 2rem;">
+            <div><strong>Name:</strong> {seller[2]}</div>
+            <div><strong>NTN/CNIC:</strong> {seller[1]}</div>
+            <div><strong>Province:</strong> {seller[3]}</div>
+        </div>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    # Excel upload section
+    st.markdown("### 📁 Smart Excel File Processing")
+
+    st.markdown(
+        """
+    <div class="custom-card">
+        <div style="text-align: center; margin-bottom: 2rem;">
+            <div style="font-size: 3rem; margin-bottom: 1rem;">🤖</div>
+            <h3>Auto-Detection Enabled</h3>
+            <p>The system will automatically detect and map your Excel columns!</p>
+        </div>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    uploaded_file = st.file_uploader(
+        "📂 Choose Excel file (.xlsx or .xls)",
+        type=["xlsx", "xls"],
+        help="Upload your Excel file with invoice data for automatic processing",
+    )
+
+    if uploaded_file is not None:
+        try:
+            # Read Excel file and find main data sheet
+            df_dict = read_invoice_workbook(uploaded_file)
+            sheet_name, main_df = find_main_sheet(df_dict)
+
+            if main_df is None or len(main_df) == 0:
+                create_error_message("No data found in the Excel file")
+                return
+
+            create_success_message(
+                f"File uploaded successfully! Found {len(main_df)} rows"
+            )
+            if sheet_name:
+                st.info(f"📋 Using sheet: **{sheet_name}**")
+
+            # Clean column names
+            main_df.columns = [str(col).strip() for col in main_df.columns]
+
+            # Auto-detect columns
+            st.markdown("### 🤖 Auto-Detection Results")
+            with st.spinner("🔍 Analyzing your Excel columns..."):
+                detected_mapping, mapping_profile = get_column_mapping(
+                    seller[0], main_df.columns
+                )
+
+            if detected_mapping:
+                if mapping_profile is None:
+                    create_success_message(
+                        f"Automatically detected {len(detected_mapping)} column mappings!"
+                    )
+                else:
+                    profile_kind = (
+                        "your edited"
+                        if mapping_profile["source"] == "user"
+                        else "the saved"
+                    )
+                    create_success_message(
+                        f"Applied {profile_kind} mapping profile for this layout "
+                        f"({len(detected_mapping)} columns, updated "
+                        f"{mapping_profile['updated_at']})"
+                    )
+
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown(
+                        """
+                    <div class="custom-card">
+                        <h4>🎯 Detected Mappings</h4>
+                    </div>
+                    """,
+                        unsafe_allow_html=True,
+                    )
+
+                    for field_key, excel_col in detected_mapping.items():
+                        field_display = field_key.replace("_", " ").title()
+                        st.markdown(f"**{field_display}:** {excel_col}")
+
+                with col2:
+                    st.markdown(
+                        """
+                    <div class="custom-card">
+                        <h4>📊 Detection Status</h4>
+                    </div>
+                    """,
+                        unsafe_allow_html=True,
+                    )
+
+                    required_fields = [
+                        "buyer_name",
+                        "hs_code",
+                        "product_desc",
+                        "value_excl_st",
+                    ]
+                    detected_required = [
+                        field for field in required_fields if field in detected_mapping
+                    ]
+
+                    create_stats_card(
+                        f"{len(detected_required)}/4", "Required Fields Detected"
+                    )
+
+                    if len(detected_required) < 4:
+                        missing = [
+                            field.replace("_", " ").title()
+                            for field in required_fields
+                            if field not in detected_mapping
+                        ]
+                        st.warning(f"⚠️ Missing: {', '.join(missing)}")
+            else:
+                st.markdown(
+                    """
+                <div class="custom-card" style="text-align: center;">
+                    <div style="font-size: 3rem; margin-bottom: 1rem;">⚠️</div>
+                    <h3>Auto-Detection Issue</h3>
+                    <p>Could not auto-detect column mappings. Please check your Excel format.</p>
+                    <p><strong>Tip:</strong> Make sure your Excel has columns like: Name, Registration No, Value, Rate, etc.</p>
+                </div>
+                """,
+                    unsafe_allow_html=True,
+                )
+
+            show_mapping_editor(seller[0], main_df.columns, detected_mapping)
+
+            # Show data preview
+            st.markdown("### 📋 Data Preview")
+
+            st.markdown(
+                """
+            <div class="custom-card">
+            """,
+                unsafe_allow_html=True,
+            )
+
+            st.dataframe(main_df.head(10), use_container_width=True)
+
+            st.markdown("</div>", unsafe_allow_html=True)
+
+            if len(main_df) > 10:
+                st.info(f"Showing first 10 rows. Total rows: {len(main_df)}")
+
+            fill_missing_taxes = st.checkbox(
+                "🧮 Fill in missing sales tax and further tax from the rate",
+                key="fill_missing_taxes",
+                help="Rows with a sales tax (or, for unregistered buyers, further tax) "
+                "of 0 get the amount computed from the rate; totals are updated",
+            )
+
+            # Process data button
+            if st.button(
+                "🚀 Process Excel Data Automatically",
+                type="primary",
+                use_container_width=True,
+            ):
+                missing_required = get_missing_required_fields(detected_mapping)
+
+                if missing_required:
+                    missing_display = [
+                        field.replace("_", " ").title() for field in missing_required
+                    ]
+                    create_error_message(
+                        f"Cannot process: Missing required fields: {', '.join(missing_display)}"
+                    )
+                    st.info(
+                        "💡 Please ensure your Excel has at least Buyer Name and Value columns"
+                    )
+                else:
+                    progress = ProgressReporter(len(main_df), "Processing row")
+                    processed_invoices, processing_errors = process_excel_rows(
+                        main_df, detected_mapping, seller, on_progress=progress.update
+                    )
+                    progress.close()
+                    tax_issues = get_tax_issues(
+                        reconcile_taxes(processed_invoices, auto_fill=fill_missing_taxes)
+                    )
+
+                    # Store processed data column by column; payloads are
+                    # rebuilt per invoice when they are sent or rendered
+                    st.session_state.processed_invoices = InvoiceBatch(
+                        processed_invoices
+                    )
+
+                    # Show processing results
+                    if processed_invoices:
+                        create_success_message(
+                            f"Successfully processed {len(processed_invoices)} invoices!"
+                        )
+
+                        st.markdown("### 📊 Processing Summary")
+                        col1, col2, col3 = st.columns(3)
+
+                        with col1:
+                            create_stats_card(len(processed_invoices), "Total Invoices")
+                        with col2:
+                            total_amount = sum(
+                                [inv["amount"] for inv in processed_invoices]
+                            )
+                            create_stats_card(f"₨ {total_amount:,.0f}", "Total Amount")
+                        with col3:
+                            create_stats_card(
+                                len(processing_errors), "Processing Errors"
+                            )
+
+                        if processing_errors:
+                            with st.expander(
+                                f"⚠️ Processing Errors ({len(processing_errors)})"
+                            ):
+                                for error in processing_errors:
+                                    st.error(f"• {error}")
+
+                        if len(tax_issues):
+                            show_tax_issues(tax_issues)
+                    else:
+                        create_error_message("No valid invoices could be processed")
+                        if processing_errors:
+                            st.error("**Errors encountered:**")
+                            for error in processing_errors:
+                                st.error(f"• {error}")
+
+        except Exception as e:
+            create_error_message(f"Error reading Excel file: {str(e)}")
+            st.info("Please ensure your file is a valid Excel (.xlsx or .xls) format")
+
+    # Action buttons for processed invoices
+    if st.session_state.processed_invoices:
+        st.markdown("### 🚀 Bulk Invoice Actions")
+
+        col5, col6, col7 = st.columns(3)
+
+        bulk_job = st.session_state.bulk_job
+        bulk_job_running = bulk_job is not None and not bulk_job.finished
+
+        with col5:
+            if st.button(
+                "✅ Validate All Invoices",
+                use_container_width=True,
+                disabled=bulk_job_running,
+            ):
+                passed_invoices, prevalidation_failures = prevalidate_invoices(
+                    st.session_state.processed_invoices
+                )
+                st.session_state.prevalidation_failures = prevalidation_failures
+                st.session_state.bulk_job = BulkJob(
+                    "validation",
+                    "Validating invoice",
+                    passed_invoices,
+                    validate_invoice_api,
+                    seller[5],
+                    on_result=functools.partial(
+                        queue_ledger_result, seller[0], "validation"
+                    ),
+                )
+                st.rerun()
+
+        with col6:
+            if st.button(
+                "📤 Post All to FBR",
+                use_container_width=True,
+                type="primary",
+                disabled=bulk_job_running,
+            ):
+                st.session_state.bulk_job = BulkJob(
+                    "posting",
+                    "Posting invoice",
+                    list(st.session_state.processed_invoices),
+                    post_invoice_api,
+                    seller[5],
+                    on_result=functools.partial(
+                        queue_ledger_result, seller[0], "posting"
+                    ),
+                )
+                st.rerun()
+
+        with col7:
+            if st.session_state.posting_results and any(
+                r["success"] for r in st.session_state.posting_results
+            ):
+                pdf_output_mode = st.radio(
+                    "PDF output",
+                    ["ZIP of separate PDFs", "Single combined PDF"],
+                    horizontal=True,
+                    key="pdf_output_mode",
+                )
+
+                if st.button("📄 Generate PDF Package", use_container_width=True):
+                    successful_posts = [
+                        r for r in st.session_state.posting_results if r["success"]
+                    ]
+
+                    if successful_posts and pdf_output_mode == "Single combined PDF":
+                        with st.spinner(
+                            f"📄 Rendering {len(successful_posts)} invoices into one PDF..."
+                        ):
+                            combined_buffer, pdf_errors = generate_combined_invoice_pdf(
+                                successful_posts
+                            )
+
+                        for error in pdf_errors:
+                            st.error(f"Failed to generate PDF for {error}")
+
+                        rendered_count = len(successful_posts) - len(pdf_errors)
+                        if rendered_count:
+                            st.download_button(
+                                label="📄 Download Combined Invoice PDF",
+                                data=combined_buffer.getvalue(),
+                                file_name=f"Invoices_{seller[1]}_{date.today().strftime('%Y-%m-%d')}.pdf",
+                                mime="application/pdf",
+                                type="secondary",
+                            )
+
+                            create_success_message(
+                                f"Combined {rendered_count} invoices into one PDF!"
+                            )
+
+                    elif successful_posts:
+                        progress = ProgressReporter(
+                            len(successful_posts), "Generating PDF"
+                        )
+                        zip_buffer, pdf_errors = generate_invoice_pdf_zip(
+                            successful_posts, on_progress=progress.update
+                        )
+                        progress.close()
+
+                        for error in pdf_errors:
+                            st.error(f"Failed to generate PDF for {error}")
+
+                        st.download_button(
+                            label="📦 Download All Invoice PDFs",
+                            data=zip_buffer.getvalue(),
+                            file_name=f"Invoices_{seller[1]}_{date.today().strftime('%Y-%m-%d')}.zip",
+                            mime="application/zip",
+                            type="secondary",
+                        )
+
+                        create_success_message(
+                            f"Generated {len(successful_posts) - len(pdf_errors)} PDF invoices!"
+                        )
+            else:
+                st.info("📄 Post invoices first to generate PDFs")
+
+        if st.session_state.bulk_job is not None:
+            show_bulk_job_progress()
+
+        if st.session_state.validation_results:
+            st.markdown("### 📋 Validation Results")
+            if st.session_state.prevalidation_failures:
+                st.info(
+                    f"ℹ️ {len(st.session_state.prevalidation_failures)} invoices failed "
+                    "local checks (see the rule IDs in the Error column) and were "
+                    "not sent to FBR"
+                )
+            show_bulk_results(
+                st.session_state.validation_results,
+                "validation",
+                "Successful Validations",
+                "Failed Validations",
+            )
+
+        if st.session_state.posting_results:
+            st.markdown("### 📤 FBR Posting Results")
+            show_bulk_results(
+                st.session_state.posting_results,
+                "posting",
+                "Successfully Posted",
+                "Failed Posts",
+            )
+
+        # Posted invoices table - PDFs are rendered per row on demand and cached
+        posted_invoices = [
+            r for r in st.session_state.posting_results if r["success"]
+        ]
+        if posted_invoices:
+            st.markdown("### 📄 Posted Invoices")
+
+            start, end = create_pagination(
+                len(posted_invoices), "posted_invoices_page", page_size=20
+            )
+
+            pdf_cache = st.session_state.invoice_pdf_cache
+            for result in posted_invoices[start:end]:
+                row_number = result["row_number"]
+                col_row, col_buyer, col_fbr, col_pdf = st.columns([1, 3, 3, 2])
+                col_row.write(f"**Row {row_number}**")
+                col_buyer.write(result["buyer_name"])
+                col_fbr.write(get_fbr_invoice_number(result["response"]))
+
+                with col_pdf:
+                    if row_number in pdf_cache:
+                        st.download_button(
+                            label="⬇️ Download PDF",
+                            data=pdf_cache[row_number],
+                            file_name=get_invoice_pdf_filename(result),
+                            mime="application/pdf",
+                            key=f"download_pdf_{row_number}",
+                            use_container_width=True,
+                        )
+                    elif st.button(
+                        "📄 Render PDF",
+                        key=f"render_pdf_{row_number}",
+                        use_container_width=True,
+                    ):
+                        try:
+                            pdf_cache[row_number] = generate_invoice_pdf(
+                                result["invoice_data"], result["response"]
+                            ).getvalue()
+                        except Exception as e:
+                            st.error(f"PDF generation failed: {str(e)}")
+                        else:
+                            st.rerun()
+
+    # Show expected format when no file uploaded
+    if uploaded_file is None:
+        st.markdown("### 📋 Expected Excel Format")
+        st.info(
+            "🤖 **Smart Detection:** The system automatically recognizes these common column patterns:"
+        )
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown(
+                """
+            <div class="custom-card">
+                <h4>🔍 Auto-Detected Patterns</h4>
+                <div style="font-size: 0.9rem; line-height: 1.6;">
+                    <strong>Buyer Information:</strong><br>
+                    • Registration No, Buyer Registration No, NTN, CNIC<br>
+                    • Name, Buyer Name, Business Name, Customer Name<br>
+                    • Type, Registration Type, Registered/Unregistered<br>
+                    • Province, Buyer Province, State<br>
+                    • Address, Buyer Address, Destination of Supply
+                </div>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+
+        with col2:
+            st.markdown(
+                """
+            <div class="custom-card">
+                <h4>💰 Financial Fields</h4>
+                <div style="font-size: 0.9rem; line-height: 1.6;">
+                    <strong>Invoice & Values:</strong><br>
+                    • Document Date, Invoice Date, Date<br>
+                    • Document Number, Invoice Number, Reference<br>
+                    • HS Code, Commodity Code, Product Code<br>
+                    • Value Excluding Sales Tax, Base Value<br>
+                    • Sales Tax, Tax Amount, ST Amount<br>
+                    • Rate, Tax Rate, Percentage
+                </div>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+
+        # Sample data format
+        st.markdown("### 📄 Sample Data Format")
+        sample_data = {
+            "invoiceType": ["Sale Invoice"],
+            "invoiceDate": ["8/21/2025"],
+            "buyerNTNC": ["Un-Register"],
+            "buyerBusinessName": ["Un-Register"],
+            "buyerProvince": ["Sindh"],
+            "buyerAddress": ["Karachi"],
+            "buyerRegistrationType": ["Unregistered"],
+            "invoiceRefNo": ["SN002"],
+            "scenarioId": ["0101.21"],
+            "item_1_hsCode": ["Test Product"],
+            "item_1_productDescription": ["18%"],
+            "item_1_rate": ["Numbers, pieces, units"],
+            "item_1_uoM": ["1"],
+            "item_1_quantity": ["1000"],
+            "item_1_valueSalesExcludingST": ["180"],
+        }
+
+        sample_df = pd.DataFrame(sample_data)
+
+        st.markdown(
+            """
+        <div class="custom-card">
+        """,
+            unsafe_allow_html=True,
+        )
+
+        st.dataframe(sample_df, use_container_width=True, hide_index=True)
+
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        st.markdown(
+            """
+        <div style="background: linear-gradient(135deg, #10b981 0%, #059669 100%); 
+                    color: white; padding: 2rem; border-radius: 15px; text-align: center; margin-top: 2rem;">
+            <h3 style="margin: 0;">🎯 Ready to Process</h3>
+            <p style="margin: 0.5rem 0 0 0;">Just upload your Excel file - the system will handle column detection automatically!</p>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
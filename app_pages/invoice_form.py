@@ -0,0 +1,456 @@
+from datetime import date
+
+import streamlit as st
+
+from db import BUYER_COLUMNS, get_seller_by_id, queue_invoice_result, search_buyers
+from fbr_api import post_invoice_api, validate_invoice_api
+from hs_codes import format_hs_code_option, get_hs_code_index
+from invoice_pdf import generate_invoice_pdf
+from prevalidation import PROVINCES
+from ui import (
+    create_error_message,
+    create_header,
+    create_nav_breadcrumb,
+    create_success_message,
+    go_to_dashboard,
+    go_to_search_seller,
+)
+
+
+def get_option_index(options, value):
+    """Position of value in a selectbox's options, or 0 (the blank option)"""
+    return options.index(value) if value in options else 0
+
+
+def show_invoice_form():
+    seller = get_seller_by_id(st.session_state.selected_seller_id)
+
+    if seller:
+        create_nav_breadcrumb("invoice")
+        create_header(f"Create Invoice", f"Manual invoice creation for {seller[2]}")
+
+        # Check user type to show appropriate back button
+        user_type = st.session_state.get("user_type", "admin")
+
+        col1, col2 = st.columns([5, 1])
+        with col2:
+            if user_type == "guest":
+                # Guest users go back to dashboard
+                if st.button(
+                    "⬅️ Back", use_container_width=True, key="guest_invoice_back_btn"
+                ):
+                    go_to_dashboard()
+                    st.rerun()
+            else:
+                # Admin users go back to search
+                if st.button(
+                    "⬅️ Back to Search",
+                    use_container_width=True,
+                    key="admin_invoice_back_btn",
+                ):
+                    go_to_search_seller("invoice")
+                    st.rerun()
+
+        # Seller info display
+        st.markdown(
+            f"""
+        <div class="success-card">
+            <h4>🏢 Selected Seller</h4>
+            <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 2rem;">
+                <div><strong>Name:</strong> {seller[2]}</div>
+                <div><strong>NTN/CNIC:</strong> {seller[1]}</div>
+                <div><strong>Province:</strong> {seller[3]}</div>
+            </div>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+        # Main form
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown(
+                """
+            <div class="custom-card">
+                <h4>🛒 Buyer Information</h4>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+
+            buyer_query = st.text_input(
+                "🔎 Find Saved Buyer",
+                placeholder="Type a buyer's NTN/CNIC or business name",
+            )
+            buyer_matches = search_buyers(seller[0], buyer_query) if buyer_query else []
+            saved_buyer = {}
+            if buyer_matches:
+                saved_buyer = dict(
+                    zip(
+                        BUYER_COLUMNS,
+                        st.selectbox(
+                            "📇 Matching Buyers",
+                            buyer_matches,
+                            format_func=lambda buyer: f"{buyer[1]} ({buyer[0]})",
+                        ),
+                    )
+                )
+            elif buyer_query:
+                st.caption("No saved buyer matches; buyers are saved when posted")
+
+            buyer_ntn_cnic = st.text_input(
+                "🆔 Buyer NTN/CNIC",
+                value=saved_buyer.get("ntn_cnic", ""),
+                placeholder="Enter buyer NTN/CNIC",
+            )
+            buyer_business_name = st.text_input(
+                "🏢 Buyer Business Name",
+                value=saved_buyer.get("business_name", ""),
+                placeholder="Enter business name",
+            )
+            province_options = [""] + PROVINCES
+            buyer_province = st.selectbox(
+                "🌍 Buyer Province",
+                province_options,
+                index=get_option_index(province_options, saved_buyer.get("province")),
+            )
+            buyer_address = st.text_input(
+                "📍 Buyer Address",
+                value=saved_buyer.get("address") or "",
+                placeholder="Enter buyer address",
+            )
+            registration_type_options = ["", "Unregistered", "Registered"]
+            buyer_registration_type = st.selectbox(
+                "📋 Registration Type",
+                registration_type_options,
+                index=get_option_index(
+                    registration_type_options, saved_buyer.get("registration_type")
+                ),
+            )
+
+        with col2:
+            st.markdown(
+                """
+            <div class="custom-card">
+                <h4>📄 Invoice Information</h4>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+
+            invoice_type = st.selectbox("📑 Invoice Type", ["Sale Invoice"], index=0)
+            invoice_date = st.date_input("📅 Invoice Date", value=date.today())
+            invoice_ref_no = st.text_input(
+                "🔢 Invoice Reference No", placeholder="Enter reference number"
+            )
+            scenario_id = st.text_input(
+                "🎯 Scenario ID", placeholder="Enter scenario ID"
+            )
+
+        # Items section
+        st.markdown("### 📦 Product Items")
+
+        with st.expander("➕ Item Details", expanded=True):
+            st.markdown(
+                """
+            <div class="custom-card">
+            """,
+                unsafe_allow_html=True,
+            )
+
+            col3, col4 = st.columns(2)
+
+            with col3:
+                hs_code_index = get_hs_code_index()
+                hs_query = st.text_input(
+                    "🔎 Find HS Code",
+                    placeholder="Type a code or product, e.g. 8471 or cotton yarn",
+                )
+                hs_matches = hs_code_index.search(hs_query)
+                hs_reference = None
+                if hs_matches:
+                    hs_reference = st.selectbox(
+                        "📚 Matching HS Codes",
+                        hs_matches,
+                        format_func=format_hs_code_option,
+                    )
+                elif hs_query:
+                    st.caption("No match in the HS code reference list")
+
+                hs_code = st.text_input(
+                    "🏷️ HS Code",
+                    value=hs_reference["hs_code"] if hs_reference else "",
+                    placeholder="Enter HS code",
+                )
+                product_description = st.text_input(
+                    "📝 Product Description", placeholder="Enter product description"
+                )
+                rate = st.text_input(
+                    "📊 Tax Rate",
+                    value=hs_reference["rate"] if hs_reference else "",
+                    placeholder="Enter tax rate (e.g., 18%)",
+                )
+                uom = st.text_input(
+                    "📏 Unit of Measure",
+                    value=hs_reference["uom"] if hs_reference else "",
+                    placeholder="Enter unit of measure",
+                )
+                listed_hs_code = hs_code_index.lookup(hs_code) if hs_code else None
+                if (
+                    listed_hs_code
+                    and listed_hs_code["uom"]
+                    and uom.strip().lower() != listed_hs_code["uom"].lower()
+                ):
+                    st.warning(
+                        f"⚠️ FBR expects the unit of measure "
+                        f"'{listed_hs_code['uom']}' for HS code {listed_hs_code['hs_code']}"
+                    )
+                quantity = st.number_input("🔢 Quantity", min_value=1, value=1)
+                value_sales_excluding_st = st.number_input(
+                    "💰 Value (Excluding Sales Tax)", min_value=0.0, value=0.0
+                )
+
+            with col4:
+                sales_tax_applicable = st.number_input(
+                    "🏛️ Sales Tax Applicable", min_value=0.0, value=0.0
+                )
+                further_tax = st.number_input(
+                    "➕ Further Tax", min_value=0.0, value=0.0
+                )
+                extra_tax = st.number_input("📈 Extra Tax", min_value=0.0, value=0.0)
+                sales_tax_withheld = st.number_input(
+                    "⚖️ Sales Tax Withheld at Source", min_value=0.0, value=0.0
+                )
+                fed_payable = st.number_input(
+                    "🏦 FED Payable", min_value=0.0, value=0.0
+                )
+                discount = st.number_input("💸 Discount", min_value=0.0, value=0.0)
+
+            # Calculate total
+            total_values = (
+                value_sales_excluding_st
+                + sales_tax_applicable
+                + further_tax
+                + extra_tax
+                - discount
+            )
+
+            st.markdown(
+                f"""
+            <div style="background: linear-gradient(135deg, #10b981 0%, #059669 100%); 
+                        color: white; padding: 1rem; border-radius: 10px; text-align: center; margin: 1rem 0;">
+                <h3 style="margin: 0;">💰 Total Invoice Value</h3>
+                <h2 style="margin: 0.5rem 0 0 0;">₨ {total_values:,.2f}</h2>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+
+            sale_type = st.text_input("🏪 Sale Type", placeholder="Enter sale type")
+            sro_schedule_no = st.text_input(
+                "📋 SRO Schedule No", placeholder="Enter SRO schedule number"
+            )
+            sro_item_serial_no = st.text_input(
+                "🔢 SRO Item Serial No", placeholder="Enter SRO item serial number"
+            )
+
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        # Action buttons
+        st.markdown("### 🚀 Invoice Actions")
+
+        col5, col6 = st.columns(2)
+
+        with col5:
+            if st.button(
+                "✅ Validate Invoice", use_container_width=True, type="secondary"
+            ):
+                # Create invoice data structure
+                invoice_data = {
+                    "sellerNTNCNIC": seller[1],
+                    "sellerBusinessName": seller[2],
+                    "sellerProvince": seller[3],
+                    "sellerAddress": seller[4],
+                    "invoiceType": invoice_type,
+                    "invoiceDate": invoice_date.strftime("%Y-%m-%d"),
+                    "buyerNTNCNIC": buyer_ntn_cnic,
+                    "buyerBusinessName": buyer_business_name,
+                    "buyerProvince": buyer_province,
+                    "buyerAddress": buyer_address,
+                    "buyerRegistrationType": buyer_registration_type,
+                    "invoiceRefNo": invoice_ref_no,
+                    "scenarioId": scenario_id,
+                    "items": [
+                        {
+                            "hsCode": hs_code,
+                            "productDescription": product_description,
+                            "rate": rate,
+                            "uoM": uom,
+                            "quantity": quantity,
+                            "valueSalesExcludingST": value_sales_excluding_st,
+                            "salesTaxApplicable": sales_tax_applicable,
+                            "furtherTax": further_tax,
+                            "extraTax": extra_tax,
+                            "salesTaxWithheldAtSource": sales_tax_withheld,
+                            "fixedNotifiedValueOrRetailPrice": 0.00,
+                            "fedPayable": fed_payable,
+                            "discount": discount,
+                            "totalValues": total_values,
+                            "saleType": sale_type,
+                            "sroScheduleNo": sro_schedule_no,
+                            "sroItemSerialNo": sro_item_serial_no,
+                        }
+                    ],
+                }
+
+                # Local validation
+                errors = []
+                required_fields = [
+                    (buyer_business_name, "Buyer Business Name"),
+                    (buyer_province, "Buyer Province"),
+                    (buyer_address, "Buyer Address"),
+                    (buyer_registration_type, "Buyer Registration Type"),
+                    (scenario_id, "Scenario ID"),
+                    (hs_code, "HS Code"),
+                    (product_description, "Product Description"),
+                    (rate, "Tax Rate"),
+                    (uom, "Unit of Measure"),
+                ]
+
+                for field_value, field_name in required_fields:
+                    if not field_value:
+                        errors.append(f"{field_name} is required")
+
+                if value_sales_excluding_st <= 0:
+                    errors.append("Value (Excluding Sales Tax) must be greater than 0")
+
+                if errors:
+                    st.markdown(
+                        """
+                    <div class="error-card">
+                        <h4>❌ Validation Failed</h4>
+                        <ul style="margin: 0.5rem 0;">
+                    """,
+                        unsafe_allow_html=True,
+                    )
+                    for error in errors:
+                        st.markdown(f"<li>{error}</li>", unsafe_allow_html=True)
+                    st.markdown("</ul></div>", unsafe_allow_html=True)
+                else:
+                    # Call FBR validation API
+                    with st.spinner("🔄 Validating with FBR API..."):
+                        status_code, response = validate_invoice_api(
+                            invoice_data, seller[5]
+                        )
+                        queue_invoice_result(
+                            seller[0], "validation", invoice_data, status_code, response
+                        )
+
+                        if status_code == 200:
+                            create_success_message("FBR Validation Successful!")
+                            st.json(response)
+                        else:
+                            create_error_message("FBR Validation Failed")
+                            if response:
+                                st.json(response)
+
+        with col6:
+            if st.button("📤 Post to FBR", use_container_width=True, type="primary"):
+                # Same validation and posting logic
+                invoice_data = {
+                    "sellerNTNCNIC": seller[1],
+                    "sellerBusinessName": seller[2],
+                    "sellerProvince": seller[3],
+                    "sellerAddress": seller[4],
+                    "invoiceType": invoice_type,
+                    "invoiceDate": invoice_date.strftime("%Y-%m-%d"),
+                    "buyerNTNCNIC": buyer_ntn_cnic,
+                    "buyerBusinessName": buyer_business_name,
+                    "buyerProvince": buyer_province,
+                    "buyerAddress": buyer_address,
+                    "buyerRegistrationType": buyer_registration_type,
+                    "invoiceRefNo": invoice_ref_no,
+                    "scenarioId": scenario_id,
+                    "items": [
+                        {
+                            "hsCode": hs_code,
+                            "productDescription": product_description,
+                            "rate": rate,
+                            "uoM": uom,
+                            "quantity": quantity,
+                            "valueSalesExcludingST": value_sales_excluding_st,
+                            "salesTaxApplicable": sales_tax_applicable,
+                            "furtherTax": further_tax,
+                            "extraTax": extra_tax,
+                            "salesTaxWithheldAtSource": sales_tax_withheld,
+                            "fixedNotifiedValueOrRetailPrice": 0.00,
+                            "fedPayable": fed_payable,
+                            "discount": discount,
+                            "totalValues": total_values,
+                            "saleType": sale_type,
+                            "sroScheduleNo": sro_schedule_no,
+                            "sroItemSerialNo": sro_item_serial_no,
+                        }
+                    ],
+                }
+
+                # Quick validation
+                required_fields = [
+                    buyer_business_name,
+                    buyer_province,
+                    buyer_address,
+                    buyer_registration_type,
+                    scenario_id,
+                    hs_code,
+                    product_description,
+                    rate,
+                    uom,
+                ]
+
+                if not all(required_fields) or value_sales_excluding_st <= 0:
+                    create_error_message(
+                        "Cannot post: Please validate the form first and fix all errors!"
+                    )
+                else:
+                    with st.spinner("📤 Posting to FBR API..."):
+                        status_code, response = post_invoice_api(
+                            invoice_data, seller[5]
+                        )
+                        queue_invoice_result(
+                            seller[0], "posting", invoice_data, status_code, response
+                        )
+
+                        if status_code == 200:
+                            create_success_message(
+                                "Invoice posted successfully to FBR!"
+                            )
+                            st.json(response)
+
+                            # Generate PDF after successful posting
+                            try:
+                                pdf_buffer = generate_invoice_pdf(
+                                    invoice_data, response
+                                )
+                                invoice_filename = f"Invoice_{seller[1]}_{invoice_date.strftime('%Y-%m-%d')}.pdf"
+
+                                st.download_button(
+                                    label="📄 Download Invoice PDF",
+                                    data=pdf_buffer.getvalue(),
+                                    file_name=invoice_filename,
+                                    mime="application/pdf",
+                                    type="secondary",
+                                )
+
+                            except Exception as e:
+                                create_error_message(f"PDF generation failed: {str(e)}")
+
+                        else:
+                            create_error_message("FBR post failed")
+                            if response:
+                                st.json(response)
+    else:
+        st.error("Seller not found!")
+        if st.button("⬅️ Back to Dashboard"):
+            go_to_dashboard()
+            st.rerun()
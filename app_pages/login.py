@@ -0,0 +1,121 @@
+import bcrypt
+import streamlit as st
+
+from db import get_seller_by_ntn_cnic
+from ui import create_error_message, create_success_message
+
+
+# Enhanced Password Authentication with dual login
+hashed_pw = bcrypt.hashpw("admin123".encode(), bcrypt.gensalt())
+
+
+def check_password():
+    """Returns True if the user entered the correct password (admin or guest)."""
+    if "password_ok" not in st.session_state:
+        st.session_state.password_ok = False
+        st.session_state.user_type = None
+        st.session_state.guest_seller_id = None
+        st.session_state.guest_seller_data = None
+
+    if st.session_state.password_ok:
+        return True
+
+    # Enhanced login form with user type selection
+    st.markdown(
+        """
+    <div style="text-align: center; padding: 3rem;">
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                    padding: 3rem; border-radius: 20px; color: white; max-width: 500px; 
+                    margin: 0 auto; box-shadow: 0 15px 35px rgba(0,0,0,0.2);">
+            <h1 style="margin-bottom: 2rem;">🔐 Invoice Management System</h1>
+            <p style="opacity: 0.9; margin-bottom: 2rem;">Secure Access Portal</p>
+        </div>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    # User type selection
+    st.markdown("### 👤 Select Login Type")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown(
+            """
+        <div class="custom-card" style="text-align: center;">
+            <h4>🛡️ Admin Access</h4>
+            <p>Full system access including seller management</p>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+    with col2:
+        st.markdown(
+            """
+        <div class="custom-card" style="text-align: center;">
+            <h4>👤 Guest Access</h4>
+            <p>Invoice creation only with your NTN/CNIC</p>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+    login_type = st.radio(
+        "Choose your access level:", ["Admin", "Guest"], horizontal=True
+    )
+
+    with st.form("login_form"):
+        st.markdown("### 🛡️ Authentication Required")
+
+        if login_type == "Admin":
+            pw = st.text_input(
+                "🔑 Enter admin password",
+                type="password",
+                placeholder="Enter admin password",
+            )
+            submit_label = "🚀 Admin Login"
+        else:
+            pw = st.text_input(
+                "🆔 Enter your NTN/CNIC",
+                placeholder="Enter your registered NTN/CNIC number",
+            )
+            submit_label = "👤 Guest Login"
+
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            submit = st.form_submit_button(submit_label, use_container_width=True)
+
+        if submit:
+            if login_type == "Admin":
+                # Admin login check
+                if bcrypt.checkpw(pw.encode(), hashed_pw):
+                    st.session_state.password_ok = True
+                    st.session_state.user_type = "admin"
+                    st.rerun()
+                else:
+                    create_error_message("Invalid admin password. Please try again.")
+
+            else:
+                # Guest login check - validate NTN/CNIC against database
+                if pw.strip():
+                    seller = get_seller_by_ntn_cnic(pw.strip())
+
+                    if seller:
+                        st.session_state.password_ok = True
+                        st.session_state.user_type = "guest"
+                        st.session_state.guest_seller_id = seller[0]
+                        st.session_state.guest_seller_data = seller
+                        create_success_message(
+                            f"Welcome {seller[2]}! Guest access granted."
+                        )
+                        st.rerun()
+                    else:
+                        create_error_message(
+                            "NTN/CNIC not found. Please contact administrator to register your business."
+                        )
+                else:
+                    create_error_message("Please enter your NTN/CNIC number.")
+
+    return False
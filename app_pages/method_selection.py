@@ -0,0 +1,194 @@
+import pandas as pd
+import streamlit as st
+
+from ui import (
+    create_header,
+    create_nav_breadcrumb,
+    go_to_dashboard,
+    go_to_excel_seller_search,
+    go_to_search_seller,
+)
+
+
+def show_method_selection():
+    create_nav_breadcrumb("invoice_method_selection")
+    create_header(
+        "Select Invoice Creation Method",
+        "Choose the best approach for your invoicing needs",
+    )
+
+    # Fixed button positioning with CSS
+    st.markdown(
+        """
+    <style>
+    .dashboard-button-container {
+        display: flex;
+        justify-content: flex-end;
+        margin: -1rem 0 2rem 0;
+        padding: 0;
+    }
+    .dashboard-button-container .stButton {
+        width: 150px;
+    }
+    .dashboard-button-container .stButton > button {
+        width: 100%;
+        background: linear-gradient(135deg, #ef4444 0%, #dc2626 100%);
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 0.5rem 1rem;
+        font-weight: 600;
+        transition: all 0.3s ease;
+    }
+    .dashboard-button-container .stButton > button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 5px 15px rgba(239, 68, 68, 0.4);
+    }
+    </style>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    st.markdown('<div class="dashboard-button-container">', unsafe_allow_html=True)
+
+    # Create columns for button positioning
+    _, _, _, col_button = st.columns([2, 2, 1, 1])
+    with col_button:
+        if st.button("⬅️ Dashboard", key="dash_btn_method"):
+            go_to_dashboard()
+            st.rerun()
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("### 🎯 Choose Processing Method")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown(
+            """
+        <div class="custom-card" style="height: 600px;">
+            <div style="text-align: center; margin-bottom: 2rem;">
+                <div style="font-size: 4rem; margin-bottom: 1rem;">📝</div>
+                <h3>Manual Form Entry</h3>
+            </div>
+            <div style="background: #f8fafc; padding: 1.5rem; border-radius: 10px; margin-bottom: 2rem;">
+                <h4>✨ Features:</h4>
+                <ul style="margin: 0; padding-left: 1.5rem;">
+                    <li>Step-by-step form filling</li>
+                    <li>Real-time validation</li>
+                    <li>Single invoice creation</li>
+                    <li>Immediate FBR feedback</li>
+                    <li>PDF generation</li>
+                </ul>
+            </div>
+            <div style="color: #6b7280;">
+                <strong>Best for:</strong> Individual invoices, detailed control, learning the system
+            </div>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+        if st.button(
+            "📝 Use Form Method",
+            type="primary",
+            use_container_width=True,
+            key="form_method_btn",
+        ):
+            st.session_state.invoice_method = "form"
+            go_to_search_seller("invoice")
+            st.rerun()
+
+    with col2:
+        st.markdown(
+            """
+        <div class="custom-card" style="height: 600px;">
+            <div style="text-align: center; margin-bottom: 2rem;">
+                <div style="font-size: 4rem; margin-bottom: 1rem;">📊</div>
+                <h3>Excel File Upload</h3>
+            </div>
+            <div style="background: #f8fafc; padding: 1.5rem; border-radius: 10px; margin-bottom: 2rem;">
+                <h4>🚀 Features:</h4>
+                <ul style="margin: 0; padding-left: 1.5rem;">
+                    <li>Bulk invoice processing</li>
+                    <li>Smart column detection</li>
+                    <li>Multiple invoices at once</li>
+                    <li>Batch FBR submission</li>
+                    <li>ZIP file PDF output</li>
+                </ul>
+            </div>
+            <div style="color: #6b7280;">
+                <strong>Best for:</strong> High volume processing, bulk operations, efficiency
+            </div>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+        if st.button(
+            "📊 Use Excel Method", use_container_width=True, key="excel_method_btn"
+        ):
+            st.session_state.invoice_method = "excel"
+            go_to_excel_seller_search()
+            st.rerun()
+
+    # Comparison table
+    st.markdown(
+        """
+        <div style="height: 100px;"/>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("### 📊 Method Comparison")
+
+    comparison_data = {
+        "Feature": [
+            "Speed",
+            "Volume",
+            "Learning Curve",
+            "Flexibility",
+            "Error Detection",
+            "PDF Output",
+        ],
+        "Manual Form": [
+            "Moderate",
+            "Single Invoice",
+            "Easy",
+            "High",
+            "Real-time",
+            "Individual",
+        ],
+        "Excel Upload": [
+            "Fast",
+            "Bulk Processing",
+            "Moderate",
+            "Moderate",
+            "Batch",
+            "ZIP Archive",
+        ],
+    }
+
+    comparison_df = pd.DataFrame(comparison_data)
+
+    # st.markdown("""
+    # <div class="custom-card">
+    # """, unsafe_allow_html=True)
+
+    st.dataframe(
+        comparison_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Feature": st.column_config.TextColumn("Feature", width="medium"),
+            "Manual Form": st.column_config.TextColumn(
+                "📝 Manual Form", width="medium"
+            ),
+            "Excel Upload": st.column_config.TextColumn(
+                "📊 Excel Upload", width="medium"
+            ),
+        },
+    )
+
+    st.markdown("</div>", unsafe_allow_html=True)
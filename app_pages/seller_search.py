@@ -0,0 +1,251 @@
+import streamlit as st
+
+from db import search_sellers
+from ui import (
+    create_header,
+    create_nav_breadcrumb,
+    create_success_message,
+    go_to_dashboard,
+    go_to_excel_invoice,
+    go_to_invoice_page,
+    go_to_method_selection,
+    go_to_update_page,
+)
+
+
+# Enhanced search seller for guest users
+def show_search_seller():
+    user_type = st.session_state.get("user_type", "admin")
+
+    if user_type == "guest":
+        # Guest users automatically use their own seller data
+        go_to_invoice_page(st.session_state.guest_seller_id)
+        st.rerun()
+        return
+
+    # Original admin search functionality (keep existing code)
+    purpose_title = (
+        "Create Invoice"
+        if st.session_state.search_purpose == "invoice"
+        else "Update Seller"
+    )
+    create_nav_breadcrumb("search_seller")
+    create_header(
+        f"Find Seller - {purpose_title}", "Search through registered sellers to proceed"
+    )
+
+    col1, col2 = st.columns([5, 1])
+    with col2:
+        if st.button("⬅️ Dashboard", use_container_width=True, key="search_dash_btn"):
+            go_to_dashboard()
+            st.rerun()
+
+    st.markdown("### 🔍 Search Sellers")
+
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        search_term = st.text_input(
+            "🔎 Search by NTN/CNIC, Business Name, or Province",
+            placeholder="Type to search...",
+            help="Enter any part of NTN/CNIC, business name, or province",
+        )
+
+    with col2:
+        st.markdown("<div style='margin-top: 1.8rem;'>", unsafe_allow_html=True)
+        search_button = st.button(
+            "🔍 Search",
+            type="primary",
+            disabled=not search_term,
+            key="admin_search_btn",
+        )
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    if search_term:
+        with st.spinner("🔍 Searching sellers..."):
+            sellers = search_sellers(search_term)
+
+        if sellers:
+            create_success_message(
+                f"Found {len(sellers)} seller(s) matching your criteria"
+            )
+
+            st.markdown("### 📋 Search Results")
+
+            for seller in sellers:
+                st.markdown(
+                    f"""
+                <div class="custom-card slide-up">
+                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                        <div style="flex: 1;">
+                            <h4 style="margin: 0 0 0.5rem 0; color: #1f2937;">{seller[2]}</h4>
+                            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; color: #6b7280;">
+                                <div><strong>NTN/CNIC:</strong> {seller[1]}</div>
+                                <div><strong>Province:</strong> {seller[3]}</div>
+                            </div>
+                            <div style="margin-top: 0.5rem; color: #6b7280;">
+                                <strong>Address:</strong> {seller[4][:80]}{'...' if len(seller[4]) > 80 else ''}
+                            </div>
+                        </div>
+                    </div>
+                </div>
+                """,
+                    unsafe_allow_html=True,
+                )
+
+                action_label = (
+                    "Create Invoice"
+                    if st.session_state.search_purpose == "invoice"
+                    else "Update Info"
+                )
+                action_icon = (
+                    "🧾" if st.session_state.search_purpose == "invoice" else "✏️"
+                )
+
+                if st.button(
+                    f"{action_icon} {action_label}",
+                    key=f"admin_select_{seller[0]}",
+                    use_container_width=True,
+                ):
+                    if st.session_state.search_purpose == "invoice":
+                        go_to_invoice_page(seller[0])
+                    else:
+                        go_to_update_page(seller[0])
+                    st.rerun()
+
+                st.markdown(
+                    "<div style='margin-bottom: 1rem;'></div>", unsafe_allow_html=True
+                )
+        else:
+            st.markdown(
+                """
+            <div class="custom-card" style="text-align: center; padding: 3rem;">
+                <div style="font-size: 4rem; margin-bottom: 1rem; opacity: 0.5;">🔍</div>
+                <h3>No Results Found</h3>
+                <p>No sellers found matching your search criteria. Try different terms or register a new seller.</p>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+    else:
+        st.markdown(
+            """
+        <div class="custom-card" style="text-align: center; padding: 3rem;">
+            <div style="font-size: 4rem; margin-bottom: 1rem;">🔍</div>
+            <h3>Enter Search Terms</h3>
+            <p>Use the search box above to find sellers by NTN/CNIC, business name, or province</p>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+
+# Enhanced excel seller search for guest users
+def show_excel_seller_search():
+    user_type = st.session_state.get("user_type", "admin")
+
+    if user_type == "guest":
+        # Guest users automatically use their own seller data for Excel processing
+        go_to_excel_invoice(st.session_state.guest_seller_id)
+        st.rerun()
+        return
+
+    # Original admin functionality (keep existing code)
+    create_nav_breadcrumb("excel_seller_search")
+    create_header(
+        "Excel Processing - Select Seller", "Choose seller for bulk invoice processing"
+    )
+
+    col1, col2 = st.columns([5, 1])
+    with col2:
+        if st.button(
+            "⬅️ Back to Methods", use_container_width=True, key="excel_back_btn"
+        ):
+            go_to_method_selection()
+            st.rerun()
+
+    st.markdown("### 🔍 Find Seller for Excel Processing")
+
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        search_term = st.text_input(
+            "🔎 Search by NTN/CNIC, Business Name, or Province",
+            placeholder="Type to search...",
+            help="Find the seller for bulk Excel processing",
+        )
+
+    with col2:
+        st.markdown("<div style='margin-top: 1.8rem;'>", unsafe_allow_html=True)
+        search_button = st.button(
+            "🔍 Search",
+            type="primary",
+            disabled=not search_term,
+            key="excel_search_btn",
+        )
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    if search_term:
+        with st.spinner("🔍 Searching sellers..."):
+            sellers = search_sellers(search_term)
+
+        if sellers:
+            create_success_message(
+                f"Found {len(sellers)} seller(s) for Excel processing"
+            )
+
+            st.markdown("### 📋 Available Sellers")
+
+            for seller in sellers:
+                st.markdown(
+                    f"""
+                <div class="custom-card slide-up">
+                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                        <div style="flex: 1;">
+                            <h4 style="margin: 0 0 0.5rem 0; color: #1f2937;">{seller[2]}</h4>
+                            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; color: #6b7280;">
+                                <div><strong>NTN/CNIC:</strong> {seller[1]}</div>
+                                <div><strong>Province:</strong> {seller[3]}</div>
+                            </div>
+                            <div style="margin-top: 0.5rem; color: #6b7280;">
+                                <strong>Address:</strong> {seller[4][:80]}{'...' if len(seller[4]) > 80 else ''}
+                            </div>
+                        </div>
+                    </div>
+                </div>
+                """,
+                    unsafe_allow_html=True,
+                )
+
+                if st.button(
+                    "📊 Start Excel Processing",
+                    key=f"excel_process_{seller[0]}",
+                    use_container_width=True,
+                    type="primary",
+                ):
+                    go_to_excel_invoice(seller[0])
+                    st.rerun()
+
+                st.markdown(
+                    "<div style='margin-bottom: 1rem;'></div>", unsafe_allow_html=True
+                )
+        else:
+            st.markdown(
+                """
+            <div class="custom-card" style="text-align: center; padding: 3rem;">
+                <div style="font-size: 4rem; margin-bottom: 1rem; opacity: 0.5;">📊</div>
+                <h3>No Sellers Found</h3>
+                <p>No sellers found matching your criteria. Please register sellers first or try different search terms.</p>
+            </div>
+            """,
+                unsafe_allow_html=True,
+            )
+    else:
+        st.markdown(
+            """
+        <div class="custom-card" style="text-align: center; padding: 3rem;">
+            <div style="font-size: 4rem; margin-bottom: 1rem;">📊</div>
+            <h3>Excel Bulk Processing</h3>
+            <p>Select a seller to begin bulk invoice processing from Excel files</p>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
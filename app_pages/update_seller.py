@@ -0,0 +1,141 @@
+import streamlit as st
+
+from db import get_seller_by_id, update_seller
+from ui import (
+    create_error_message,
+    create_header,
+    create_nav_breadcrumb,
+    create_success_message,
+    go_to_dashboard,
+    go_to_search_seller,
+)
+
+
+def show_update_seller():
+    seller = get_seller_by_id(st.session_state.selected_seller_id)
+
+    if seller:
+        create_nav_breadcrumb("update")
+        create_header(
+            f"Update Seller Information", f"Modifying details for {seller[2]}"
+        )
+
+        col1, col2 = st.columns([5, 1])
+        with col2:
+            if st.button("⬅️ Back to Search", use_container_width=True):
+                go_to_search_seller("update")
+                st.rerun()
+
+        # Current info display
+        st.markdown(
+            f"""
+        <div class="custom-card">
+            <h4>📋 Current Information</h4>
+            <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 2rem; margin-top: 1rem;">
+                <div>
+                    <strong>Business Name:</strong><br>
+                    <span style="color: #6b7280;">{seller[2]}</span>
+                </div>
+                <div>
+                    <strong>NTN/CNIC:</strong><br>
+                    <span style="color: #6b7280;">{seller[1]}</span>
+                </div>
+                <div>
+                    <strong>Province:</strong><br>
+                    <span style="color: #6b7280;">{seller[3]}</span>
+                </div>
+            </div>
+            <div style="margin-top: 1rem;">
+                <strong>Address:</strong><br>
+                <span style="color: #6b7280;">{seller[4]}</span>
+            </div>
+        </div>
+        """,
+            unsafe_allow_html=True,
+        )
+
+        st.markdown("### ✏️ Update Information")
+
+        with st.form("update_seller_form", clear_on_submit=False):
+            col1, col2 = st.columns(2)
+
+            with col1:
+                updated_ntn_cnic = st.text_input(
+                    "🆔 Seller NTN/CNIC *", value=seller[1]
+                )
+                updated_business_name = st.text_input(
+                    "🏢 Business Name *", value=seller[2]
+                )
+
+                provinces = [
+                    "",
+                    "Sindh",
+                    "Punjab",
+                    "Khyber Pakhtunkhwa",
+                    "Balochistan",
+                    "Gilgit-Baltistan",
+                    "Azad Kashmir",
+                    "Islamabad Capital Territory",
+                ]
+                current_province_index = 0
+                if seller[3] in provinces:
+                    current_province_index = provinces.index(seller[3])
+
+                updated_province = st.selectbox(
+                    "🌍 Province *", provinces, index=current_province_index
+                )
+
+            with col2:
+                updated_address = st.text_area(
+                    "📍 Address *", value=seller[4], height=100
+                )
+                updated_bearer_token = st.text_input(
+                    "🔑 Bearer Token *", value=seller[5], type="password"
+                )
+
+            col1, col2, col3 = st.columns([2, 1, 2])
+            with col2:
+                update_submitted = st.form_submit_button(
+                    "💾 Update Seller", type="primary", use_container_width=True
+                )
+
+            if update_submitted:
+                if (
+                    updated_ntn_cnic
+                    and updated_business_name
+                    and updated_province
+                    and updated_address
+                    and updated_bearer_token
+                ):
+                    updated_seller_data = {
+                        "seller_ntn_cnic": updated_ntn_cnic,
+                        "seller_business_name": updated_business_name,
+                        "seller_province": updated_province,
+                        "seller_address": updated_address,
+                        "bearer_token": updated_bearer_token,
+                    }
+
+                    update_seller(seller[0], updated_seller_data)
+                    create_success_message("Seller information updated successfully!")
+
+                    # Show updated info
+                    st.markdown(
+                        f"""
+                    <div class="success-card">
+                        <h4>✅ Updated Information</h4>
+                        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-top: 1rem;">
+                            <div><strong>Business Name:</strong> {updated_business_name}</div>
+                            <div><strong>NTN/CNIC:</strong> {updated_ntn_cnic}</div>
+                            <div><strong>Province:</strong> {updated_province}</div>
+                        </div>
+                    </div>
+                    """,
+                        unsafe_allow_html=True,
+                    )
+                else:
+                    create_error_message("Please fill all required fields")
+    else:
+        st.error("Seller not found!")
+        if st.button("⬅️ Back to Dashboard"):
+            go_to_dashboard()
+            st.rerun()
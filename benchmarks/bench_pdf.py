@@ -0,0 +1,244 @@
+"""Benchmark invoice PDF generation with synthetic invoices.
+
+Measures render time, peak memory and output size of generate_invoice_pdf
+as the item count, description length and batch size grow, and writes a
+JSON report that can be compared against a previous run.
+
+Usage:
+    python benchmarks/bench_pdf.py --output bench_pdf.json
+    python benchmarks/bench_pdf.py --quick --baseline bench_pdf.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import reportlab
+
+from invoice_pdf import generate_combined_invoice_pdf, generate_invoice_pdf
+
+ITEM_COUNTS = [1, 10, 100, 1000]
+BATCH_SIZES = [10, 100, 1000, 10000]
+DESCRIPTION_LENGTHS = [12, 200]
+
+QUICK_ITEM_COUNTS = [1, 10, 100]
+QUICK_BATCH_SIZES = [10, 100]
+
+PROVINCES = ["Sindh", "Punjab", "Khyber Pakhtunkhwa", "Balochistan"]
+WORDS = ["steel", "cotton", "yarn", "fabric", "cement", "sugar", "plastic", "wire"]
+
+
+def make_item(rng, description_length):
+    """Build one synthetic item matching the items schema of invoice_data"""
+    quantity = float(rng.randint(1, 500))
+    value = float(rng.randint(100, 500000))
+    sales_tax = round(value * 0.18, 2)
+    word_count = description_length // 6 + 1
+    description = " ".join(rng.choice(WORDS) for _ in range(word_count))
+    return {
+        "hsCode": f"{rng.randint(1000, 9999)}.{rng.randint(1000, 9999)}",
+        "productDescription": description[:description_length],
+        "rate": "18%",
+        "uoM": "Numbers, pieces, units",
+        "quantity": quantity,
+        "valueSalesExcludingST": value,
+        "salesTaxApplicable": sales_tax,
+        "furtherTax": 0.0,
+        "extraTax": 0.0,
+        "salesTaxWithheldAtSource": 0.0,
+        "fixedNotifiedValueOrRetailPrice": 0.00,
+        "fedPayable": 0.0,
+        "discount": 0.0,
+        "totalValues": value + sales_tax,
+        "saleType": "Goods at standard rate (default)",
+        "sroScheduleNo": "",
+        "sroItemSerialNo": "",
+    }
+
+
+def make_invoice(rng, item_count, description_length, ref_no=1):
+    """Build one synthetic invoice_data payload"""
+    return {
+        "sellerNTNCNIC": "1234567",
+        "sellerBusinessName": "Benchmark Traders (Pvt) Ltd",
+        "sellerProvince": "Sindh",
+        "sellerAddress": "Plot 12, Industrial Area, Karachi",
+        "invoiceType": "Sale Invoice",
+        "invoiceDate": date.today().strftime("%Y-%m-%d"),
+        "buyerNTNCNIC": str(rng.randint(1000000, 9999999)),
+        "buyerBusinessName": f"Buyer {rng.randint(1, 100000)}",
+        "buyerProvince": rng.choice(PROVINCES),
+        "buyerAddress": "Main Boulevard, Lahore",
+        "buyerRegistrationType": "Registered",
+        "invoiceRefNo": f"BENCH-{ref_no}",
+        "scenarioId": "SN002",
+        "items": [make_item(rng, description_length) for _ in range(item_count)],
+    }
+
+
+def make_response(ref_no):
+    return {"invoiceNumber": f"BENCH{ref_no:010d}"}
+
+
+def measure(fn, repeat):
+    """Run fn repeat times untraced for timing, then once traced for peak memory"""
+    timings = []
+    output_size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output_size = fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+        "peak_memory_bytes": peak,
+        "output_bytes": output_size,
+    }
+
+
+def bench_item_counts(rng, item_counts, description_lengths, repeat):
+    results = []
+    for description_length in description_lengths:
+        for item_count in item_counts:
+            invoice = make_invoice(rng, item_count, description_length)
+
+            def render():
+                return len(generate_invoice_pdf(invoice, make_response(1)).getvalue())
+
+            result = measure(render, repeat)
+            result.update(
+                {
+                    "scenario": "single_invoice",
+                    "items": item_count,
+                    "description_length": description_length,
+                    "batch_size": 1,
+                }
+            )
+            results.append(result)
+            print_result(result)
+    return results
+
+
+def bench_batches(rng, batch_sizes, items_per_invoice, repeat):
+    results = []
+    for batch_size in batch_sizes:
+        batch = [
+            {
+                "row_number": idx + 1,
+                "buyer_name": "Buyer",
+                "invoice_data": make_invoice(rng, items_per_invoice, 12, idx + 1),
+                "response": make_response(idx + 1),
+            }
+            for idx in range(batch_size)
+        ]
+
+        def render_separate():
+            return sum(
+                len(generate_invoice_pdf(r["invoice_data"], r["response"]).getvalue())
+                for r in batch
+            )
+
+        def render_combined():
+            buffer, _ = generate_combined_invoice_pdf(batch)
+            return len(buffer.getvalue())
+
+        for scenario, fn in (
+            ("batch_separate", render_separate),
+            ("batch_combined", render_combined),
+        ):
+            result = measure(fn, repeat)
+            result.update(
+                {
+                    "scenario": scenario,
+                    "items": items_per_invoice,
+                    "description_length": 12,
+                    "batch_size": batch_size,
+                    "invoices_per_second": batch_size / result["seconds_median"],
+                }
+            )
+            results.append(result)
+            print_result(result)
+    return results
+
+
+def result_key(result):
+    return (
+        result["scenario"],
+        result["items"],
+        result["description_length"],
+        result["batch_size"],
+    )
+
+
+def print_result(result, baseline=None):
+    line = (
+        f"{result['scenario']:<16} items={result['items']:<5} "
+        f"desc={result['description_length']:<4} batch={result['batch_size']:<6} "
+        f"time={result['seconds_median'] * 1000:10.1f} ms  "
+        f"peak={result['peak_memory_bytes'] / 1024 / 1024:8.2f} MiB  "
+        f"size={result['output_bytes'] / 1024:9.1f} KiB"
+    )
+    if baseline:
+        ratio = result["seconds_median"] / baseline["seconds_median"]
+        line += f"  x{ratio:.2f} vs baseline"
+    print(line, file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--quick", action="store_true", help="Skip the largest cases")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch-items", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    item_counts = QUICK_ITEM_COUNTS if args.quick else ITEM_COUNTS
+    batch_sizes = QUICK_BATCH_SIZES if args.quick else BATCH_SIZES
+    # Batches are expensive, so they are timed once per size
+    results = bench_item_counts(rng, item_counts, DESCRIPTION_LENGTHS, args.repeat)
+    results += bench_batches(rng, batch_sizes, args.batch_items, 1)
+
+    report = {
+        "benchmark": "pdf_generation",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "reportlab": reportlab.Version,
+        "seed": args.seed,
+        "results": results,
+    }
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {result_key(r): r for r in json.load(f)["results"]}
+        print("\nComparison with baseline:", file=sys.stderr)
+        for result in results:
+            print_result(result, baseline.get(result_key(result)))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""Benchmark the bulk invoice pipeline end to end against the FBR simulator.
+
+Generates synthetic workbooks whose headers come from COLUMN_MAPPINGS and
+pushes each one through parse -> detect -> transform -> validate -> post ->
+PDF -> ZIP -> ledger flush, using the same functions as the Excel page and
+fbr_batch.py. Reports per-stage throughput, per-call latency percentiles and
+peak RSS, and writes a JSON report that can be compared against a previous
+run.
+
+The simulator runs in this process; every workbook size is measured in a
+fresh child process so peak RSS belongs to that size alone. The ledger and
+sellers table live in a temporary directory, so sellers.db is never
+touched. PDFs are rendered for at most --pdf-limit posted invoices, since
+rendering is far slower than every other stage.
+
+Usage:
+    python benchmarks/bench_pipeline.py --quick
+    python benchmarks/bench_pipeline.py --rows 1000 100000 --output pipeline.json
+    python benchmarks/bench_pipeline.py --latency lognormal:80:0.5 --baseline pipeline.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import numpy as np
+import pandas as pd
+
+from excel_import import COLUMN_MAPPINGS
+from fbr_simulator import start_simulator
+
+ROW_COUNTS = [1000, 10000, 100000, 500000]
+QUICK_ROW_COUNTS = [1000, 5000]
+
+PROVINCES = ["Sindh", "Punjab", "Khyber Pakhtunkhwa", "Balochistan"]
+# Units of measure as listed in hs_codes.csv, so rows pass the local checks
+HS_CODE_UOMS = {
+    "0101.2100": "Numbers, pieces, units",
+    "5205.1100": "KG",
+    "7214.2000": "KG",
+}
+WORDS = ["steel", "cotton", "yarn", "fabric", "cement", "sugar", "plastic", "wire"]
+
+# Stages whose per-call latency is tracked by instrumentation
+STAGE_TIMINGS = {
+    "validate": "api.validate_invoice",
+    "post": "api.post_invoice",
+    "pdf": "pdf.generate_invoice_pdf",
+}
+
+
+def get_peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def get_workbook_headers():
+    """First pattern of every field, title-cased like a typical ERP export"""
+    return {field: patterns[0].title() for field, patterns in COLUMN_MAPPINGS.items()}
+
+
+def generate_workbook(path, rows, seed):
+    rng = np.random.default_rng(seed)
+    headers = get_workbook_headers()
+    values = rng.integers(100, 500000, rows).astype(float)
+    buyer_numbers = rng.integers(1000000, 9999999, rows)
+    data = {
+        "buyer_reg_no": buyer_numbers.astype(str),
+        "buyer_name": np.char.add("Buyer ", (buyer_numbers % 5000).astype(str)),
+        "buyer_type": rng.choice(["Registered", "Unregistered"], rows),
+        "buyer_province": rng.choice(PROVINCES, rows),
+        "buyer_address": np.char.add("Plot ", rng.integers(1, 999, rows).astype(str)),
+        "invoice_date": pd.Timestamp("2025-01-01")
+        + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+        "invoice_ref": np.char.add("INV-", np.arange(1, rows + 1).astype(str)),
+        "hs_code": rng.choice(list(HS_CODE_UOMS), rows),
+        "product_desc": np.char.add(
+            rng.choice(WORDS, rows), np.char.add(" ", rng.choice(WORDS, rows))
+        ),
+        "quantity": rng.integers(1, 500, rows),
+        "uom": None,
+        "rate": "18%",
+        "value_excl_st": values,
+        "sales_tax": np.round(values * 0.18, 2),
+        "further_tax": 0.0,
+        "discount": 0.0,
+        "sale_type": "Goods at standard rate (default)",
+    }
+    data["uom"] = [HS_CODE_UOMS[code] for code in data["hs_code"]]
+    df = pd.DataFrame({headers[field]: column for field, column in data.items()})
+    df.to_excel(path, index=False, engine="xlsxwriter")
+
+
+def get_workbook(workdir, rows, seed):
+    """Generate a workbook once per size and seed, then reuse it"""
+    path = os.path.join(workdir, f"invoices_{rows}_{seed}.xlsx")
+    if not os.path.exists(path):
+        print(f"Generating {rows}-row workbook...", file=sys.stderr)
+        generate_workbook(path, rows, seed)
+    return path
+
+
+def run_pipeline(workbook, concurrency, pdf_limit):
+    """Measure every stage for one workbook; runs in the child process"""
+    from db import get_ledger_writer, get_seller_by_id, init_database, save_seller
+    from excel_import import (
+        auto_detect_columns,
+        find_main_sheet,
+        process_excel_rows,
+        read_invoice_workbook,
+    )
+    from fbr_api import post_invoice_api, validate_invoice_api
+    from fbr_batch import run_api_calls
+    from instrumentation import get_stage_stats, reset_stats
+    from invoice_pdf import generate_invoice_pdf, get_invoice_pdf_filename
+
+    init_database()
+    seller = get_seller_by_id(
+        save_seller(
+            {
+                "seller_ntn_cnic": "1234567",
+                "seller_business_name": "Benchmark Traders",
+                "seller_province": "Sindh",
+                "seller_address": "Karachi",
+                "bearer_token": "benchmark-token",
+            }
+        )
+    )
+
+    stages = {}
+    state = {}
+
+    def measure(name, items, func):
+        reset_stats()
+        start = time.perf_counter()
+        state[name] = func()
+        seconds = time.perf_counter() - start
+        stage = {
+            "items": items() if callable(items) else items,
+            "seconds": seconds,
+            "peak_rss_mb": get_peak_rss_mb(),
+        }
+        stage["items_per_s"] = stage["items"] / seconds if seconds > 0 else 0.0
+        timing_stage = STAGE_TIMINGS.get(name)
+        for stat in get_stage_stats():
+            if stat["stage"] == timing_stage:
+                stage["p50_ms"] = stat["p50_ms"]
+                stage["p95_ms"] = stat["p95_ms"]
+                stage["max_ms"] = stat["max_ms"]
+        stages[name] = stage
+
+    measure(
+        "parse",
+        lambda: len(state["parse"]),
+        lambda: find_main_sheet(read_invoice_workbook(workbook))[1],
+    )
+    main_df = state["parse"]
+
+    measure("detect", 1, lambda: auto_detect_columns(main_df.columns))
+    mapping = state["detect"]
+
+    measure(
+        "transform",
+        len(main_df),
+        lambda: process_excel_rows(main_df, mapping, seller)[0],
+    )
+    processed_invoices = state["transform"]
+    # Drop the sheet so later stages' peak RSS is not inflated by it
+    main_df = state["parse"] = None
+
+    def call_and_queue(invoices, api_call, label, action):
+        from db import queue_ledger_result
+
+        results = run_api_calls(invoices, api_call, seller[5], concurrency, label)
+        for result in results:
+            queue_ledger_result(seller[0], action, result)
+        return results
+
+    measure(
+        "validate",
+        len(processed_invoices),
+        lambda: call_and_queue(
+            processed_invoices, validate_invoice_api, "Validating", "validation"
+        ),
+    )
+    valid_invoices = [
+        invoice_item
+        for invoice_item, result in zip(processed_invoices, state["validate"])
+        if result["success"]
+    ]
+
+    measure(
+        "post",
+        len(valid_invoices),
+        lambda: call_and_queue(valid_invoices, post_invoice_api, "Posting", "posting"),
+    )
+    posted = [result for result in state["post"] if result["success"]][:pdf_limit]
+
+    measure(
+        "pdf",
+        len(posted),
+        lambda: [
+            (
+                get_invoice_pdf_filename(result),
+                generate_invoice_pdf(
+                    result["invoice_data"], result["response"]
+                ).getvalue(),
+            )
+            for result in posted
+        ],
+    )
+
+    def build_zip():
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for filename, pdf in state["pdf"]:
+                zip_file.writestr(filename, pdf)
+        return buffer.getbuffer().nbytes
+
+    measure("zip", len(posted), build_zip)
+    # Most ledger rows are written while the API stages run; this is the tail
+    measure("ledger_flush", get_ledger_writer().pending, get_ledger_writer().flush)
+
+    return {
+        "rows": stages["parse"]["items"],
+        "validated": len(valid_invoices),
+        "posted": sum(result["success"] for result in state["post"]),
+        "columns_mapped": len(mapping),
+        "zip_bytes": state["zip"],
+        "stages": stages,
+        "total_seconds": sum(stage["seconds"] for stage in stages.values()),
+        "peak_rss_mb": get_peak_rss_mb(),
+    }
+
+
+def run_child(args):
+    os.chdir(tempfile.mkdtemp(prefix="bench_pipeline_"))
+    result = run_pipeline(args.child, args.concurrency, args.pdf_limit)
+    json.dump(result, sys.stdout)
+
+
+def measure_size(workbook, base_url, args):
+    env = dict(os.environ, FBR_API_BASE_URL=base_url)
+    output = subprocess.run(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--child",
+            workbook,
+            "--concurrency",
+            str(args.concurrency),
+            "--pdf-limit",
+            str(args.pdf_limit),
+        ],
+        env=env,
+        check=True,
+        stdout=subprocess.PIPE,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def get_git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result, baseline=None):
+    print(f"\n{result['rows']} rows", file=sys.stderr)
+    print(
+        f"  {'stage':<13} {'items':>8} {'seconds':>9} {'items/s':>11} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'rss MB':>8}",
+        file=sys.stderr,
+    )
+    for name, stage in result["stages"].items():
+        line = (
+            f"  {name:<13} {stage['items']:>8} {stage['seconds']:>9.2f} "
+            f"{stage['items_per_s']:>11,.1f} {stage.get('p50_ms', 0):>8.1f} "
+            f"{stage.get('p95_ms', 0):>8.1f} {stage['peak_rss_mb']:>8.0f}"
+        )
+        if baseline and name in baseline["stages"]:
+            line += f"  (baseline {baseline['stages'][name]['items_per_s']:,.1f}/s)"
+        print(line, file=sys.stderr)
+    per_minute = result["rows"] / result["total_seconds"] * 60
+    print(
+        f"  total {result['total_seconds']:.1f} s, {per_minute:,.0f} rows/min, "
+        f"peak RSS {result['peak_rss_mb']:.0f} MB",
+        file=sys.stderr,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", help="Workbook sizes to run")
+    parser.add_argument("--quick", action="store_true", help="Only small workbooks")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--pdf-limit", type=int, default=1000, help="Most PDFs rendered per size"
+    )
+    parser.add_argument(
+        "--latency", default="fixed:20", help="Simulator latency distribution"
+    )
+    parser.add_argument("--reject-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--workdir",
+        default=os.path.join(tempfile.gettempdir(), "fbr_bench_pipeline"),
+        help="Where generated workbooks are cached",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    row_counts = args.rows or (QUICK_ROW_COUNTS if args.quick else ROW_COUNTS)
+    os.makedirs(args.workdir, exist_ok=True)
+
+    simulator_options = {
+        "latency": args.latency,
+        "reject_rate": args.reject_rate,
+        "seed": args.seed,
+    }
+    server, base_url = start_simulator(**simulator_options)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {r["rows"]: r for r in json.load(f)["results"]}
+
+    results = []
+    try:
+        for rows in row_counts:
+            workbook = get_workbook(args.workdir, rows, args.seed)
+            result = measure_size(workbook, base_url, args)
+            results.append(result)
+            print_result(result, baseline.get(result["rows"]))
+    finally:
+        server.shutdown()
+
+    report = {
+        "benchmark": "pipeline_throughput",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "rev": get_git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "concurrency": args.concurrency,
+        "pdf_limit": args.pdf_limit,
+        "simulator": simulator_options,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Measure Streamlit rerun latency for every page of the app.
+
+Each page is driven headlessly with streamlit.testing's AppTest: the first
+run (cold, includes imports and one-time setup) is reported separately from
+the median/p95 of the following warm reruns. The app runs from a temporary
+copy of the tree, so sellers.db is never modified.
+
+Usage:
+    python benchmarks/bench_rerun.py                      # working tree
+    python benchmarks/bench_rerun.py --rev 7afd585        # an older commit
+    python benchmarks/bench_rerun.py --baseline before.json --output after.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_SCRIPT = "dual_user1.py"
+
+# (report name, session state overrides)
+PAGES = [
+    ("login", {}),
+    ("dashboard", {"page": "dashboard"}),
+    ("guest_dashboard", {"page": "dashboard", "user_type": "guest"}),
+    ("invoice_method_selection", {"page": "invoice_method_selection"}),
+    ("search_seller", {"page": "search_seller", "search_purpose": "invoice"}),
+    ("excel_seller_search", {"page": "excel_seller_search"}),
+    ("update", {"page": "update"}),
+    ("invoice", {"page": "invoice"}),
+    ("excel_invoice", {"page": "excel_invoice"}),
+    ("diagnostics", {"page": "diagnostics"}),
+]
+
+
+def export_tree(rev, target):
+    """Copy the working tree, or the tree at a git revision, into target"""
+    if rev is None:
+        shutil.copytree(
+            REPO_DIR,
+            target,
+            ignore=shutil.ignore_patterns(".git", "__pycache__"),
+            dirs_exist_ok=True,
+        )
+        return
+
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", rev],
+        cwd=REPO_DIR,
+        check=True,
+        capture_output=True,
+    ).stdout
+    archive_path = os.path.join(target, "tree.tar")
+    with open(archive_path, "wb") as f:
+        f.write(archive)
+    with tarfile.open(archive_path) as tar:
+        tar.extractall(target, filter="data")
+    os.remove(archive_path)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure_page(entry, state, runs):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(entry, default_timeout=120)
+    for key, value in state.items():
+        app.session_state[key] = value
+
+    start = time.perf_counter()
+    app.run()
+    cold = time.perf_counter() - start
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "cold_ms": cold * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "max_ms": max(timings) * 1000,
+        "runs": runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rev", help="Git revision to measure instead of the working tree"
+    )
+    parser.add_argument("--runs", type=int, default=10, help="Warm reruns per page")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tree_dir:
+        export_tree(args.rev, tree_dir)
+        os.chdir(tree_dir)
+        sys.path.insert(0, tree_dir)
+
+        seller = sqlite3.connect("sellers.db").execute(
+            "SELECT * FROM sellers ORDER BY id LIMIT 1"
+        ).fetchone()
+        if seller is None:
+            sys.exit("sellers.db has no sellers to drive the seller pages with")
+
+        logged_in = {
+            "password_ok": True,
+            "user_type": "admin",
+            "selected_seller_id": seller[0],
+            "guest_seller_id": seller[0],
+            "guest_seller_data": seller,
+        }
+
+        results = {}
+        for name, overrides in PAGES:
+            state = dict(logged_in, **overrides) if overrides else {}
+            results[name] = measure_page(
+                os.path.join(tree_dir, ENTRY_SCRIPT), state, args.runs
+            )
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["pages"]
+
+    for name, result in results.items():
+        line = (
+            f"{name:<26} cold={result['cold_ms']:8.1f} ms  "
+            f"median={result['median_ms']:8.1f} ms  p95={result['p95_ms']:8.1f} ms"
+        )
+        if name in baseline:
+            line += f"  (baseline median={baseline[name]['median_ms']:8.1f} ms)"
+        print(line, file=sys.stderr)
+
+    report = {
+        "benchmark": "streamlit_rerun",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "rev": args.rev or "working-tree",
+        "pages": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
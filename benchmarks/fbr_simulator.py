@@ -0,0 +1,338 @@
+"""Local stand-in for the FBR digital invoicing sandbox gateway.
+
+Serves POST /validateinvoicedata_sb and POST /postinvoicedata_sb with
+responses shaped like the real gateway's, so the app, fbr_batch.py,
+fbr_service.py and the benchmarks can run against it by setting
+FBR_API_BASE_URL=http://127.0.0.1:8899.
+
+Outcomes are deterministic: whether an invoice is rejected, and the invoice
+number it is posted under, are derived from a hash of its payload and
+--seed, so the same workbook gets the same results on every run. Latency
+is drawn from a configurable distribution; a token bucket answers 429 when
+requests arrive faster than --rate-limit. GET /stats returns request counts
+per endpoint and status; POST /stats/reset clears them.
+
+Latency distributions (milliseconds):
+    fixed:50            always 50 ms
+    uniform:20:200      uniform between 20 and 200 ms
+    normal:120:30       normal, mean 120, sd 30 (clamped at 0)
+    lognormal:100:0.5   lognormal with median 100 and sigma 0.5
+
+Usage:
+    python benchmarks/fbr_simulator.py --port 8899 --latency lognormal:150:0.4 \\
+        --reject-rate 0.05 --server-error-rate 0.01 --rate-limit 200
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REQUIRED_INVOICE_FIELDS = [
+    "invoiceType",
+    "invoiceDate",
+    "sellerNTNCNIC",
+    "sellerBusinessName",
+    "buyerBusinessName",
+]
+REQUIRED_ITEM_FIELDS = ["hsCode", "rate", "uoM", "valueSalesExcludingST"]
+
+
+def parse_latency(spec):
+    """Turn a latency spec into a function returning a delay in seconds"""
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(":") if value]
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+    if kind not in expected or len(values) != expected[kind]:
+        raise ValueError(f"invalid latency spec: {spec}")
+
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(*values) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(*values)) / 1000
+    return lambda rng: rng.lognormvariate(math.log(values[0]), values[1]) / 1000
+
+
+class TokenBucket:
+    """Allows rate requests per second on average, with bursts up to burst"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class GatewaySimulator:
+    def __init__(
+        self,
+        latency="fixed:50",
+        reject_rate=0.0,
+        server_error_rate=0.0,
+        rate_limit=0,
+        burst=None,
+        seed=0,
+    ):
+        self.delay = parse_latency(latency)
+        self.reject_rate = reject_rate
+        self.server_error_rate = server_error_rate
+        self.bucket = None
+        if rate_limit:
+            self.bucket = TokenBucket(rate_limit, burst or rate_limit)
+        self.seed = seed
+        self.local = threading.local()
+        self.counts = Counter()
+        self.counts_lock = threading.Lock()
+
+    def rng(self):
+        # One generator per handler thread; random.Random is not thread-safe
+        if not hasattr(self.local, "rng"):
+            self.local.rng = random.Random(f"{self.seed}-{threading.get_ident()}")
+        return self.local.rng
+
+    def payload_fraction(self, digest, offset):
+        """Deterministic number in [0, 1) taken from the payload hash"""
+        return int(digest[offset : offset + 8], 16) / 0x100000000
+
+    def count(self, endpoint, status):
+        with self.counts_lock:
+            self.counts[f"{endpoint} {status}"] += 1
+
+    def get_stats(self):
+        with self.counts_lock:
+            return dict(self.counts)
+
+    def reset_stats(self):
+        with self.counts_lock:
+            self.counts.clear()
+
+    def handle(self, endpoint, invoice, authorized):
+        """Return (status, body) for one gateway call"""
+        if self.bucket is not None and not self.bucket.take():
+            return 429, {"error": "Too many requests, retry later"}
+
+        time.sleep(self.delay(self.rng()))
+
+        if not authorized:
+            return 401, {"error": "Unauthorized: bearer token missing"}
+
+        canonical = json.dumps(invoice, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(f"{self.seed}:{canonical}".encode()).hexdigest()
+
+        if self.payload_fraction(digest, 0) < self.server_error_rate:
+            return 500, {"error": "Internal server error"}
+
+        errors = self.check_schema(invoice)
+        if not errors and self.payload_fraction(digest, 8) < self.reject_rate:
+            errors = [("0052", "Provide proper HS Code with invoice no. (simulated)")]
+        if errors:
+            return 400, self.build_response(invoice, errors)
+
+        response = self.build_response(invoice, [])
+        if endpoint == "post":
+            seller = str(invoice.get("sellerNTNCNIC", "0000000"))
+            serial = int(digest[16:32], 16) % 10**14
+            response["invoiceNumber"] = f"{seller}DI{serial:014d}"
+            response["dated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return 200, response
+
+    def check_schema(self, invoice):
+        errors = [
+            ("0001", f"{field} is required")
+            for field in REQUIRED_INVOICE_FIELDS
+            if not invoice.get(field)
+        ]
+        items = invoice.get("items")
+        if not isinstance(items, list) or not items:
+            errors.append(("0002", "At least one item is required"))
+            return errors
+        for number, item in enumerate(items, start=1):
+            for field in REQUIRED_ITEM_FIELDS:
+                if not isinstance(item, dict) or item.get(field) in (None, ""):
+                    errors.append(("0003", f"Item {number}: {field} is required"))
+        return errors
+
+    def build_response(self, invoice, errors):
+        items = invoice.get("items")
+        if not isinstance(items, list):
+            items = []
+        status_code = "01" if errors else "00"
+        return {
+            "validationResponse": {
+                "statusCode": status_code,
+                "status": "Invalid" if errors else "Valid",
+                "errorCode": errors[0][0] if errors else "",
+                "error": "; ".join(message for _, message in errors),
+                "invoiceStatuses": [
+                    {
+                        "itemSNo": str(number),
+                        "statusCode": status_code,
+                        "status": "Invalid" if errors else "Valid",
+                        "invoiceNo": None,
+                        "errorCode": "",
+                        "error": "",
+                    }
+                    for number in range(1, len(items) + 1)
+                ],
+            }
+        }
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    simulator = None
+    endpoints = {
+        "/validateinvoicedata_sb": "validate",
+        "/postinvoicedata_sb": "post",
+    }
+
+    # Keep-alive, so clients reusing connections are not penalised
+    protocol_version = "HTTP/1.1"
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self.send_json(200, self.simulator.get_stats())
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+
+        if self.path == "/stats/reset":
+            self.simulator.reset_stats()
+            self.send_json(200, {})
+            return
+
+        # Match on the last path segment so any base path prefix works
+        endpoint = self.endpoints.get("/" + self.path.rstrip("/").rsplit("/", 1)[-1])
+        if endpoint is None:
+            self.send_json(404, {"error": "not found"})
+            return
+
+        try:
+            invoice = json.loads(body or b"{}")
+            if not isinstance(invoice, dict):
+                raise ValueError("invoice must be a JSON object")
+        except ValueError as e:
+            self.simulator.count(endpoint, 400)
+            self.send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+
+        authorization = self.headers.get("Authorization", "")
+        authorized = authorization.startswith("Bearer ") and len(authorization) > 7
+        status, response = self.simulator.handle(endpoint, invoice, authorized)
+        self.simulator.count(endpoint, status)
+        self.send_json(status, response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_simulator_server(host="127.0.0.1", port=0, **options):
+    """Build a simulator HTTP server; port 0 picks a free port"""
+    handler = type(
+        "BoundSimulatorHandler",
+        (SimulatorHandler,),
+        {"simulator": GatewaySimulator(**options)},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_simulator(host="127.0.0.1", port=0, **options):
+    """Run a simulator on a background thread; returns (server, base_url).
+
+    Call server.shutdown() to stop it.
+    """
+    server = create_simulator_server(host, port, **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument(
+        "--latency", default="fixed:50", help="Latency distribution, see above"
+    )
+    parser.add_argument(
+        "--reject-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of well-formed invoices rejected with a validation error",
+    )
+    parser.add_argument(
+        "--server-error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of invoices answered with HTTP 500",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0,
+        help="Requests per second before answering 429 (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--burst", type=float, help="Token bucket size (default: --rate-limit)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    parse_latency(args.latency)
+    server = create_simulator_server(
+        args.host,
+        args.port,
+        latency=args.latency,
+        reject_rate=args.reject_rate,
+        server_error_rate=args.server_error_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        seed=args.seed,
+    )
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+    print(f"FBR gateway simulator on {base_url}")
+    print(f"Point the app at it with FBR_API_BASE_URL={base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""Load-test the Streamlit app with many concurrent user sessions.
+
+Every simulated operator is a streamlit.testing AppTest session running in
+its own process (AppTest keeps process-wide state, so sessions cannot share
+one). All sessions start together and go through the month-end flow:
+
+    guest login with the seller's NTN/CNIC (check_password)
+    -> seller search -> Excel upload -> Validate All -> Post All
+
+AppTest cannot drive st.file_uploader, so the upload step runs the page's
+own parsing and transformation (read_invoice_workbook, auto_detect_columns,
+process_excel_rows) on a synthetic workbook and stores the result in the
+session, exactly where the page would. While a bulk job runs, the session
+reruns once a second like the page's polling fragment. FBR calls go to the
+gateway simulator, started as a separate process.
+
+For every concurrency level the report gives rerun latency per step, the
+CPU time and peak RSS of all sessions combined, and SQLite write-lock waits
+measured by a probe that repeatedly opens a write transaction on the shared
+database. Separate processes do not contend for one interpreter lock the
+way a real server's sessions do, so CPU contention shows up only once the
+machine's cores are busy. The app runs against a temporary copy of
+sellers.db, so the real one is untouched.
+
+Usage:
+    python benchmarks/load_sessions.py --sessions 1 10 30
+    python benchmarks/load_sessions.py --quick --output load.json
+    python benchmarks/load_sessions.py --baseline load.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+ENTRY_SCRIPT = os.path.join(REPO_DIR, "dual_user1.py")
+sys.path.insert(0, REPO_DIR)
+
+from bench_pipeline import generate_workbook, get_git_revision, get_peak_rss_mb
+from bench_rerun import percentile
+
+SESSION_COUNTS = [1, 5, 10, 30]
+QUICK_SESSION_COUNTS = [1, 5]
+
+# How often a session reruns while its bulk job is running (run_every=1.0)
+POLL_INTERVAL = 1.0
+
+
+def summarize(values):
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "max_ms": max(values) * 1000,
+    }
+
+
+class LockProbe(threading.Thread):
+    """Measures how long it takes to get SQLite's write lock, over and over"""
+
+    def __init__(self, db_path, interval=0.1):
+        super().__init__(daemon=True)
+        self.db_path = db_path
+        self.interval = interval
+        self.waits = []
+        self.timeouts = 0
+        self.stopping = threading.Event()
+
+    def run(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        while not self.stopping.wait(self.interval):
+            start = time.perf_counter()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError:
+                self.timeouts += 1
+                continue
+            self.waits.append(time.perf_counter() - start)
+            conn.execute("ROLLBACK")
+        conn.close()
+
+    def stop(self):
+        self.stopping.set()
+        self.join()
+        return dict(summarize(self.waits), timeouts=self.timeouts)
+
+
+def start_simulator_process(latency, reject_rate):
+    """Run the FBR simulator in its own process; returns (process, base_url)"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(BENCH_DIR, "fbr_simulator.py"),
+            "--port",
+            str(port),
+            "--latency",
+            latency,
+            "--reject-rate",
+            str(reject_rate),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"{base_url}/stats", timeout=1)
+            return process, base_url
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("FBR simulator did not start")
+
+
+def find_button(app, label):
+    for button in app.button:
+        if label in button.label:
+            return button
+    raise LookupError(
+        f"no button labelled {label!r} on page {app.session_state['page']!r}"
+    )
+
+
+def run_session(session_no, seller, workbook, start_at):
+    """Run one operator's flow in a worker process; returns its measurements"""
+    # Streamlit's deprecation notices would flood the console from every session
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 2)
+
+    from streamlit.testing.v1 import AppTest
+
+    from db import get_seller_by_id
+    from excel_import import (
+        find_main_sheet,
+        get_column_mapping,
+        process_excel_rows,
+        read_invoice_workbook,
+    )
+    from invoice_batch import InvoiceBatch
+
+    timings = {}
+    errors = []
+    app = AppTest.from_file(ENTRY_SCRIPT, default_timeout=600)
+
+    def record(name, seconds):
+        timings.setdefault(name, []).append(seconds)
+
+    def step(name, action=None):
+        start = time.perf_counter()
+        (action or app.run)()
+        record(name, time.perf_counter() - start)
+        if app.exception:
+            raise RuntimeError(app.exception[0].value)
+
+    def run_bulk(name, button_label):
+        step(f"{name}_click", find_button(app, button_label).click().run)
+        while True:
+            job = app.session_state["bulk_job"]
+            if job is None or job.finished:
+                break
+            time.sleep(POLL_INTERVAL)
+            step(f"{name}_poll")
+        # The rerun after the job finishes publishes its results
+        step(f"{name}_results")
+
+    # Imports are done; start together with the other sessions
+    time.sleep(max(0.0, start_at - time.time()))
+    start_times = os.times()
+
+    current = "login_page"
+    try:
+        step("login_page")
+        current = "guest_login"
+        app.radio[0].set_value("Guest")
+        step("login_type")
+        app.text_input[0].input(seller[1])
+        step("guest_login", find_button(app, "Guest Login").click().run)
+        if not app.session_state["password_ok"]:
+            raise RuntimeError("guest login was rejected")
+
+        current = "seller_search"
+        app.session_state["page"] = "search_seller"
+        app.session_state["search_purpose"] = "invoice"
+        step("search_page")
+        app.text_input[0].input(seller[2][:3])
+        step("seller_search")
+
+        current = "upload"
+        app.session_state["page"] = "excel_invoice"
+        app.session_state["selected_seller_id"] = seller[0]
+        step("excel_page")
+        start = time.perf_counter()
+        _, main_df = find_main_sheet(read_invoice_workbook(workbook))
+        mapping, _ = get_column_mapping(seller[0], main_df.columns)
+        processed_invoices, _ = process_excel_rows(
+            main_df, mapping, get_seller_by_id(seller[0])
+        )
+        record("upload_processing", time.perf_counter() - start)
+        app.session_state["processed_invoices"] = InvoiceBatch(processed_invoices)
+        step("excel_processed")
+
+        current = "validate"
+        run_bulk("validate", "Validate All Invoices")
+        current = "post"
+        run_bulk("post", "Post All to FBR")
+    except Exception as e:
+        errors.append(f"session {session_no} {current}: {e}")
+
+    end_times = os.times()
+    return {
+        "timings": timings,
+        "errors": errors,
+        "cpu_seconds": (end_times.user - start_times.user)
+        + (end_times.system - start_times.system),
+        "peak_rss_mb": get_peak_rss_mb(),
+    }
+
+
+def run_level(sessions, seller, workbook, db_path):
+    probe = LockProbe(db_path)
+    # Leave time for every worker to start and import the app's modules
+    start_at = time.time() + 5 + sessions * 0.2
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=sessions, mp_context=context) as executor:
+        futures = [
+            executor.submit(run_session, n, seller, workbook, start_at)
+            for n in range(sessions)
+        ]
+        time.sleep(max(0.0, start_at - time.time()))
+        probe.start()
+        start = time.perf_counter()
+        session_results = [future.result() for future in futures]
+        wall = time.perf_counter() - start
+    lock_waits = probe.stop()
+
+    timings = {}
+    for result in session_results:
+        for step, values in result["timings"].items():
+            timings.setdefault(step, []).extend(values)
+    reruns = [
+        seconds
+        for step, values in timings.items()
+        if step != "upload_processing"
+        for seconds in values
+    ]
+    cpu_seconds = sum(result["cpu_seconds"] for result in session_results)
+    return {
+        "sessions": sessions,
+        "wall_seconds": wall,
+        "reruns": summarize(reruns),
+        "steps": {step: summarize(values) for step, values in timings.items()},
+        "sqlite_write_lock_wait": lock_waits,
+        "cpu_seconds": cpu_seconds,
+        "cpu_cores_used": cpu_seconds / wall,
+        "peak_rss_mb": sum(result["peak_rss_mb"] for result in session_results),
+        "peak_rss_mb_per_session": max(
+            result["peak_rss_mb"] for result in session_results
+        ),
+        "errors": [error for result in session_results for error in result["errors"]],
+    }
+
+
+def print_level(result, baseline=None):
+    reruns = result["reruns"]
+    line = (
+        f"{result['sessions']:>4} sessions  rerun p50={reruns.get('p50_ms', 0):7.1f} ms "
+        f"p95={reruns.get('p95_ms', 0):7.1f} ms  cpu={result['cpu_cores_used']:.2f} cores  "
+        f"rss={result['peak_rss_mb']:.0f} MB  "
+        f"lock p95={result['sqlite_write_lock_wait'].get('p95_ms', 0):.1f} ms  "
+        f"errors={len(result['errors'])}"
+    )
+    if baseline:
+        line += f"  (baseline rerun p95={baseline['reruns'].get('p95_ms', 0):7.1f} ms)"
+    print(line, file=sys.stderr)
+    for error in result["errors"][:5]:
+        print(f"      {error}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sessions", type=int, nargs="+", help="Concurrency levels to run"
+    )
+    parser.add_argument("--quick", action="store_true", help="Only small levels")
+    parser.add_argument(
+        "--rows", type=int, default=200, help="Invoices per uploaded workbook"
+    )
+    parser.add_argument(
+        "--latency", default="lognormal:150:0.4", help="Simulator latency"
+    )
+    parser.add_argument("--reject-rate", type=float, default=0.02)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    session_counts = args.sessions or (
+        QUICK_SESSION_COUNTS if args.quick else SESSION_COUNTS
+    )
+
+    simulator, base_url = start_simulator_process(args.latency, args.reject_rate)
+    # Must be set before the app imports fbr_api
+    os.environ["FBR_API_BASE_URL"] = base_url
+
+    work_dir = tempfile.mkdtemp(prefix="load_sessions_")
+    try:
+        shutil.copy(os.path.join(REPO_DIR, "sellers.db"), work_dir)
+        os.chdir(work_dir)
+        db_path = os.path.join(work_dir, "sellers.db")
+
+        seller = sqlite3.connect(db_path).execute(
+            "SELECT * FROM sellers ORDER BY id LIMIT 1"
+        ).fetchone()
+        if seller is None:
+            sys.exit("sellers.db has no sellers to log in with")
+
+        workbook = os.path.join(work_dir, "upload.xlsx")
+        generate_workbook(workbook, args.rows, seed=42)
+
+        baseline = {}
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = {r["sessions"]: r for r in json.load(f)["levels"]}
+
+        levels = []
+        for sessions in session_counts:
+            result = run_level(sessions, seller, workbook, db_path)
+            levels.append(result)
+            print_level(result, baseline.get(sessions))
+    finally:
+        simulator.terminate()
+        os.chdir(REPO_DIR)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "benchmark": "session_load",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "rev": get_git_revision(),
+        "cpu_count": os.cpu_count(),
+        "rows_per_upload": args.rows,
+        "simulator": {"latency": args.latency, "reject_rate": args.reject_rate},
+        "levels": levels,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,528 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import zlib
+
+from instrumentation import timed
+from invoice_batch import to_payload_dict
+from write_behind import WriteBehindQueue
+
+
+# Database setup (keeping original logic)
+def init_database():
+    conn = sqlite3.connect("sellers.db")
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sellers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            seller_ntn_cnic TEXT NOT NULL,
+            seller_business_name TEXT NOT NULL,
+            seller_province TEXT NOT NULL,
+            seller_address TEXT NOT NULL,
+            bearer_token TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_seller_ntn_cnic ON sellers(seller_ntn_cnic)"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_seller_business_name ON sellers(seller_business_name)"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_seller_province ON sellers(seller_province)"""
+    )
+
+    # Ledger of every validate/post outcome, one row per API call
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS invoices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            seller_id INTEGER NOT NULL,
+            action TEXT NOT NULL,
+            invoice_ref_no TEXT,
+            invoice_date TEXT,
+            payload_hash TEXT NOT NULL,
+            fbr_invoice_number TEXT,
+            status TEXT NOT NULL,
+            status_code INTEGER,
+            response BLOB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_invoices_seller_date ON invoices(seller_id, invoice_date)"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_invoices_seller_created ON invoices(seller_id, created_at)"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_invoices_fbr_number ON invoices(fbr_invoice_number)"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_invoices_ref_no ON invoices(invoice_ref_no)"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_invoices_payload_hash ON invoices(payload_hash)"""
+    )
+
+    # Column mapping per seller and Excel header layout, reused on repeat uploads
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS column_mapping_profiles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            seller_id INTEGER NOT NULL,
+            header_signature TEXT NOT NULL,
+            mapping TEXT NOT NULL,
+            source TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (seller_id, header_signature)
+        )
+    """
+    )
+
+    # Each seller's registered buyers, kept up to date from posted invoices
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS buyers (
+            seller_id INTEGER NOT NULL,
+            ntn_cnic TEXT NOT NULL,
+            business_name TEXT NOT NULL,
+            name_key TEXT NOT NULL,
+            province TEXT,
+            address TEXT,
+            registration_type TEXT,
+            invoice_count INTEGER NOT NULL DEFAULT 1,
+            last_posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (seller_id, ntn_cnic)
+        )
+    """
+    )
+
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_buyers_name_key ON buyers(seller_id, name_key)"""
+    )
+
+    # Workbooks picked up by the watch-folder daemon, keyed by content hash
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingested_files (
+            fingerprint TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            seller_id INTEGER,
+            status TEXT NOT NULL,
+            summary TEXT,
+            processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+
+    conn.commit()
+    conn.close()
+
+
+# Database operations (keeping original functionality)
+def save_seller(seller_data):
+    conn = sqlite3.connect("sellers.db")
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO sellers (seller_ntn_cnic, seller_business_name, seller_province, seller_address, bearer_token)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+        (
+            seller_data["seller_ntn_cnic"],
+            seller_data["seller_business_name"],
+            seller_data["seller_province"],
+            seller_data["seller_address"],
+            seller_data["bearer_token"],
+        ),
+    )
+    conn.commit()
+    seller_id = cursor.lastrowid
+    conn.close()
+    return seller_id
+
+
+def update_seller(seller_id, seller_data):
+    conn = sqlite3.connect("sellers.db")
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        UPDATE sellers 
+        SET seller_ntn_cnic = ?, seller_business_name = ?, seller_province = ?, seller_address = ?, bearer_token = ?
+        WHERE id = ?
+    """,
+        (
+            seller_data["seller_ntn_cnic"],
+            seller_data["seller_business_name"],
+            seller_data["seller_province"],
+            seller_data["seller_address"],
+            seller_data["bearer_token"],
+            seller_id,
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_all_sellers():
+    conn = sqlite3.connect("sellers.db")
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM sellers ORDER BY created_at DESC")
+    sellers = cursor.fetchall()
+    conn.close()
+    return sellers
+
+
+@timed("db.get_seller_by_id")
+def get_seller_by_id(seller_id):
+    conn = sqlite3.connect("sellers.db")
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM sellers WHERE id = ?", (seller_id,))
+    seller = cursor.fetchone()
+    conn.close()
+    return seller
+
+
+def get_seller_by_ntn_cnic(ntn_cnic):
+    conn = sqlite3.connect("sellers.db")
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM sellers WHERE seller_ntn_cnic = ?", (ntn_cnic,))
+    seller = cursor.fetchone()
+    conn.close()
+    return seller
+
+
+@timed("db.search_sellers")
+def search_sellers(search_term):
+    conn = sqlite3.connect("sellers.db")
+    cursor = conn.cursor()
+    search_query = f"%{search_term.lower()}%"
+    cursor.execute(
+        """
+        SELECT * FROM sellers 
+        WHERE LOWER(seller_ntn_cnic) LIKE ? 
+        OR LOWER(seller_business_name) LIKE ? 
+        OR LOWER(seller_province) LIKE ?
+        ORDER BY seller_business_name
+    """,
+        (search_query, search_query, search_query),
+    )
+    sellers = cursor.fetchall()
+    conn.close()
+    return sellers
+
+
+# Invoice ledger
+def get_payload_hash(invoice_data):
+    """Stable SHA-256 of an invoice payload, independent of key order"""
+    canonical = json.dumps(
+        to_payload_dict(invoice_data), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def compress_response(response):
+    return zlib.compress(json.dumps(response).encode())
+
+
+def decompress_response(blob):
+    return json.loads(zlib.decompress(blob)) if blob else None
+
+
+def build_ledger_row(seller_id, action, result):
+    """Turn a bulk API result dict into an invoices table row"""
+    invoice_data = result["invoice_data"]
+    response = result["response"]
+
+    fbr_invoice_number = None
+    if isinstance(response, dict):
+        if "invoiceNumber" in response:
+            fbr_invoice_number = response["invoiceNumber"]
+        elif "data" in response and response["data"]:
+            fbr_invoice_number = response["data"].get("invoiceNumber")
+
+    return (
+        seller_id,
+        action,
+        invoice_data.get("invoiceRefNo"),
+        invoice_data.get("invoiceDate"),
+        get_payload_hash(invoice_data),
+        fbr_invoice_number,
+        "success" if result["success"] else "failed",
+        result["status_code"],
+        compress_response(response),
+    )
+
+
+INSERT_LEDGER_ROW = """
+    INSERT INTO invoices (seller_id, action, invoice_ref_no, invoice_date, payload_hash,
+                          fbr_invoice_number, status, status_code, response)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_ledger_writer = None
+_ledger_writer_lock = threading.Lock()
+
+
+def get_ledger_writer():
+    """Process-wide write-behind queue for ledger writes"""
+    global _ledger_writer
+    with _ledger_writer_lock:
+        if _ledger_writer is None:
+            _ledger_writer = WriteBehindQueue("sellers.db")
+        return _ledger_writer
+
+
+def get_ledger_writer_stats():
+    """Counters of the ledger write-behind queue, or None if it has not started"""
+    writer = _ledger_writer
+    if writer is None:
+        return None
+    return {
+        "pending": writer.pending,
+        "written": writer.written,
+        "failed": writer.failed,
+        "last_error": writer.last_error,
+    }
+
+
+def queue_ledger_result(seller_id, action, result):
+    """Queue one bulk API result for the ledger; written in batches off-thread.
+
+    A successful post also records its buyer in the buyers directory.
+    """
+    get_ledger_writer().put(
+        INSERT_LEDGER_ROW, build_ledger_row(seller_id, action, result)
+    )
+    if action == "posting" and result["success"]:
+        buyer_row = build_buyer_row(seller_id, result["invoice_data"])
+        if buyer_row is not None:
+            get_ledger_writer().put(UPSERT_BUYER, buyer_row)
+
+
+def queue_invoice_result(seller_id, action, invoice_data, status_code, response):
+    """Queue a single validate/post outcome, e.g. from the manual invoice form"""
+    result = {
+        "invoice_data": invoice_data,
+        "status_code": status_code,
+        "response": response,
+        "success": status_code == 200,
+    }
+    queue_ledger_result(seller_id, action, result)
+
+
+def get_ledger_entries(
+    seller_id=None, fbr_invoice_number=None, invoice_ref_no=None, limit=500
+):
+    """Look up ledger rows, newest first, by seller, FBR number or reference.
+
+    Writes still waiting in the write-behind queue are not visible yet; call
+    get_ledger_writer().flush() first when that matters.
+    """
+    conditions = []
+    params = []
+    if seller_id is not None:
+        conditions.append("seller_id = ?")
+        params.append(seller_id)
+    if fbr_invoice_number:
+        conditions.append("fbr_invoice_number = ?")
+        params.append(fbr_invoice_number)
+    if invoice_ref_no:
+        conditions.append("invoice_ref_no = ?")
+        params.append(invoice_ref_no)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    conn = sqlite3.connect("sellers.db")
+    cursor = conn.cursor()
+    cursor.execute(
+        f"""
+        SELECT * FROM invoices {where}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    """,
+        (*params, limit),
+    )
+    entries = cursor.fetchall()
+    conn.close()
+    return entries
+
+
+# Buyers directory
+UNREGISTERED_BUYER_NTN = "9999999"
+
+BUYER_COLUMNS = (
+    "ntn_cnic",
+    "business_name",
+    "province",
+    "address",
+    "registration_type",
+)
+
+UPSERT_BUYER = """
+    INSERT INTO buyers (seller_id, ntn_cnic, business_name, name_key, province,
+                        address, registration_type)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (seller_id, ntn_cnic) DO UPDATE SET
+        business_name = excluded.business_name,
+        name_key = excluded.name_key,
+        province = excluded.province,
+        address = excluded.address,
+        registration_type = excluded.registration_type,
+        invoice_count = invoice_count + 1,
+        last_posted_at = CURRENT_TIMESTAMP
+"""
+
+
+def normalize_ntn_cnic(ntn_cnic):
+    """Digits of an NTN/CNIC, so "42101-1234567-1" and "4210112345671" match"""
+    return "".join(ch for ch in str(ntn_cnic) if ch.isdigit())
+
+
+def build_buyer_row(seller_id, invoice_data):
+    """buyers table row for a posted invoice; None for unregistered buyers"""
+    ntn_cnic = normalize_ntn_cnic(invoice_data.get("buyerNTNCNIC") or "")
+    business_name = str(invoice_data.get("buyerBusinessName") or "").strip()
+    if not ntn_cnic or ntn_cnic == UNREGISTERED_BUYER_NTN or not business_name:
+        return None
+    return (
+        seller_id,
+        ntn_cnic,
+        business_name,
+        business_name.lower(),
+        invoice_data.get("buyerProvince"),
+        invoice_data.get("buyerAddress"),
+        invoice_data.get("buyerRegistrationType"),
+    )
+
+
+@timed("db.search_buyers")
+def search_buyers(seller_id, prefix, limit=10):
+    """A seller's buyers whose NTN/CNIC or business name starts with prefix,
+    most invoiced first. Both prefixes are index range scans."""
+    name_prefix = prefix.strip().lower()
+    ntn_prefix = normalize_ntn_cnic(prefix)
+    if not name_prefix:
+        return []
+    conn = sqlite3.connect("sellers.db", timeout=30)
+    cursor = conn.cursor()
+    # "\uffff" sorts after every character that can follow a prefix
+    cursor.execute(
+        f"""
+        SELECT {', '.join(BUYER_COLUMNS)} FROM buyers
+        WHERE seller_id = ?
+        AND ((ntn_cnic >= ? AND ntn_cnic < ?) OR (name_key >= ? AND name_key < ?))
+        ORDER BY invoice_count DESC, business_name
+        LIMIT ?
+    """,
+        (
+            seller_id,
+            ntn_prefix or "\uffff",
+            ntn_prefix + "\uffff",
+            name_prefix,
+            name_prefix + "\uffff",
+            limit,
+        ),
+    )
+    buyers = cursor.fetchall()
+    conn.close()
+    return buyers
+
+
+def get_buyers(seller_id):
+    """Every buyer in a seller's directory, as BUYER_COLUMNS tuples"""
+    conn = sqlite3.connect("sellers.db", timeout=30)
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT {', '.join(BUYER_COLUMNS)} FROM buyers WHERE seller_id = ?",
+        (seller_id,),
+    )
+    buyers = cursor.fetchall()
+    conn.close()
+    return buyers
+
+
+# Column mapping profiles
+def get_mapping_profile(seller_id, header_signature):
+    """Saved mapping for a seller's header layout, or None"""
+    conn = sqlite3.connect("sellers.db", timeout=30)
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT mapping, source, updated_at FROM column_mapping_profiles
+        WHERE seller_id = ? AND header_signature = ?
+    """,
+        (seller_id, header_signature),
+    )
+    row = cursor.fetchone()
+    conn.close()
+    if row is None:
+        return None
+    return {"mapping": json.loads(row[0]), "source": row[1], "updated_at": row[2]}
+
+
+def save_mapping_profile(seller_id, header_signature, mapping, source):
+    """Create or replace a mapping profile; source is "auto" or "user" """
+    conn = sqlite3.connect("sellers.db", timeout=30)
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO column_mapping_profiles (seller_id, header_signature, mapping, source)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (seller_id, header_signature) DO UPDATE SET
+            mapping = excluded.mapping,
+            source = excluded.source,
+            updated_at = CURRENT_TIMESTAMP
+    """,
+        (seller_id, header_signature, json.dumps(mapping), source),
+    )
+    conn.commit()
+    conn.close()
+
+
+def delete_mapping_profile(seller_id, header_signature):
+    conn = sqlite3.connect("sellers.db", timeout=30)
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        DELETE FROM column_mapping_profiles
+        WHERE seller_id = ? AND header_signature = ?
+    """,
+        (seller_id, header_signature),
+    )
+    conn.commit()
+    conn.close()
+
+
+# Watch-folder ingestion
+def is_file_ingested(fingerprint):
+    conn = sqlite3.connect("sellers.db", timeout=30)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT 1 FROM ingested_files WHERE fingerprint = ?", (fingerprint,)
+    )
+    found = cursor.fetchone() is not None
+    conn.close()
+    return found
+
+
+def record_ingested_file(fingerprint, path, seller_id, status, summary):
+    conn = sqlite3.connect("sellers.db", timeout=30)
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT OR REPLACE INTO ingested_files (fingerprint, path, seller_id, status, summary)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+        (fingerprint, path, seller_id, status, json.dumps(summary)),
+    )
+    conn.commit()
+    conn.close()
@@ -0,0 +1,760 @@
+import functools
+import hashlib
+import re
+from datetime import date
+
+import pandas as pd
+
+from db import (
+    BUYER_COLUMNS,
+    get_buyers,
+    get_mapping_profile,
+    normalize_ntn_cnic,
+    save_mapping_profile,
+)
+from hs_codes import format_hs_code
+from instrumentation import timed, timer
+
+
+# Auto-detection mapping for common column patterns
+COLUMN_MAPPINGS = {
+    # Buyer Information
+    "buyer_reg_no": [
+        "registration no",
+        "buyer registration no",
+        "buyerntnccnic",
+        "buyer ntn",
+        "buyer cnic",
+        "ntn",
+        "cnic",
+        "registration number",
+        "reg no",
+        "buyer reg no",
+    ],
+    "buyer_name": [
+        "name",
+        "buyer name",
+        "buyer business name",
+        "business name",
+        "buyerbusinessname",
+        "customer name",
+        "client name",
+        "party name",
+    ],
+    "buyer_type": [
+        "type",
+        "buyer type",
+        "registration type",
+        "buyer registration type",
+        "registered",
+        "unregistered",
+        "reg type",
+    ],
+    "buyer_province": [
+        "sale origination province",
+        "buyer province",
+        "province",
+        "buyerprovince",
+        "origination province",
+        "buyer state",
+        "state",
+    ],
+    "buyer_address": [
+        "destination of supply",
+        "buyer address",
+        "address",
+        "buyeraddress",
+        "destination",
+        "supply destination",
+        "delivery address",
+    ],
+    # Invoice Details
+    "invoice_date": [
+        "document date",
+        "invoice date",
+        "date",
+        "invoicedate",
+        "doc date",
+        "transaction date",
+        "sale date",
+    ],
+    "invoice_ref": [
+        "document number",
+        "invoice reference no",
+        "invoice ref no",
+        "invoice number",
+        "doc number",
+        "ref no",
+        "reference",
+        "invoicerefno",
+    ],
+    "hs_code": [
+        "hs code description",
+        "hs code",
+        "hscode",
+        "commodity code",
+        "product code",
+        "item code",
+    ],
+    "product_desc": [
+        "product description",
+        "description",
+        "item description",
+        "productdescription",
+        "product name",
+        "item name",
+        "goods description",
+    ],
+    # Item Values
+    "quantity": ["quantity", "qty", "amount", "units", "pieces", "nos"],
+    "uom": [
+        "uom",
+        "unit of measure",
+        "unit",
+        "measure",
+        "units",
+        "numbers, pieces, units",
+        "kg",
+        "pcs",
+        "pieces",
+    ],
+    "rate": [
+        "rate",
+        "tax rate",
+        "st rate",
+        "sales tax rate",
+        "%",
+        "percentage",
+        "tax percentage",
+    ],
+    "value_excl_st": [
+        "value of sales excluding sales tax",
+        "value excluding sales tax",
+        "value excl st",
+        "base value",
+        "taxable value",
+        "net value",
+        "valuesalesexcludingst",
+        "amount before tax",
+    ],
+    "sales_tax": [
+        "sales tax/fed in st mode",
+        "sales tax",
+        "st amount",
+        "tax amount",
+        "salestaxapplicable",
+        "sales tax applicable",
+        "tax",
+    ],
+    # Optional Fields
+    "further_tax": ["further tax", "additional tax", "extra tax", "other tax"],
+    "discount": ["discount", "rebate", "deduction", "less"],
+    "sale_type": [
+        "sale type",
+        "transaction type",
+        "saletype",
+        "type of sale",
+        "3rd schedule goods",
+        "standard",
+        "exempt",
+    ],
+}
+
+
+# Fields that must be mapped before rows can be processed
+PROCESSING_REQUIRED_FIELDS = ["buyer_name", "value_excl_st"]
+
+MAIN_SHEET_KEYWORDS = [
+    "buyer",
+    "invoice",
+    "registration",
+    "name",
+    "amount",
+    "value",
+    "tax",
+]
+
+# Text date formats tried when reading an invoice date column, in order of
+# preference: when a sample fits month-first and day-first equally well
+# (every day is 12 or less), month-first wins, as in the documented sample
+# (8/21/2025). DD/MM is only used when the sample shows it.
+DATE_FORMATS = [
+    ("ISO8601", "YYYY-MM-DD"),
+    ("%m/%d/%Y", "MM/DD/YYYY"),
+    ("%d/%m/%Y", "DD/MM/YYYY"),
+    ("%m-%d-%Y", "MM-DD-YYYY"),
+    ("%d-%m-%Y", "DD-MM-YYYY"),
+    ("%d.%m.%Y", "DD.MM.YYYY"),
+    ("%Y/%m/%d", "YYYY/MM/DD"),
+    ("%m/%d/%y", "MM/DD/YY"),
+    ("%d/%m/%y", "DD/MM/YY"),
+    ("%d-%b-%Y", "DD-Mon-YYYY"),
+    ("%d %b %Y", "DD Mon YYYY"),
+    ("%b %d, %Y", "Mon DD, YYYY"),
+    ("%d %B %Y", "DD Month YYYY"),
+    ("%B %d, %Y", "Month DD, YYYY"),
+]
+
+# Non-empty text cells used to infer a date column's format
+DATE_SAMPLE_SIZE = 500
+
+# Numbers in this range in a date column are Excel serial dates (1954-2119)
+EXCEL_SERIAL_DATE_RANGE = (20000, 80000)
+
+# Buyer values used when the sheet has no column for the field
+BUYER_FIELD_DEFAULTS = {
+    "buyer_type": "Unregistered",
+    "buyer_province": "Sindh",
+    "buyer_address": "N/A",
+}
+
+# Sheet field -> buyers directory column, for filling in known buyers
+BUYER_DIRECTORY_FIELDS = {
+    "buyer_name": "business_name",
+    "buyer_province": "province",
+    "buyer_address": "address",
+    "buyer_type": "registration_type",
+}
+
+
+def read_invoice_workbook(excel_file):
+    """Read every sheet of an uploaded workbook (path or file-like object)"""
+    with timer("excel.read_excel"):
+        return pd.read_excel(
+            excel_file, sheet_name=None, dtype={"hsCode": str, "rate": str}
+        )
+
+
+def find_main_sheet(df_dict):
+    """Pick the sheet holding invoice rows; returns (sheet_name, DataFrame)"""
+    if not isinstance(df_dict, dict):
+        return "Main Sheet", df_dict
+
+    for name, sheet_df in df_dict.items():
+        if len(sheet_df) > 0:
+            cols_lower = [str(col).lower() for col in sheet_df.columns]
+            if any(
+                keyword in " ".join(cols_lower) for keyword in MAIN_SHEET_KEYWORDS
+            ):
+                return name, sheet_df
+
+    for name, sheet_df in df_dict.items():
+        if len(sheet_df) > 0:
+            return name, sheet_df
+
+    return None, None
+
+
+def get_missing_required_fields(mapping):
+    return [
+        field
+        for field in PROCESSING_REQUIRED_FIELDS
+        if field not in mapping or not mapping[field]
+    ]
+
+
+def build_column_index(column_mappings):
+    """Precompute everything auto-detection needs from the pattern lists.
+
+    Returns (exact, entries, by_trigram, short):
+    - exact maps a lowercased pattern to the fields it belongs to
+    - entries lists (field, pattern, pattern tokens, pattern prefix) in field
+      order, then pattern order, which is the order ties are broken in
+    - by_trigram maps the first three characters of a pattern to the
+      positions of its entries, so the patterns occurring in a column are
+      found by scanning the column once
+    - short holds the positions of patterns shorter than three characters
+    """
+    exact = {}
+    entries = []
+    by_trigram = {}
+    short = []
+    for field_key, possible_names in column_mappings.items():
+        for pattern in possible_names:
+            pattern_lower = pattern.lower()
+            exact.setdefault(pattern_lower, []).append(field_key)
+            if len(pattern_lower) >= 3:
+                by_trigram.setdefault(pattern_lower[:3], []).append(len(entries))
+            else:
+                short.append(len(entries))
+            entries.append(
+                (
+                    field_key,
+                    pattern_lower,
+                    frozenset(pattern_lower.split()),
+                    pattern_lower[:5],
+                )
+            )
+    return exact, entries, by_trigram, short
+
+
+COLUMN_INDEX = build_column_index(COLUMN_MAPPINGS)
+
+# Patterns joined into one string, to rule out "column inside pattern" at once
+ALL_PATTERNS_TEXT = "\n".join(pattern for _, pattern, _, _ in COLUMN_INDEX[1])
+
+
+def find_matching_entries(col_name):
+    """Positions of index entries whose pattern contains or is in col_name"""
+    _, entries, by_trigram, short = COLUMN_INDEX
+    matches = {
+        entry_idx
+        for start in range(len(col_name) - 2)
+        for entry_idx in by_trigram.get(col_name[start : start + 3], ())
+        if col_name.startswith(entries[entry_idx][1], start)
+    }
+    matches.update(entry_idx for entry_idx in short if entries[entry_idx][1] in col_name)
+
+    if col_name in ALL_PATTERNS_TEXT:
+        matches.update(
+            entry_idx
+            for entry_idx, (_, pattern, _, _) in enumerate(entries)
+            if col_name in pattern
+        )
+    return sorted(matches)
+
+
+def normalize_headers(df_columns):
+    """Lowercased, stripped header names; identical layouts give equal tuples"""
+    return tuple(str(col).lower().strip() for col in df_columns)
+
+
+@functools.lru_cache(maxsize=256)
+def detect_column_positions(normalized_headers):
+    """Map each field to the position of its best column in one pass.
+
+    An exact pattern match always wins, and a later exact match replaces an
+    earlier one. Otherwise the highest partial score wins, the first one on
+    ties; partial scores (at most 10 per shared word plus 5) never reach the
+    exact-match score of 100.
+    """
+    exact_index, entries, _, _ = COLUMN_INDEX
+    exact = {}
+    best = {}
+
+    for col_idx, col_name in enumerate(normalized_headers):
+        for field_key in exact_index.get(col_name, ()):
+            exact[field_key] = col_idx
+
+        col_tokens = set(col_name.split())
+        col_prefix = col_name[:5]
+
+        for entry_idx in find_matching_entries(col_name):
+            field_key, pattern, pattern_tokens, pattern_prefix = entries[entry_idx]
+            score = len(pattern_tokens & col_tokens) * 10
+            if col_name.startswith(pattern_prefix) or pattern.startswith(col_prefix):
+                score += 5
+
+            if score > best.get(field_key, (0, None))[0]:
+                best[field_key] = (score, col_idx)
+
+    positions = {}
+    for field_key in COLUMN_MAPPINGS:
+        if field_key in exact:
+            positions[field_key] = exact[field_key]
+        elif field_key in best and best[field_key][0] >= 5:
+            # Minimum confidence threshold
+            positions[field_key] = best[field_key][1]
+    return positions
+
+
+def get_header_signature(df_columns):
+    """Stable id of a header layout, used to key saved mapping profiles"""
+    joined = "\x1f".join(normalize_headers(df_columns))
+    return hashlib.sha1(joined.encode()).hexdigest()
+
+
+def to_profile_mapping(mapping):
+    """Store mapped columns by normalized name so letter case does not matter"""
+    return {
+        field_key: str(excel_col).lower().strip()
+        for field_key, excel_col in mapping.items()
+    }
+
+
+def apply_mapping_profile(df_columns, profile_mapping):
+    """Turn a saved profile back into a mapping onto this sheet's columns"""
+    columns_by_name = {}
+    for col in df_columns:
+        columns_by_name.setdefault(str(col).lower().strip(), col)
+    return {
+        field_key: columns_by_name[name]
+        for field_key, name in profile_mapping.items()
+        if field_key in COLUMN_MAPPINGS and name in columns_by_name
+    }
+
+
+def get_column_mapping(seller_id, df_columns):
+    """Mapping for a seller's sheet, from a saved profile or auto-detection.
+
+    Returns (mapping, profile). profile is the saved profile that was
+    applied, or None when the layout was new; the detected mapping is then
+    saved as an "auto" profile so the next upload of the layout reuses it.
+    """
+    header_signature = get_header_signature(df_columns)
+    profile = get_mapping_profile(seller_id, header_signature)
+    if profile is not None:
+        return apply_mapping_profile(df_columns, profile["mapping"]), profile
+
+    mapping = auto_detect_columns(df_columns)
+    save_mapping_profile(
+        seller_id, header_signature, to_profile_mapping(mapping), "auto"
+    )
+    return mapping, None
+
+
+@timed("excel.auto_detect_columns")
+def auto_detect_columns(df_columns):
+    """Automatically detect and map Excel columns to required fields.
+
+    Detection results are cached per header layout, so repeat uploads of the
+    same export map instantly.
+    """
+    df_columns = list(df_columns)
+    positions = detect_column_positions(normalize_headers(df_columns))
+    return {
+        field_key: df_columns[col_idx]
+        for field_key, col_idx in positions.items()
+        if df_columns[col_idx]
+    }
+
+
+@timed("excel.fill_buyer_fields")
+def fill_buyer_fields(main_df, mapping, seller_id):
+    """Fill blank buyer cells from the seller's buyers directory.
+
+    Rows are matched to the directory on the digits of their registration
+    number in one join. Matched rows take the directory's spelling of the
+    number (Excel may have turned it into 1234567.0), and their blank name,
+    province, address and type cells take the directory's values. A buyer
+    field the sheet has no column for gets a new column (directory value,
+    or the usual default for unmatched rows). Returns (df, mapping); the
+    inputs are not changed.
+    """
+    registration_column = mapping.get("buyer_reg_no")
+    if registration_column is None:
+        return main_df, mapping
+
+    buyers = get_buyers(seller_id)
+    if not buyers:
+        return main_df, mapping
+
+    directory = pd.DataFrame(buyers, columns=BUYER_COLUMNS)
+    directory.index = directory["ntn_cnic"].map(normalize_ntn_cnic)
+    directory = directory[~directory.index.duplicated()]
+
+    keys = (
+        main_df[registration_column]
+        .astype(str)
+        .str.replace(r"\.0$", "", regex=True)
+        .str.replace(r"\D", "", regex=True)
+    )
+    matched = directory.reindex(keys.to_numpy())
+    matched.index = main_df.index
+    if matched["ntn_cnic"].isna().all():
+        return main_df, mapping
+
+    filled_df = main_df.copy()
+    filled_mapping = dict(mapping)
+    known_ntn = matched["ntn_cnic"]
+    filled_df[registration_column] = (
+        main_df[registration_column].astype(object).where(known_ntn.isna(), known_ntn)
+    )
+    for field, directory_column in BUYER_DIRECTORY_FIELDS.items():
+        known = matched[directory_column]
+        column = mapping.get(field)
+        if column is None:
+            column = f"__directory_{field}"
+            filled_mapping[field] = column
+            filled_df[column] = known.fillna(BUYER_FIELD_DEFAULTS.get(field, ""))
+            continue
+
+        values = filled_df[column]
+        blank = values.isna() | (values.astype(str).str.strip() == "")
+        fill = blank & known.notna()
+        if fill.any():
+            filled_df[column] = values.astype(object).where(~fill, known)
+
+    return filled_df, filled_mapping
+
+
+def infer_date_format(texts):
+    """The DATE_FORMATS entry that parses the most of a sample of date texts.
+
+    Ties go to the earlier entry, so an all-ambiguous sample is read MM/DD.
+    """
+    sample = texts.head(DATE_SAMPLE_SIZE)
+    best_format, best_count = DATE_FORMATS[0], -1
+    for date_format in DATE_FORMATS:
+        count = (
+            pd.to_datetime(sample, format=date_format[0], errors="coerce")
+            .notna()
+            .sum()
+        )
+        if count > best_count:
+            best_format, best_count = date_format, count
+    return best_format
+
+
+def parse_invoice_dates(values):
+    """Parse a whole invoice date column at once.
+
+    Date cells are used as they are, numbers are read as Excel serial
+    dates, and text is parsed with the one format inferred from a sample of
+    the column. Returns (timestamps, format label or None); cells that
+    could not be read are NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values, None
+
+    values = values.astype(object)
+    text_mask = values.map(lambda value: isinstance(value, str))
+    number_mask = values.map(
+        lambda value: isinstance(value, (int, float)) and not isinstance(value, bool)
+    )
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+
+    other = values[~text_mask & ~number_mask].dropna()
+    if len(other):
+        parsed[other.index] = pd.to_datetime(other, errors="coerce")
+
+    numbers = pd.to_numeric(values[number_mask], errors="coerce")
+    numbers = numbers[numbers.between(*EXCEL_SERIAL_DATE_RANGE)]
+    if len(numbers):
+        parsed[numbers.index] = pd.to_datetime(
+            numbers, unit="D", origin="1899-12-30"
+        )
+
+    texts = values[text_mask].str.strip()
+    texts = texts[texts != ""]
+    if not len(texts):
+        return parsed, None
+    date_format, format_label = infer_date_format(texts)
+    parsed[texts.index] = pd.to_datetime(texts, format=date_format, errors="coerce")
+    return parsed, format_label
+
+
+@timed("excel.normalize_invoice_dates")
+def normalize_invoice_dates(main_df, mapping):
+    """Replace the invoice date column with parsed dates.
+
+    Returns (df, errors) where errors maps the index of every row whose
+    date is blank or unreadable to an error message; such rows must not be
+    turned into invoices. Sheets without a date column are left as they are
+    (their invoices are dated today).
+    """
+    date_column = mapping.get("invoice_date")
+    if date_column is None:
+        return main_df, {}
+
+    raw = main_df[date_column]
+    parsed, format_label = parse_invoice_dates(raw)
+    expected = f" (expected {format_label})" if format_label else ""
+    errors = {
+        idx: (
+            f"Row {idx+1}: Invoice date is missing"
+            if pd.isna(value) or str(value).strip() == ""
+            else f"Row {idx+1}: Invoice date '{value}' could not be read{expected}"
+        )
+        for idx, value in raw[parsed.isna()].items()
+    }
+
+    normalized_df = main_df.copy()
+    normalized_df[date_column] = parsed
+    return normalized_df, errors
+
+
+def format_ntn_cnic(value):
+    """Buyer NTN/CNIC from a spreadsheet cell as text.
+
+    A column with any blank cell is read as floats, which turns 1234567 into
+    1234567.0; the ".0" is dropped. Blank cells give "".
+    """
+    if pd.isna(value):
+        return ""
+    return re.sub(r"^(\d+)\.0+$", r"\1", str(value).strip())
+
+
+@timed("excel.process_excel_row_auto")
+def process_excel_row_auto(row, mapping, seller, idx):
+    """Process a single Excel row using auto-detected mapping"""
+    try:
+        # Extract buyer info with safe string conversion
+        buyer_registration_no = format_ntn_cnic(
+            row.get(mapping.get("buyer_reg_no", ""), "")
+        )
+        buyer_business_name = str(row.get(mapping.get("buyer_name", ""), "")).strip()
+        buyer_registration_type = str(
+            row.get(mapping.get("buyer_type", ""), BUYER_FIELD_DEFAULTS["buyer_type"])
+        ).strip()
+        buyer_province_value = str(
+            row.get(
+                mapping.get("buyer_province", ""),
+                BUYER_FIELD_DEFAULTS["buyer_province"],
+            )
+        ).strip()
+        buyer_address_value = str(
+            row.get(
+                mapping.get("buyer_address", ""), BUYER_FIELD_DEFAULTS["buyer_address"]
+            )
+        ).strip()
+
+        # Handle unregistered buyers
+        if (
+            "unregistered" in buyer_registration_type.lower()
+            or "un-register" in buyer_business_name.lower()
+            or buyer_registration_no == "9999999"
+        ):
+            buyer_registration_no = "9999999"
+            buyer_business_name = "Un-Registered"
+            buyer_registration_type = "Unregistered"
+
+        # Extract invoice details
+        invoice_date_value = row.get(mapping.get("invoice_date", ""), date.today())
+        if isinstance(invoice_date_value, str):
+            try:
+                invoice_date_value = pd.to_datetime(invoice_date_value).date()
+            except (ValueError, OverflowError):
+                return (
+                    None,
+                    f"Row {idx+1}: Invoice date '{invoice_date_value}' could not be read",
+                )
+        elif hasattr(invoice_date_value, "date"):
+            invoice_date_value = invoice_date_value.date()
+
+        invoice_ref_no = str(
+            row.get(mapping.get("invoice_ref", ""), f"REF-{idx+1}")
+        ).strip()
+
+        # Extract item details
+        hs_code_value = format_hs_code(row.get(mapping.get("hs_code", ""), ""))
+        product_description = str(
+            row.get(mapping.get("product_desc", ""), "No details")
+        ).strip()
+
+        # Safe numeric conversions
+        def safe_float_convert(value, default=0.0):
+            try:
+                if pd.isna(value) or value == "":
+                    return default
+                return float(str(value).replace(",", "").replace("%", "").strip())
+            except (ValueError, TypeError):
+                return default
+
+        quantity = safe_float_convert(row.get(mapping.get("quantity", ""), 1), 1.0)
+        uom_value = str(row.get(mapping.get("uom", ""), "PCS")).strip()
+
+        # Handle rate value
+        rate_raw = row.get(mapping.get("rate", ""), "18")
+        rate_value = str(rate_raw).strip()
+        if "%" not in rate_value:
+            rate_clean = rate_value.replace("%", "").replace(" ", "")
+            try:
+                rate_num = float(rate_clean)
+                rate_value = f"{rate_num}%"
+            except:
+                rate_value = "18%"
+
+        value_excluding_st = safe_float_convert(
+            row.get(mapping.get("value_excl_st", ""), 0)
+        )
+        sales_tax_applicable = safe_float_convert(
+            row.get(mapping.get("sales_tax", ""), 0)
+        )
+
+        # Optional fields
+        further_tax = safe_float_convert(row.get(mapping.get("further_tax", ""), 0))
+        extra_tax = 0.0  # Not commonly in Excel formats
+        st_withheld = 0.0  # Not commonly in Excel formats
+        fed_payable = 0.0  # Not commonly in Excel formats
+        discount = safe_float_convert(row.get(mapping.get("discount", ""), 0))
+        sale_type_value = str(row.get(mapping.get("sale_type", ""), "")).strip()
+
+        # Calculate total
+        total_values = (
+            value_excluding_st
+            + sales_tax_applicable
+            + further_tax
+            + extra_tax
+            - discount
+        )
+
+        # Validation
+        if value_excluding_st <= 0:
+            return None, f"Row {idx+1}: Value excluding ST must be greater than 0"
+
+        if not buyer_business_name:
+            return None, f"Row {idx+1}: Buyer name is required"
+
+        # Create invoice data structure
+        invoice_data = {
+            "sellerNTNCNIC": seller[1],
+            "sellerBusinessName": seller[2],
+            "sellerProvince": seller[3],
+            "sellerAddress": seller[4],
+            "invoiceType": "Sale Invoice",
+            "invoiceDate": invoice_date_value.strftime("%Y-%m-%d"),
+            "buyerNTNCNIC": buyer_registration_no,
+            "buyerBusinessName": buyer_business_name,
+            "buyerProvince": buyer_province_value,
+            "buyerAddress": buyer_address_value,
+            "buyerRegistrationType": buyer_registration_type,
+            "invoiceRefNo": invoice_ref_no,
+            "scenarioId": "SN002",  # Default scenario
+            "items": [
+                {
+                    "hsCode": hs_code_value,
+                    "productDescription": product_description,
+                    "rate": rate_value,
+                    "uoM": uom_value,
+                    "quantity": quantity,
+                    "valueSalesExcludingST": value_excluding_st,
+                    "salesTaxApplicable": sales_tax_applicable,
+                    "furtherTax": further_tax,
+                    "extraTax": extra_tax,
+                    "salesTaxWithheldAtSource": st_withheld,
+                    "fixedNotifiedValueOrRetailPrice": 0.00,
+                    "fedPayable": fed_payable,
+                    "discount": discount,
+                    "totalValues": total_values,
+                    "saleType": sale_type_value,
+                    "sroScheduleNo": "",
+                    "sroItemSerialNo": "",
+                }
+            ],
+        }
+
+        return {
+            "row_number": idx + 1,
+            "invoice_data": invoice_data,
+            "buyer_name": buyer_business_name,
+            "amount": total_values,
+        }, None
+
+    except Exception as e:
+        return None, f"Row {idx+1}: {str(e)}"
+
+
+def process_excel_rows(main_df, mapping, seller, on_progress=None):
+    """Transform every sheet row into an invoice; returns (processed, errors)"""
+    processed_invoices = []
+    processing_errors = []
+    main_df, mapping = fill_buyer_fields(main_df, mapping, seller[0])
+    main_df, date_errors = normalize_invoice_dates(main_df, mapping)
+
+    for done, (idx, row) in enumerate(main_df.iterrows(), start=1):
+        if on_progress is not None:
+            on_progress(done)
+
+        if idx in date_errors:
+            processing_errors.append(date_errors[idx])
+            continue
+
+        invoice_result, error = process_excel_row_auto(row, mapping, seller, idx)
+
+        if invoice_result:
+            processed_invoices.append(invoice_result)
+        elif error:
+            processing_errors.append(error)
+
+    return processed_invoices, processing_errors
@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+import time
+
+import requests
+
+from instrumentation import timed
+from invoice_batch import to_payload_dict
+
+# Set FBR_API_BASE_URL to point the app, CLI and services at another gateway,
+# e.g. the local simulator in benchmarks/fbr_simulator.py
+FBR_API_BASE_URL = os.environ.get(
+    "FBR_API_BASE_URL", "https://gw.fbr.gov.pk/di_data/v1/di"
+).rstrip("/")
+
+
+# API call functions (keeping original functionality)
+@timed("api.validate_invoice")
+def validate_invoice_api(invoice_data, bearer_token):
+    """Send invoice data to FBR validation API endpoint"""
+    try:
+        api_url = f"{FBR_API_BASE_URL}/validateinvoicedata_sb"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {bearer_token}",
+        }
+        response = requests.post(api_url, json=invoice_data, headers=headers)
+        return response.status_code, response.json()
+    except Exception as e:
+        return None, {"error": str(e)}
+
+
+@timed("api.post_invoice")
+def post_invoice_api(invoice_data, bearer_token):
+    """Send invoice data to FBR post API endpoint"""
+    try:
+        api_url = f"{FBR_API_BASE_URL}/postinvoicedata_sb"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {bearer_token}",
+        }
+        response = requests.post(api_url, json=invoice_data, headers=headers)
+        return response.status_code, response.json()
+    except Exception as e:
+        return None, {"error": str(e)}
+
+
+def get_fbr_error_summary(fbr_response, max_length=200):
+    """Condense an FBR error response into a single line for result tables"""
+    if not isinstance(fbr_response, dict):
+        return str(fbr_response)[:max_length]
+
+    if fbr_response.get("error"):
+        summary = str(fbr_response["error"])
+    else:
+        validation = fbr_response.get("validationResponse") or {}
+        errors = [validation.get("error")] + [
+            status.get("error") for status in validation.get("invoiceStatuses") or []
+        ]
+        errors = [str(error) for error in errors if error]
+        summary = "; ".join(errors) or json.dumps(fbr_response)
+
+    return summary[:max_length]
+
+
+def call_invoice_api(api_call, invoice_item, bearer_token):
+    """Run validate_invoice_api / post_invoice_api for one processed invoice"""
+    try:
+        status_code, response = api_call(
+            to_payload_dict(invoice_item["invoice_data"]), bearer_token
+        )
+    except Exception as e:
+        status_code, response = None, {"error": str(e)}
+
+    return {
+        "row_number": invoice_item["row_number"],
+        "buyer_name": invoice_item["buyer_name"],
+        "invoice_data": invoice_item["invoice_data"],
+        "status_code": status_code,
+        "response": response,
+        "success": status_code == 200,
+    }
+
+
+class BulkJob:
+    """Runs an FBR API call for every processed invoice on a background thread.
+
+    The job lives in session state, so reruns triggered by other widgets
+    neither interrupt nor repeat it; the page polls it from a fragment.
+    The worker thread must never call st.* functions. on_result, if given,
+    is called on the worker thread with each result as soon as it arrives
+    (e.g. to queue it for the ledger). Use get_results() to read the results
+    while the job is running.
+    """
+
+    def __init__(self, kind, label, invoices, api_call, bearer_token, on_result=None):
+        self.kind = kind
+        self.label = label
+        self.total = len(invoices)
+        self.results = []
+        self.results_lock = threading.Lock()
+        self.cancelled = False
+        self.error = None
+        self.on_result = on_result
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+        self.thread = threading.Thread(
+            target=self.run, args=(invoices, api_call, bearer_token), daemon=True
+        )
+        self.thread.start()
+
+    @property
+    def done(self):
+        return len(self.results)
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    def cancel(self):
+        self.cancelled = True
+
+    def get_results(self):
+        """Copy of the results so far, safe to read while the worker appends"""
+        with self.results_lock:
+            return list(self.results)
+
+    def run(self, invoices, api_call, bearer_token):
+        try:
+            for invoice_item in invoices:
+                if self.cancelled:
+                    break
+                result = call_invoice_api(api_call, invoice_item, bearer_token)
+                with self.results_lock:
+                    self.results.append(result)
+                if self.on_result is not None:
+                    try:
+                        self.on_result(result)
+                    except Exception as e:
+                        self.error = str(e)
+        finally:
+            self.finished_at = time.perf_counter()
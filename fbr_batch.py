@@ -0,0 +1,243 @@
+"""Validate or post an Excel invoice workbook to FBR without the Streamlit UI.
+
+Uses the same column mapping (the seller's saved profile for the layout,
+or auto-detection), row transformation, FBR API client, invoice ledger and
+PDF layout as the Excel upload page. Per-stage
+throughput is printed to stderr when the run finishes; the exit status is
+non-zero if any row failed to transform or any API call failed. Before
+validating, rows that fail the local pre-validation rules are reported as
+failures without being sent to FBR. Sales tax, further tax and totals are
+checked against the rate and rows that do not add up are listed;
+--fill-taxes fills in taxes that are missing.
+
+Usage:
+    python fbr_batch.py validate invoices.xlsx --seller-ntn 1234567
+    python fbr_batch.py post invoices.xlsx --seller-ntn 1234567 \\
+        --concurrency 16 --pdf-dir out/ --results results.json --fill-taxes
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from db import (
+    get_ledger_writer,
+    get_seller_by_id,
+    get_seller_by_ntn_cnic,
+    init_database,
+    queue_ledger_result,
+)
+from excel_import import (
+    find_main_sheet,
+    get_column_mapping,
+    get_missing_required_fields,
+    process_excel_rows,
+    read_invoice_workbook,
+)
+from fbr_api import (
+    call_invoice_api,
+    get_fbr_error_summary,
+    post_invoice_api,
+    validate_invoice_api,
+)
+from instrumentation import format_progress
+from invoice_pdf import generate_invoice_pdf, get_invoice_pdf_filename
+from prevalidation import prevalidate_invoices
+from sales_tax import get_tax_issues, reconcile_taxes
+
+ACTIONS = {
+    "validate": ("validation", validate_invoice_api, "Validating invoice"),
+    "post": ("posting", post_invoice_api, "Posting invoice"),
+}
+
+
+def log(message):
+    print(message, file=sys.stderr)
+
+
+def find_seller(args):
+    if args.seller_id is not None:
+        return get_seller_by_id(args.seller_id)
+    return get_seller_by_ntn_cnic(args.seller_ntn)
+
+
+def run_api_calls(processed_invoices, api_call, bearer_token, concurrency, label):
+    """Call the FBR API for every invoice; results keep the workbook row order"""
+    total = len(processed_invoices)
+    started = time.perf_counter()
+    last_report = started
+    results = []
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for result in executor.map(
+            lambda item: call_invoice_api(api_call, item, bearer_token),
+            processed_invoices,
+        ):
+            results.append(result)
+            now = time.perf_counter()
+            if now - last_report >= 5 or len(results) == total:
+                log(format_progress(label, len(results), total, now - started))
+                last_report = now
+
+    return results
+
+
+def write_pdfs(results, pdf_dir):
+    """Write one PDF per successful post; returns (written, errors)"""
+    os.makedirs(pdf_dir, exist_ok=True)
+    written = 0
+    errors = []
+
+    for result in results:
+        if not result["success"]:
+            continue
+        try:
+            pdf_buffer = generate_invoice_pdf(
+                result["invoice_data"], result["response"]
+            )
+            path = os.path.join(pdf_dir, get_invoice_pdf_filename(result))
+            with open(path, "wb") as f:
+                f.write(pdf_buffer.getvalue())
+            written += 1
+        except Exception as e:
+            errors.append(f"Row {result['row_number']}: {str(e)}")
+
+    return written, errors
+
+
+def print_throughput(stage_times, counts):
+    log("")
+    log(f"{'stage':<10} {'items':>8} {'seconds':>9} {'items/s':>10}")
+    for stage, seconds in stage_times.items():
+        count = counts.get(stage, 0)
+        rate = count / seconds if seconds > 0 else 0.0
+        log(f"{stage:<10} {count:>8} {seconds:>9.2f} {rate:>10,.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("action", choices=sorted(ACTIONS))
+    parser.add_argument("workbook", help="Excel file with one invoice per row")
+    seller_group = parser.add_mutually_exclusive_group(required=True)
+    seller_group.add_argument("--seller-ntn", help="Seller NTN/CNIC as saved in the app")
+    seller_group.add_argument("--seller-id", type=int, help="Seller database id")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Parallel FBR API calls"
+    )
+    parser.add_argument("--pdf-dir", help="Write invoice PDFs of posted rows here")
+    parser.add_argument("--results", help="Write every API result as JSON here")
+    parser.add_argument(
+        "--fill-taxes",
+        action="store_true",
+        help="Fill in missing sales tax and further tax from the rate",
+    )
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.pdf_dir and args.action != "post":
+        parser.error("--pdf-dir only applies to post")
+
+    init_database()
+    seller = find_seller(args)
+    if seller is None:
+        sys.exit("Seller not found")
+
+    ledger_action, api_call, label = ACTIONS[args.action]
+    stage_times = {}
+    counts = {}
+    run_started = time.perf_counter()
+
+    started = time.perf_counter()
+    sheet_name, main_df = find_main_sheet(read_invoice_workbook(args.workbook))
+    stage_times["parse"] = time.perf_counter() - started
+    if main_df is None:
+        sys.exit("No data found in the workbook")
+    counts["parse"] = len(main_df)
+
+    mapping, _ = get_column_mapping(seller[0], main_df.columns)
+    missing_required = get_missing_required_fields(mapping)
+    if missing_required:
+        sys.exit(f"Required columns not found: {', '.join(missing_required)}")
+    log(f"Sheet '{sheet_name}': {len(main_df)} rows, {len(mapping)} columns mapped")
+
+    started = time.perf_counter()
+    processed_invoices, processing_errors = process_excel_rows(
+        main_df, mapping, seller
+    )
+    stage_times["transform"] = time.perf_counter() - started
+    counts["transform"] = len(main_df)
+    for error in processing_errors:
+        log(f"Skipped: {error}")
+
+    started = time.perf_counter()
+    tax_issues = get_tax_issues(
+        reconcile_taxes(processed_invoices, auto_fill=args.fill_taxes)
+    )
+    stage_times["tax"] = time.perf_counter() - started
+    counts["tax"] = len(processed_invoices)
+    for row_number, filled, issues in tax_issues[
+        ["row_number", "filled", "issues"]
+    ].itertuples(index=False):
+        log(f"Tax check row {row_number}: {issues}{' (filled in)' if filled else ''}")
+
+    prevalidation_failures = []
+    if args.action == "validate":
+        started = time.perf_counter()
+        processed_invoices, prevalidation_failures = prevalidate_invoices(
+            processed_invoices
+        )
+        stage_times["local"] = time.perf_counter() - started
+        counts["local"] = len(processed_invoices) + len(prevalidation_failures)
+
+    started = time.perf_counter()
+    results = run_api_calls(
+        processed_invoices, api_call, seller[5], args.concurrency, label
+    )
+    for result in results:
+        queue_ledger_result(seller[0], ledger_action, result)
+    stage_times["api"] = time.perf_counter() - started
+    counts["api"] = len(results)
+    results = sorted(
+        prevalidation_failures + results, key=lambda result: result["row_number"]
+    )
+
+    failed = [result for result in results if not result["success"]]
+    for result in failed:
+        log(
+            f"Failed row {result['row_number']} ({result['status_code'] or 'local'}): "
+            f"{get_fbr_error_summary(result['response'])}"
+        )
+
+    pdf_errors = []
+    if args.pdf_dir:
+        started = time.perf_counter()
+        counts["pdf"], pdf_errors = write_pdfs(results, args.pdf_dir)
+        stage_times["pdf"] = time.perf_counter() - started
+        for error in pdf_errors:
+            log(f"PDF failed: {error}")
+
+    if args.results:
+        with open(args.results, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+
+    if not get_ledger_writer().flush(timeout=60):
+        log("Warning: some ledger writes were still pending at exit")
+
+    stage_times["total"] = time.perf_counter() - run_started
+    counts["total"] = len(main_df)
+    print_throughput(stage_times, counts)
+    log(
+        f"\n{len(results) - len(failed)} succeeded, {len(failed)} failed, "
+        f"{len(processing_errors)} rows skipped"
+    )
+
+    if failed or processing_errors or pdf_errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
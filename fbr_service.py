@@ -0,0 +1,358 @@
+"""Local HTTP service for pushing invoices to FBR from an ERP.
+
+Invoices use the same JSON payload the app sends to FBR (see
+process_excel_row_auto); seller fields are filled in from the seller record.
+Validate and post requests are queued as jobs and worked off by a fixed pool
+of threads calling the same FBR client as the UI, with every outcome written
+to the invoice ledger. Bind it to localhost only: sellers' bearer tokens are
+used on behalf of whoever can reach the port.
+
+Endpoints:
+    POST /validate, POST /post   {"seller_ntn": "...", "invoices": [{...}]}
+                                 (or "seller_id"); 202 with {"job_id": ...},
+                                 413 if the job has more invoices than
+                                 --max-pending, 503 while the queue is full
+    GET  /jobs/<job_id>          job status and, once finished, its results
+    POST /pdf                    {"invoice_data": {...}, "fbr_response": {...}}
+                                 returns the invoice PDF
+    GET  /metrics                queue depth, job counts and stage latencies
+    GET  /health
+
+Usage:
+    python fbr_service.py --port 8765 --workers 16
+"""
+
+import argparse
+import json
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from db import (
+    get_ledger_writer_stats,
+    get_seller_by_id,
+    get_seller_by_ntn_cnic,
+    init_database,
+    queue_ledger_result,
+)
+from fbr_api import call_invoice_api, post_invoice_api, validate_invoice_api
+from instrumentation import get_stage_stats, record_timing, timer
+from invoice_pdf import generate_invoice_pdf
+
+ACTIONS = {
+    "validate": ("validation", validate_invoice_api),
+    "post": ("posting", post_invoice_api),
+}
+
+JOB_PATH = re.compile(r"^/jobs/([0-9a-f]{32})$")
+
+
+def apply_seller_fields(invoice_data, seller):
+    """Seller details always come from the database, never from the request"""
+    return dict(
+        invoice_data,
+        sellerNTNCNIC=seller[1],
+        sellerBusinessName=seller[2],
+        sellerProvince=seller[3],
+        sellerAddress=seller[4],
+    )
+
+
+class ServiceJob:
+    """One validate/post request; results are filled in by the worker pool"""
+
+    def __init__(self, kind, seller, invoices):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.seller = seller
+        self.total = len(invoices)
+        self.results = [None] * len(invoices)
+        self.done = 0
+        self.created_at = time.time()
+        self.finished_at = None
+        self.lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    def set_result(self, index, result):
+        with self.lock:
+            self.results[index] = result
+            self.done += 1
+            if self.done == self.total:
+                self.finished_at = time.time()
+                record_timing(
+                    f"service.job.{self.kind}", self.finished_at - self.created_at
+                )
+
+    def to_dict(self):
+        with self.lock:
+            job = {
+                "job_id": self.id,
+                "kind": self.kind,
+                "seller_id": self.seller[0],
+                "total": self.total,
+                "done": self.done,
+                "finished": self.finished,
+            }
+            if self.finished:
+                job["succeeded"] = sum(result["success"] for result in self.results)
+                job["failed"] = self.total - job["succeeded"]
+                job["results"] = [
+                    {
+                        "row_number": result["row_number"],
+                        "invoice_ref_no": result["invoice_data"].get("invoiceRefNo"),
+                        "status_code": result["status_code"],
+                        "success": result["success"],
+                        "response": result["response"],
+                    }
+                    for result in self.results
+                ]
+            return job
+
+
+class InvoiceService:
+    """Job queue plus a fixed pool of worker threads calling the FBR API.
+
+    Each invoice of a job is queued as its own task, so one large job does
+    not hold up the pool while small jobs wait behind it longer than needed.
+    The queue is bounded; submit() refuses work instead of growing memory.
+    """
+
+    def __init__(self, workers=8, max_pending=50000, max_jobs=1000):
+        self.tasks = queue.Queue(maxsize=max_pending)
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self.jobs_lock = threading.Lock()
+        self.submit_lock = threading.Lock()
+        self.started_at = time.time()
+        self.workers = [
+            threading.Thread(target=self.run, name=f"fbr-worker-{n}", daemon=True)
+            for n in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, kind, seller, invoices):
+        """Queue a job; returns None if the queue cannot take all its invoices
+        right now (jobs larger than max_pending are refused by the handler)"""
+        job = ServiceJob(kind, seller, invoices)
+        tasks = [
+            (
+                job,
+                index,
+                {
+                    "row_number": index + 1,
+                    "buyer_name": invoice_data.get("buyerBusinessName", ""),
+                    "invoice_data": apply_seller_fields(invoice_data, seller),
+                },
+            )
+            for index, invoice_data in enumerate(invoices)
+        ]
+
+        # Checking capacity and enqueueing under one lock keeps concurrent
+        # submits from overfilling the queue; workers only ever free space,
+        # so put_nowait() cannot block or fail here
+        with self.submit_lock:
+            if self.tasks.qsize() + len(tasks) > self.max_pending:
+                return None
+
+            with self.jobs_lock:
+                self.jobs[job.id] = job
+                while len(self.jobs) > self.max_jobs:
+                    oldest_id, oldest = next(iter(self.jobs.items()))
+                    if not oldest.finished:
+                        break
+                    del self.jobs[oldest_id]
+
+            for task in tasks:
+                self.tasks.put_nowait(task + (time.perf_counter(),))
+        return job
+
+    def get_job(self, job_id):
+        with self.jobs_lock:
+            return self.jobs.get(job_id)
+
+    def run(self):
+        while True:
+            job, index, invoice_item, queued_at = self.tasks.get()
+            try:
+                record_timing("service.queue_wait", time.perf_counter() - queued_at)
+                ledger_action, api_call = ACTIONS[job.kind]
+                result = call_invoice_api(api_call, invoice_item, job.seller[5])
+                try:
+                    queue_ledger_result(job.seller[0], ledger_action, result)
+                except Exception as e:
+                    result["ledger_error"] = str(e)
+                job.set_result(index, result)
+            finally:
+                self.tasks.task_done()
+
+    def get_metrics(self):
+        with self.jobs_lock:
+            jobs = list(self.jobs.values())
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "workers": len(self.workers),
+            "queue_depth": self.tasks.qsize(),
+            "in_flight": self.tasks.unfinished_tasks - self.tasks.qsize(),
+            "max_pending": self.max_pending,
+            "jobs_tracked": len(jobs),
+            "jobs_running": sum(not job.finished for job in jobs),
+            "ledger_writer": get_ledger_writer_stats(),
+            "stages": get_stage_stats(),
+        }
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(payload, dict):
+            raise ValueError("request body must be a JSON object")
+        return payload
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self.send_json(200, self.service.get_metrics())
+        elif JOB_PATH.match(self.path):
+            job = self.service.get_job(JOB_PATH.match(self.path).group(1))
+            if job is None:
+                self.send_json(404, {"error": "job not found"})
+            else:
+                self.send_json(200, job.to_dict())
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        try:
+            payload = self.read_json()
+        except ValueError as e:
+            self.send_json(400, {"error": f"invalid JSON: {e}"})
+            return
+
+        try:
+            if self.path in ("/validate", "/post"):
+                self.submit_job(self.path.lstrip("/"), payload)
+            elif self.path == "/pdf":
+                self.render_pdf(payload)
+            else:
+                self.send_json(404, {"error": "not found"})
+        finally:
+            if self.path in ("/validate", "/post", "/pdf"):
+                record_timing(
+                    f"service.http.{self.path.lstrip('/')}",
+                    time.perf_counter() - start,
+                )
+
+    def submit_job(self, kind, payload):
+        invoices = payload.get("invoices")
+        if not isinstance(invoices, list) or not invoices:
+            self.send_json(400, {"error": "invoices must be a non-empty list"})
+            return
+        if not all(isinstance(invoice, dict) for invoice in invoices):
+            self.send_json(400, {"error": "every invoice must be a JSON object"})
+            return
+        if len(invoices) > self.service.max_pending:
+            # Could never fit in the queue, so retrying would not help
+            self.send_json(
+                413,
+                {
+                    "error": f"a job can have at most {self.service.max_pending} "
+                    "invoices; split it into smaller jobs"
+                },
+            )
+            return
+
+        if payload.get("seller_id") is not None:
+            seller = get_seller_by_id(payload["seller_id"])
+        elif payload.get("seller_ntn"):
+            seller = get_seller_by_ntn_cnic(payload["seller_ntn"])
+        else:
+            self.send_json(400, {"error": "seller_id or seller_ntn is required"})
+            return
+        if seller is None:
+            self.send_json(404, {"error": "seller not found"})
+            return
+
+        job = self.service.submit(kind, seller, invoices)
+        if job is None:
+            self.send_json(503, {"error": "queue is full, retry later"})
+            return
+        self.send_json(
+            202, {"job_id": job.id, "total": job.total, "status": f"/jobs/{job.id}"}
+        )
+
+    def render_pdf(self, payload):
+        invoice_data = payload.get("invoice_data")
+        if not isinstance(invoice_data, dict):
+            self.send_json(400, {"error": "invoice_data must be a JSON object"})
+            return
+
+        try:
+            with timer("service.pdf"):
+                pdf = generate_invoice_pdf(
+                    invoice_data, payload.get("fbr_response")
+                ).getvalue()
+        except Exception as e:
+            self.send_json(422, {"error": f"PDF generation failed: {e}"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(pdf)))
+        self.end_headers()
+        self.wfile.write(pdf)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--workers", type=int, default=8, help="Parallel FBR API calls"
+    )
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=50000,
+        help="Queued invoices before new jobs are refused",
+    )
+    args = parser.parse_args()
+
+    init_database()
+    ServiceHandler.service = InvoiceService(args.workers, args.max_pending)
+    server = ThreadingHTTPServer((args.host, args.port), ServiceHandler)
+    print(f"FBR invoice service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+"""Watch a directory for Excel invoice workbooks and validate/post each one.
+
+Every new workbook runs through the same pipeline as the Excel upload page:
+column auto-detection, row transformation, local pre-validation, FBR
+validation of the rows that pass it, and posting of the rows FBR accepted.
+Two files are written next to the input:
+
+    <name>.results.xlsx    validation, posting, skipped-row and tax check sheets
+    <name>.invoices.zip    one PDF per posted invoice
+
+Workbooks in a sub-directory named after a seller's NTN/CNIC
+(<dir>/1234567/sales.xlsx) belong to that seller; workbooks directly in the
+watched directory use --seller-ntn. Files are fingerprinted by content, so a
+workbook is processed once even if it is copied, renamed or dropped again;
+to resubmit, change its contents. A file that fails for a reason that may
+pass (a locked file, a database or network error) is tried again on a
+later scan; one that cannot be processed as it is (unreadable, no invoice
+rows, required columns missing, unknown seller) is recorded and skipped
+until its contents change. Several files are processed at once, but
+the files of one seller are always processed one after another, oldest
+first.
+
+Usage:
+    python fbr_watch.py /srv/fbr-inbox --seller-ntn 1234567 --workers 4
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from db import (
+    get_ledger_writer,
+    get_seller_by_ntn_cnic,
+    init_database,
+    is_file_ingested,
+    queue_ledger_result,
+    record_ingested_file,
+)
+from excel_import import (
+    find_main_sheet,
+    get_column_mapping,
+    get_missing_required_fields,
+    process_excel_rows,
+    read_invoice_workbook,
+)
+from fbr_api import get_fbr_error_summary, post_invoice_api, validate_invoice_api
+from fbr_batch import run_api_calls
+from invoice_pdf import generate_invoice_pdf_zip, get_fbr_invoice_number
+from prevalidation import prevalidate_invoices
+from sales_tax import get_tax_issues, reconcile_taxes
+
+WORKBOOK_EXTENSIONS = (".xlsx", ".xls")
+OUTPUT_SUFFIXES = (".results.xlsx",)
+
+
+def log(message):
+    print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}", flush=True)
+
+
+class PermanentFailure(Exception):
+    """A workbook that would fail the same way again; it is not retried"""
+
+
+def get_file_fingerprint(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_candidate_workbook(name):
+    return (
+        name.lower().endswith(WORKBOOK_EXTENSIONS)
+        and not name.lower().endswith(OUTPUT_SUFFIXES)
+        and not name.startswith(("~$", "."))
+    )
+
+
+def build_results_frame(results):
+    return pd.DataFrame(
+        {
+            "Row": [r["row_number"] for r in results],
+            "Buyer": [r["buyer_name"] for r in results],
+            "Invoice Ref No.": [
+                r["invoice_data"].get("invoiceRefNo", "") for r in results
+            ],
+            "Status": ["Success" if r["success"] else "Failed" for r in results],
+            "Status Code": pd.array([r["status_code"] for r in results], dtype="Int64"),
+            "FBR Invoice No.": [
+                str(get_fbr_invoice_number(r["response"], "")) for r in results
+            ],
+            "Error": [
+                "" if r["success"] else get_fbr_error_summary(r["response"])
+                for r in results
+            ],
+        }
+    )
+
+
+def write_atomically(path, data):
+    """Write bytes via a temporary file so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_results_workbook(
+    path, validation_results, posting_results, skipped, tax_issues
+):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        build_results_frame(validation_results).to_excel(
+            writer, sheet_name="Validation", index=False
+        )
+        build_results_frame(posting_results).to_excel(
+            writer, sheet_name="Posting", index=False
+        )
+        pd.DataFrame({"Error": skipped}).to_excel(
+            writer, sheet_name="Skipped Rows", index=False
+        )
+        tax_issues.to_excel(writer, sheet_name="Tax Check", index=False)
+    write_atomically(path, buffer.getvalue())
+
+
+class WatchFolder:
+    """Polls a directory and hands new workbooks to a pool of file workers.
+
+    A file is picked up once its size and modification time are unchanged
+    between two scans, so workbooks still being copied in are left alone.
+    Each seller has its own FIFO of files; at most one worker drains a
+    seller's FIFO at a time, which keeps that seller's files in order.
+    """
+
+    def __init__(
+        self, directory, default_seller_ntn, workers, concurrency, post, fill_taxes
+    ):
+        self.directory = directory
+        self.default_seller_ntn = default_seller_ntn
+        self.concurrency = concurrency
+        self.post = post
+        self.fill_taxes = fill_taxes
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.active = set()
+        self.queued_paths = set()
+        self.queued_fingerprints = set()
+        self.last_seen = {}
+        self.known = {}
+        self.retry_paths = set()
+
+    def list_workbooks(self):
+        """Yield (path, seller NTN/CNIC) for every candidate workbook"""
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and is_candidate_workbook(entry.name):
+                yield entry.path, self.default_seller_ntn
+            elif entry.is_dir() and not entry.name.startswith("."):
+                try:
+                    sub_entries = list(os.scandir(entry.path))
+                except OSError as e:
+                    log(f"Cannot list {entry.path}, will retry: {e}")
+                    continue
+                for sub_entry in sub_entries:
+                    if sub_entry.is_file() and is_candidate_workbook(sub_entry.name):
+                        yield sub_entry.path, entry.name
+
+    def scan(self):
+        # Files that failed for a reason that may pass are picked up again
+        with self.lock:
+            retry_paths, self.retry_paths = self.retry_paths, set()
+        for path in retry_paths:
+            self.known.pop(path, None)
+
+        try:
+            workbooks = list(self.list_workbooks())
+        except OSError as e:
+            log(f"Cannot list {self.directory}, will retry: {e}")
+            return
+
+        stable = []
+        seen = {}
+        for path, seller_ntn in workbooks:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            seen[path] = signature
+            if self.last_seen.get(path) != signature:
+                continue
+            if self.known.get(path) == signature:
+                continue
+            with self.lock:
+                if path in self.queued_paths:
+                    continue
+            stable.append((stat.st_mtime_ns, path, seller_ntn, signature))
+        self.last_seen = seen
+        self.known = {path: sig for path, sig in self.known.items() if path in seen}
+
+        for _, path, seller_ntn, signature in sorted(stable):
+            try:
+                fingerprint = get_file_fingerprint(path)
+                ingested = is_file_ingested(fingerprint)
+            except (OSError, sqlite3.Error) as e:
+                # Locked, moved away or the database is busy: start over next scan
+                log(f"Cannot check {path}, will retry: {e}")
+                self.last_seen.pop(path, None)
+                continue
+            self.known[path] = signature
+            if ingested:
+                continue
+            if not seller_ntn:
+                log(f"Skipping {path}: no seller directory and no --seller-ntn")
+                continue
+            self.enqueue(seller_ntn, path, fingerprint)
+
+    def enqueue(self, seller_ntn, path, fingerprint):
+        with self.lock:
+            # A copy of a file that is still being processed
+            if fingerprint in self.queued_fingerprints:
+                return
+            self.queued_paths.add(path)
+            self.queued_fingerprints.add(fingerprint)
+            self.pending.setdefault(seller_ntn, deque()).append((path, fingerprint))
+            if seller_ntn not in self.active:
+                self.active.add(seller_ntn)
+                self.executor.submit(self.drain, seller_ntn)
+
+    def drain(self, seller_ntn):
+        while True:
+            with self.lock:
+                if not self.pending[seller_ntn]:
+                    del self.pending[seller_ntn]
+                    self.active.discard(seller_ntn)
+                    return
+                path, fingerprint = self.pending[seller_ntn].popleft()
+
+            try:
+                self.process_file(path, fingerprint, seller_ntn)
+            except PermanentFailure as e:
+                log(f"Failed {path}: {e}")
+                try:
+                    record_ingested_file(
+                        fingerprint, path, None, "error", {"error": str(e)}
+                    )
+                except Exception as record_error:
+                    # Not retried either; it is picked up again after a restart
+                    log(f"Could not record {path} as failed: {record_error}")
+            except Exception as e:
+                log(f"Failed {path}, will retry: {e}")
+                with self.lock:
+                    self.retry_paths.add(path)
+            finally:
+                with self.lock:
+                    self.queued_paths.discard(path)
+                    self.queued_fingerprints.discard(fingerprint)
+
+    def discard_pending(self):
+        """Drop queued files that have not started; they are picked up next run"""
+        with self.lock:
+            for files in self.pending.values():
+                for path, fingerprint in files:
+                    self.queued_paths.discard(path)
+                    self.queued_fingerprints.discard(fingerprint)
+                files.clear()
+
+    @property
+    def busy(self):
+        with self.lock:
+            return bool(self.active)
+
+    def process_file(self, path, fingerprint, seller_ntn):
+        seller = get_seller_by_ntn_cnic(seller_ntn)
+        if seller is None:
+            log(f"Skipping {path}: seller {seller_ntn} not found")
+            record_ingested_file(
+                fingerprint, path, None, "error", {"error": "seller not found"}
+            )
+            return
+
+        log(f"Processing {path} for {seller[2]}")
+        started = time.perf_counter()
+        try:
+            workbook = read_invoice_workbook(path)
+        except OSError:
+            raise
+        except Exception as e:
+            raise PermanentFailure(f"could not read the workbook: {e}") from e
+        sheet_name, main_df = find_main_sheet(workbook)
+        if main_df is None:
+            raise PermanentFailure("no data found in the workbook")
+
+        mapping, _ = get_column_mapping(seller[0], main_df.columns)
+        missing_required = get_missing_required_fields(mapping)
+        if missing_required:
+            raise PermanentFailure(
+                f"required columns not found: {', '.join(missing_required)}"
+            )
+
+        processed_invoices, processing_errors = process_excel_rows(
+            main_df, mapping, seller
+        )
+        tax_issues = get_tax_issues(
+            reconcile_taxes(processed_invoices, auto_fill=self.fill_taxes)
+        )
+
+        name = os.path.basename(path)
+        passed_invoices, prevalidation_failures = prevalidate_invoices(
+            processed_invoices
+        )
+        api_results = run_api_calls(
+            passed_invoices,
+            validate_invoice_api,
+            seller[5],
+            self.concurrency,
+            f"{name}: validating invoice",
+        )
+        for result in api_results:
+            queue_ledger_result(seller[0], "validation", result)
+        validation_results = sorted(
+            prevalidation_failures + api_results, key=lambda r: r["row_number"]
+        )
+
+        posting_results = []
+        if self.post:
+            valid_invoices = [
+                invoice_item
+                for invoice_item, result in zip(passed_invoices, api_results)
+                if result["success"]
+            ]
+            posting_results = run_api_calls(
+                valid_invoices,
+                post_invoice_api,
+                seller[5],
+                self.concurrency,
+                f"{name}: posting invoice",
+            )
+
+        try:
+            for result in posting_results:
+                queue_ledger_result(seller[0], "posting", result)
+
+            stem = os.path.splitext(path)[0]
+            write_results_workbook(
+                f"{stem}.results.xlsx",
+                validation_results,
+                posting_results,
+                processing_errors,
+                tax_issues,
+            )
+
+            pdf_errors = []
+            successful_posts = [r for r in posting_results if r["success"]]
+            if successful_posts:
+                zip_buffer, pdf_errors = generate_invoice_pdf_zip(successful_posts)
+                write_atomically(f"{stem}.invoices.zip", zip_buffer.getvalue())
+
+            summary = {
+                "sheet": sheet_name,
+                "rows": len(main_df),
+                "skipped": len(processing_errors),
+                "failed_local_checks": len(prevalidation_failures),
+                "tax_issues": len(tax_issues),
+                "validated": sum(r["success"] for r in validation_results),
+                "posted": len(successful_posts),
+                "pdf_errors": len(pdf_errors),
+                "seconds": round(time.perf_counter() - started, 2),
+            }
+            record_ingested_file(fingerprint, path, seller[0], "processed", summary)
+            log(f"Finished {path}: {summary}")
+        except Exception as e:
+            if posting_results:
+                # Trying again would post the same invoices to FBR twice
+                raise PermanentFailure(f"invoices were posted, but {e}") from e
+            raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="Directory to watch")
+    parser.add_argument(
+        "--seller-ntn", help="Seller for workbooks directly in the directory"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Workbooks processed at once"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Parallel FBR API calls per file"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=5.0, help="Seconds between scans"
+    )
+    parser.add_argument(
+        "--validate-only", action="store_true", help="Validate without posting"
+    )
+    parser.add_argument(
+        "--fill-taxes",
+        action="store_true",
+        help="Fill in missing sales tax and further tax from the rate",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Process what is in the directory now, then exit",
+    )
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.directory):
+        parser.error(f"{args.directory} is not a directory")
+    if args.workers < 1 or args.concurrency < 1:
+        parser.error("--workers and --concurrency must be at least 1")
+
+    init_database()
+    watcher = WatchFolder(
+        args.directory,
+        args.seller_ntn,
+        args.workers,
+        args.concurrency,
+        post=not args.validate_only,
+        fill_taxes=args.fill_taxes,
+    )
+    log(f"Watching {os.path.abspath(args.directory)}")
+
+    try:
+        if args.once:
+            # Two scans: the first records sizes, the second picks up stable files
+            watcher.scan()
+            time.sleep(min(args.interval, 1.0))
+            watcher.scan()
+            while watcher.busy:
+                time.sleep(0.2)
+        else:
+            while True:
+                watcher.scan()
+                time.sleep(args.interval)
+    except KeyboardInterrupt:
+        log("Stopping after the files in progress")
+        watcher.discard_pending()
+    finally:
+        watcher.executor.shutdown(wait=True)
+        if not get_ledger_writer().flush(timeout=60):
+            log("Warning: some ledger writes were still pending at exit")
+
+
+if __name__ == "__main__":
+    main()
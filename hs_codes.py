@@ -0,0 +1,117 @@
+import bisect
+import functools
+import os
+import re
+
+import pandas as pd
+
+# CSV with hs_code, description, uom and rate columns. hs_codes.csv ships a
+# starter list of common codes; point FBR_HS_CODES_PATH at a full PCT export
+# in the same format to cover every code.
+HS_CODES_PATH = os.environ.get(
+    "FBR_HS_CODES_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "hs_codes.csv"),
+)
+
+
+def normalize_hs_code(code):
+    """Digits of an HS code, so "0101.2100", "0101 2100" and "01012100" match"""
+    return "".join(ch for ch in str(code) if ch.isdigit())
+
+
+def format_hs_code(value):
+    """HS code from a spreadsheet cell in FBR's 0000.0000 form.
+
+    Excel stores codes typed as numbers, which drops the leading and
+    trailing zeros (0101.2100 becomes 101.21); those are restored. Text
+    that is not a bare number is returned stripped and otherwise unchanged.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if value != value:
+            return ""
+        if float(value).is_integer() and value >= 10000:
+            digits = f"{int(value):08d}"
+            return f"{digits[:4]}.{digits[4:]}"
+        return f"{value:09.4f}"
+    text = str(value).strip()
+    if re.fullmatch(r"\d{7,8}", text):
+        return f"{text.zfill(8)[:4]}.{text.zfill(8)[4:]}"
+    return text
+
+
+def get_words(text):
+    return re.findall(r"[a-z0-9]+", str(text).lower())
+
+
+class HSCodeIndex:
+    """Sorted in-memory index over the HS code reference list.
+
+    Codes are kept sorted by their digits and description words in a sorted
+    (word, position) list, so both code and word prefixes are found with a
+    binary search.
+    """
+
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda e: normalize_hs_code(e["hs_code"]))
+        self.keys = [normalize_hs_code(e["hs_code"]) for e in self.entries]
+        self.by_key = dict(zip(self.keys, self.entries))
+        self.uom_by_key = {key: e["uom"] for key, e in self.by_key.items() if e["uom"]}
+        self.words = sorted(
+            (word, position)
+            for position, entry in enumerate(self.entries)
+            for word in set(get_words(entry["description"]))
+        )
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, code):
+        return self.by_key.get(normalize_hs_code(code))
+
+    def search(self, query, limit=20):
+        """Entries whose code starts with the query, or whose description has
+        a word starting with every word of the query"""
+        query = str(query).strip()
+        if not query:
+            return []
+
+        # "\uffff" sorts after every character that can follow a prefix
+        if not any(ch.isalpha() for ch in query):
+            prefix = normalize_hs_code(query)
+            start = bisect.bisect_left(self.keys, prefix)
+            end = bisect.bisect_left(self.keys, prefix + "\uffff", lo=start)
+            return self.entries[start : min(end, start + limit)]
+
+        matches = None
+        for query_word in get_words(query):
+            start = bisect.bisect_left(self.words, (query_word,))
+            end = bisect.bisect_left(self.words, (query_word + "\uffff",), lo=start)
+            positions = {position for _, position in self.words[start:end]}
+            matches = positions if matches is None else matches & positions
+            if not matches:
+                return []
+        return [self.entries[position] for position in sorted(matches)[:limit]]
+
+
+def load_hs_codes(path=HS_CODES_PATH):
+    reference = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return reference[["hs_code", "description", "uom", "rate"]].to_dict("records")
+
+
+@functools.lru_cache(maxsize=1)
+def get_hs_code_index():
+    """The reference index, loaded once per process"""
+    return HSCodeIndex(load_hs_codes())
+
+
+def format_hs_code_option(entry):
+    return f"{entry['hs_code']} - {entry['description']}"
+
+
+def get_uom_mismatches(hs_codes, uoms):
+    """Boolean Series, True where the HS code is in the reference list and the
+    unit of measure differs from the one listed for it (case-insensitive)"""
+    keys = hs_codes.fillna("").astype(str).str.replace(r"\D", "", regex=True)
+    expected = keys.map(get_hs_code_index().uom_by_key)
+    actual = uoms.fillna("").astype(str).str.strip().str.lower()
+    return expected.notna() & (actual != expected.str.lower())
@@ -0,0 +1,112 @@
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Most recent durations kept per stage; older samples only count towards totals
+MAX_SAMPLES_PER_STAGE = 2000
+
+_lock = threading.Lock()
+_samples = {}
+_totals = {}
+
+
+def record_timing(stage, seconds):
+    """Record one duration for a stage. Safe to call from worker threads."""
+    with _lock:
+        if stage not in _samples:
+            _samples[stage] = deque(maxlen=MAX_SAMPLES_PER_STAGE)
+            _totals[stage] = [0, 0.0, 0.0]
+        _samples[stage].append(seconds)
+        totals = _totals[stage]
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] = max(totals[2], seconds)
+
+
+@contextmanager
+def timer(stage):
+    """Time the enclosed block under the given stage name"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(stage, time.perf_counter() - start)
+
+
+def timed(stage):
+    """Decorator that times every call of the wrapped function"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_timing(stage, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def format_progress(label, done, total, elapsed):
+    """Format a progress line with throughput and ETA"""
+    rate = done / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate > 0 else 0.0
+    return (
+        f"{label} {done} of {total} • {rate:,.1f}/s • "
+        f"ETA {int(eta // 60)}:{int(eta % 60):02d}"
+    )
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def get_stage_stats():
+    """Aggregate per-stage stats in milliseconds.
+
+    Percentiles come from the most recent samples; count, total and max
+    cover every call since the last reset.
+    """
+    with _lock:
+        snapshot = {
+            stage: (sorted(samples), *_totals[stage])
+            for stage, samples in _samples.items()
+        }
+
+    stats = []
+    for stage, (ordered, count, total, longest) in sorted(snapshot.items()):
+        stats.append(
+            {
+                "stage": stage,
+                "count": count,
+                "total_ms": total * 1000,
+                "mean_ms": total / count * 1000,
+                "p50_ms": _percentile(ordered, 0.50) * 1000,
+                "p95_ms": _percentile(ordered, 0.95) * 1000,
+                "max_ms": longest * 1000,
+            }
+        )
+    return stats
+
+
+def export_stats_json():
+    return json.dumps(
+        {
+            "exported_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "max_samples_per_stage": MAX_SAMPLES_PER_STAGE,
+            "stages": get_stage_stats(),
+        },
+        indent=2,
+    )
+
+
+def reset_stats():
+    with _lock:
+        _samples.clear()
+        _totals.clear()
@@ -0,0 +1,195 @@
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+
+# Stands for a key a dict does not have, as opposed to one set to None
+MISSING = object()
+
+# What a missing value is stored as, so it does not change the column's kind
+MISSING_FILL = {"text": "", "float": 0.0, "int": 0, "object": None}
+
+
+class Column:
+    """One payload field of every invoice (or item) in a batch, stored compactly.
+
+    Text is dictionary-encoded (integer codes into a list of distinct
+    values), floats and ints are numpy arrays; anything else (mixed types,
+    None) stays a plain list. Values may be MISSING for dicts without the
+    key; a presence mask records which ones, so has() can tell a missing
+    key from a real value.
+    """
+
+    __slots__ = ("kind", "values", "categories", "present")
+
+    def __init__(self, values):
+        self.categories = None
+        present = np.array([value is not MISSING for value in values], dtype=bool)
+        self.present = None if present.all() else present
+        types = {type(value) for value in values if value is not MISSING}
+        if types <= {str}:
+            kind = "text"
+        elif types == {float}:
+            kind = "float"
+        elif types == {int}:
+            kind = "int"
+        else:
+            kind = "object"
+        if self.present is not None:
+            values = [
+                MISSING_FILL[kind] if value is MISSING else value for value in values
+            ]
+
+        self.kind = kind
+        if kind == "text":
+            codes, categories = pd.factorize(pd.Series(values, dtype=object))
+            self.values = codes.astype(np.min_scalar_type(max(len(categories), 1)))
+            self.categories = categories.tolist()
+        elif kind == "float":
+            self.values = np.array(values, dtype=np.float64)
+        elif kind == "int":
+            self.values = np.array(values, dtype=np.int64)
+        else:
+            self.values = list(values)
+
+    def has(self, position):
+        return self.present is None or bool(self.present[position])
+
+    def __getitem__(self, position):
+        if self.kind == "text":
+            return self.categories[self.values[position]]
+        if self.kind == "float":
+            return float(self.values[position])
+        if self.kind == "int":
+            return int(self.values[position])
+        return self.values[position]
+
+
+def build_columns(dicts, exclude=None):
+    """{key: Column} over a list of dicts, in first-seen key order"""
+    keys = {}
+    for data in dicts:
+        keys.update(dict.fromkeys(data))
+    keys.pop(exclude, None)
+    return {key: Column([data.get(key, MISSING) for data in dicts]) for key in keys}
+
+
+def get_row(columns, position):
+    """The dict a row was built from: only the keys it had"""
+    return {
+        key: column[position] for key, column in columns.items() if column.has(position)
+    }
+
+
+class InvoicePayload(Mapping):
+    """Read-only view of one invoice's FBR payload inside an InvoiceBatch.
+
+    Fields are read from the batch's columns on access and the items list
+    is rebuilt each time it is asked for, so holding a payload (in a bulk
+    result, say) costs almost nothing. Use to_dict() for a real dict, e.g.
+    to send it as JSON.
+    """
+
+    __slots__ = ("batch", "position")
+
+    def __init__(self, batch, position):
+        self.batch = batch
+        self.position = position
+
+    def __getitem__(self, key):
+        if key == "items" and self.batch.has_items[self.position]:
+            return self.batch.get_items(self.position)
+        column = self.batch.invoice_columns.get(key)
+        if column is None or not column.has(self.position):
+            raise KeyError(key)
+        return column[self.position]
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def to_dict(self):
+        payload = get_row(self.batch.invoice_columns, self.position)
+        if self.batch.has_items[self.position]:
+            payload["items"] = self.batch.get_items(self.position)
+        return payload
+
+
+class InvoiceRecord:
+    """One processed invoice of an InvoiceBatch.
+
+    Supports the same keys as the processed-invoice dicts made by
+    process_excel_rows (row_number, buyer_name, amount, invoice_data), so
+    code written for those dicts works with batch records too.
+    """
+
+    __slots__ = ("batch", "position")
+
+    def __init__(self, batch, position):
+        self.batch = batch
+        self.position = position
+
+    def __getitem__(self, key):
+        if key == "invoice_data":
+            return InvoicePayload(self.batch, self.position)
+        column = self.batch.record_columns.get(key)
+        if column is None or not column.has(self.position):
+            raise KeyError(key)
+        return column[self.position]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class InvoiceBatch:
+    """Processed invoices kept column by column instead of one dict per row.
+
+    Built once from the list process_excel_rows returns; the FBR payload of
+    an invoice is only put together when it is sent or rendered. Iterating
+    or indexing yields InvoiceRecord objects.
+    """
+
+    def __init__(self, processed_invoices):
+        self.record_columns = build_columns(processed_invoices, exclude="invoice_data")
+        payloads = [invoice_item["invoice_data"] for invoice_item in processed_invoices]
+        self.invoice_columns = build_columns(payloads, exclude="items")
+        self.has_items = np.array(
+            ["items" in payload for payload in payloads], dtype=bool
+        )
+
+        items = [list(payload.get("items") or []) for payload in payloads]
+        counts = np.array([len(invoice_items) for invoice_items in items], dtype=np.int64)
+        self.item_offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.item_columns = build_columns(
+            [item for invoice_items in items for item in invoice_items]
+        )
+        self.length = len(processed_invoices)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, position):
+        if not -self.length <= position < self.length:
+            raise IndexError("invoice batch index out of range")
+        return InvoiceRecord(self, position % self.length)
+
+    def __iter__(self):
+        for position in range(self.length):
+            yield InvoiceRecord(self, position)
+
+    def get_items(self, position):
+        start, end = self.item_offsets[position], self.item_offsets[position + 1]
+        return [get_row(self.item_columns, index) for index in range(start, end)]
+
+
+def to_payload_dict(invoice_data):
+    """A plain dict for an invoice payload that may be an InvoicePayload view"""
+    if isinstance(invoice_data, InvoicePayload):
+        return invoice_data.to_dict()
+    return invoice_data
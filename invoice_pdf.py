@@ -0,0 +1,414 @@
+import io
+import zipfile
+from datetime import date
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import (
+    SimpleDocTemplate,
+    Paragraph,
+    Spacer,
+    Table,
+    LongTable,
+    TableStyle,
+    PageBreak,
+)
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+
+from instrumentation import timed
+
+
+# PDF Generation Function (keeping original functionality)
+def create_invoice_doc(buffer):
+    """Create the A4 document template used for invoice PDFs"""
+    return SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        topMargin=0.8 * inch,
+        bottomMargin=0.8 * inch,
+        leftMargin=0.8 * inch,
+        rightMargin=0.8 * inch,
+    )
+
+
+def get_invoice_pdf_styles():
+    """Build the stylesheet shared by every invoice rendered into a document"""
+    # Get styles
+    styles = getSampleStyleSheet()
+
+    # Custom styles to match sample PDF exactly
+    styles.add(
+        ParagraphStyle(
+            "CustomTitle",
+            fontName="Times-Bold",
+            fontSize=16,
+            spaceAfter=24,
+            alignment=TA_CENTER,
+            textColor=colors.black,
+        )
+    )
+
+    styles.add(
+        ParagraphStyle(
+            "SectionHeader",
+            fontName="Times-Bold",
+            fontSize=12,
+            spaceAfter=8,
+            spaceBefore=16,
+            textColor=colors.black,
+            alignment=TA_LEFT,
+        )
+    )
+
+    return styles
+
+
+def build_invoice_story(invoice_data, fbr_response, styles):
+    """Build the flowables for a single invoice in the exact FBR sample format"""
+    title_style = styles["CustomTitle"]
+    section_style = styles["SectionHeader"]
+
+    # Story elements
+    story = []
+
+    # Title - exactly as in sample
+    story.append(Paragraph("Sales Tax Invoice", title_style))
+    story.append(Spacer(1, 12))
+
+    # Seller Information Section
+    story.append(Paragraph("Seller Information", section_style))
+
+    # Clean seller address formatting
+    seller_address = invoice_data.get("sellerAddress", "N/A")
+
+    seller_info_data = [
+        [
+            Paragraph("<b>Business Name</b>", styles["Normal"]),
+            Paragraph(invoice_data.get("sellerBusinessName", "N/A"), styles["Normal"]),
+        ],
+        [
+            Paragraph("<b>Registration No.</b>", styles["Normal"]),
+            Paragraph(invoice_data.get("sellerNTNCNIC", "N/A"), styles["Normal"]),
+        ],
+        [
+            Paragraph("<b>Address</b>", styles["Normal"]),
+            Paragraph(seller_address, styles["Normal"]),
+        ],
+    ]
+
+    seller_table = Table(seller_info_data, colWidths=[1.5 * inch, 4.5 * inch])
+    seller_table.setStyle(
+        TableStyle(
+            [
+                ("FONTNAME", (0, 0), (-1, -1), "Times-Roman"),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                ("TOPPADDING", (0, 0), (-1, -1), 2),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+            ]
+        )
+    )
+
+    story.append(seller_table)
+    story.append(Spacer(1, 12))
+
+    # Buyer Information Section
+    story.append(Paragraph("Buyer Information", section_style))
+
+    # Handle buyer registration display
+    buyer_display_name = invoice_data.get("buyerBusinessName", "N/A")
+    if invoice_data.get("buyerRegistrationType") == "Unregistered":
+        buyer_display_name = "Un-Registered"
+
+    buyer_reg_no = invoice_data.get("buyerNTNCNIC", "")
+    if not buyer_reg_no or invoice_data.get("buyerRegistrationType") == "Unregistered":
+        buyer_reg_no = "9999999"
+
+    buyer_info_data = [
+        [
+            Paragraph("<b>Business Name</b>", styles["Normal"]),
+            Paragraph(buyer_display_name, styles["Normal"]),
+        ],
+        [
+            Paragraph("<b>Registration No.</b>", styles["Normal"]),
+            Paragraph(buyer_reg_no, styles["Normal"]),
+        ],
+        [
+            Paragraph("<b>Address</b>", styles["Normal"]),
+            Paragraph(invoice_data.get("buyerAddress", "N/A"), styles["Normal"]),
+        ],
+    ]
+
+    buyer_table = Table(buyer_info_data, colWidths=[1.5 * inch, 4.5 * inch])
+    buyer_table.setStyle(
+        TableStyle(
+            [
+                ("FONTNAME", (0, 0), (-1, -1), "Times-Roman"),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                ("TOPPADDING", (0, 0), (-1, -1), 2),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+            ]
+        )
+    )
+
+    story.append(buyer_table)
+    story.append(Spacer(1, 12))
+
+    # Invoice Summary Section
+    story.append(Paragraph("Invoice Summary", section_style))
+
+    # Get FBR Invoice No from response if available
+    fbr_invoice_no = get_fbr_invoice_number(fbr_response, "Pending")
+
+    summary_info_data = [
+        [
+            Paragraph("<b>FBR Invoice No.</b>", styles["Normal"]),
+            Paragraph(fbr_invoice_no, styles["Normal"]),
+        ],
+        [
+            Paragraph("<b>Date</b>", styles["Normal"]),
+            Paragraph(
+                invoice_data.get("invoiceDate", date.today().strftime("%Y-%m-%d")),
+                styles["Normal"],
+            ),
+        ],
+    ]
+
+    summary_table = Table(summary_info_data, colWidths=[1.5 * inch, 4.5 * inch])
+    summary_table.setStyle(
+        TableStyle(
+            [
+                ("FONTNAME", (0, 0), (-1, -1), "Times-Roman"),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                ("TOPPADDING", (0, 0), (-1, -1), 2),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+            ]
+        )
+    )
+
+    story.append(summary_table)
+    story.append(Spacer(1, 12))
+
+    # Details of Goods Section
+    story.append(Paragraph("Details of Goods", section_style))
+
+    # Items table header - exactly as in sample
+    items_header = [
+        "Description",
+        "HS Code",
+        "Qty",
+        "Value",
+        "Rate",
+        "Sales Tax",
+        "Amount",
+    ]
+    items_data = [items_header]
+
+    total_value_excluding_st = 0
+    total_sales_tax = 0
+    total_amount = 0
+
+    for item in invoice_data.get("items", []):
+        qty = item.get("quantity", 0)
+        value = item.get("valueSalesExcludingST", 0)
+        rate = item.get("rate", "0")
+        sales_tax = item.get("salesTaxApplicable", 0)
+        amount = item.get("totalValues", 0)
+
+        # Format rate exactly as in sample (18%)
+        if not str(rate).endswith("%"):
+            rate = f"{rate}%"
+
+        # Format description - use "No details" if empty like sample
+        description = item.get("productDescription", "No details")
+        if not description.strip():
+            description = "No details"
+
+        items_data.append(
+            [
+                description,
+                item.get("hsCode", ""),
+                str(int(qty)),  # Remove decimal for quantity
+                f"{int(value):,}",  # Format as in sample: 6,000
+                rate,
+                f"{int(sales_tax):,}",  # Format as in sample: 1,080
+                f"{int(amount):,}",  # Format as in sample: 7,080
+            ]
+        )
+
+        total_value_excluding_st += value
+        total_sales_tax += sales_tax
+        total_amount += amount
+
+    # Create items table with exact column widths to match sample.
+    # LongTable splits row by row across pages and repeats the header row,
+    # so invoices with thousands of lines lay out in linear time.
+    items_table = LongTable(
+        items_data,
+        colWidths=[
+            1.4 * inch,
+            0.9 * inch,
+            0.5 * inch,
+            0.7 * inch,
+            0.6 * inch,
+            0.8 * inch,
+            0.8 * inch,
+        ],
+        repeatRows=1,
+        splitByRow=1,
+    )
+    items_table.setStyle(
+        TableStyle(
+            [
+                ("FONTNAME", (0, 0), (-1, -1), "Times-Roman"),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("FONTNAME", (0, 0), (-1, 0), "Times-Bold"),  # Bold headers
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("ALIGN", (0, 1), (0, -1), "LEFT"),  # Description left aligned
+                ("ALIGN", (2, 0), (-1, -1), "CENTER"),  # Numbers centered
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("INNERGRID", (0, 0), (-1, -1), 0.5, colors.black),
+                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
+                ("TOPPADDING", (0, 0), (-1, -1), 6),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+                ("LEFTPADDING", (0, 0), (-1, -1), 4),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 4),
+            ]
+        )
+    )
+
+    story.append(items_table)
+    story.append(Spacer(1, 16))
+
+    # Summary totals - exactly as in sample format
+    totals_data = [
+        ["Value (Excluding Sales Tax)", f"{int(total_value_excluding_st):,}"],
+        ["Sales Tax", f"{int(total_sales_tax):,}"],
+        ["Value (Including Sales Tax)", f"{int(total_amount):,}"],
+    ]
+
+    totals_table = Table(totals_data, colWidths=[2.5 * inch, 1.5 * inch])
+    totals_table.setStyle(
+        TableStyle(
+            [
+                ("FONTNAME", (0, 0), (-1, -1), "Times-Roman"),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("ALIGN", (0, 0), (0, -1), "LEFT"),  # Labels left aligned
+                ("ALIGN", (1, 0), (1, -1), "RIGHT"),  # Values right aligned
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+                ("TOPPADDING", (0, 0), (-1, -1), 3),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+            ]
+        )
+    )
+
+    story.append(totals_table)
+
+    return story
+
+
+@timed("pdf.generate_invoice_pdf")
+def generate_invoice_pdf(invoice_data, fbr_response=None):
+    """Generate PDF invoice matching the exact FBR format from sample"""
+    buffer = io.BytesIO()
+    doc = create_invoice_doc(buffer)
+
+    # Build PDF
+    styles = get_invoice_pdf_styles()
+    doc.build(build_invoice_story(invoice_data, fbr_response, styles))
+    buffer.seek(0)
+    return buffer
+
+
+@timed("pdf.generate_combined_invoice_pdf")
+def generate_combined_invoice_pdf(posting_results):
+    """Generate one PDF containing every posted invoice, each starting on a new page.
+
+    All invoices share a single stylesheet and a single document build.
+    Returns the PDF buffer and a list of per-row error messages for invoices
+    that could not be rendered.
+    """
+    buffer = io.BytesIO()
+    doc = create_invoice_doc(buffer)
+    styles = get_invoice_pdf_styles()
+
+    story = []
+    errors = []
+    for result in posting_results:
+        try:
+            invoice_story = build_invoice_story(
+                result["invoice_data"], result["response"], styles
+            )
+        except Exception as e:
+            errors.append(f"Row {result['row_number']}: {str(e)}")
+            continue
+
+        if story:
+            story.append(PageBreak())
+        story.extend(invoice_story)
+
+    if story:
+        doc.build(story)
+    buffer.seek(0)
+    return buffer, errors
+
+
+@timed("pdf.generate_invoice_pdf_zip")
+def generate_invoice_pdf_zip(posting_results, on_progress=None):
+    """Generate a ZIP with one PDF per posted invoice.
+
+    Returns the ZIP buffer and a list of per-row error messages for invoices
+    that could not be rendered. on_progress, if given, is called with the
+    number of invoices handled so far.
+    """
+    buffer = io.BytesIO()
+    errors = []
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for done, result in enumerate(posting_results, start=1):
+            if on_progress is not None:
+                on_progress(done)
+            try:
+                pdf_buffer = generate_invoice_pdf(
+                    result["invoice_data"], result["response"]
+                )
+                zip_file.writestr(
+                    get_invoice_pdf_filename(result), pdf_buffer.getvalue()
+                )
+            except Exception as e:
+                errors.append(f"Row {result['row_number']}: {str(e)}")
+
+    buffer.seek(0)
+    return buffer, errors
+
+
+def get_fbr_invoice_number(fbr_response, default="N/A"):
+    """Extract the FBR invoice number from an API response"""
+    if isinstance(fbr_response, dict):
+        if "invoiceNumber" in fbr_response:
+            return fbr_response["invoiceNumber"]
+        elif "data" in fbr_response and fbr_response["data"]:
+            return fbr_response["data"].get("invoiceNumber", default)
+    return default
+
+
+def get_invoice_pdf_filename(result):
+    """Build the download filename for a bulk posting result"""
+    safe_buyer_name = "".join(
+        c for c in result["buyer_name"] if c.isalnum() or c in (" ", "-", "_")
+    ).rstrip()
+    return f"Invoice_Row_{result['row_number']}_{safe_buyer_name[:20]}.pdf"
@@ -0,0 +1,195 @@
+import pandas as pd
+
+from hs_codes import get_uom_mismatches
+from instrumentation import timed
+from sales_tax import TAX_COLUMNS, TAX_TOLERANCE_PAISA, check_taxes
+
+# Province names FBR accepts; the manual invoice form offers the same list
+PROVINCES = [
+    "Sindh",
+    "Punjab",
+    "Khyber Pakhtunkhwa",
+    "Balochistan",
+    "Gilgit-Baltistan",
+    "Azad Kashmir",
+    "Islamabad Capital Territory",
+]
+
+# Checks FBR would reject an invoice for, run locally before any API call.
+# Each rule names a payload field (invoice level or item level), a check
+# from RULE_CHECKS and the check's parameters. "columns" lists any further
+# fields the check reads.
+PREVALIDATION_RULES = [
+    {
+        "id": "PV001",
+        "column": "hsCode",
+        "check": "required",
+        "message": "HS code is missing",
+    },
+    {
+        "id": "PV002",
+        "column": "salesTaxApplicable",
+        "check": "tax_issues",
+        "columns": TAX_COLUMNS,
+        "issues": ["sales_tax_missing", "sales_tax_mismatch"],
+        "tolerance_paisa": TAX_TOLERANCE_PAISA,
+        "message": "Sales tax does not match rate x value excluding sales tax",
+    },
+    {
+        "id": "PV003",
+        "column": "buyerNTNCNIC",
+        "check": "digit_length",
+        "lengths": [7, 13],
+        "message": "Buyer NTN/CNIC must be 7 (NTN) or 13 (CNIC) digits",
+    },
+    {
+        "id": "PV004",
+        "column": "buyerProvince",
+        "check": "one_of",
+        "values": PROVINCES,
+        "message": "Unknown buyer province",
+    },
+    {
+        "id": "PV005",
+        "column": "hsCode",
+        "check": "pattern",
+        "pattern": r"\d{4}\.\d{4}",
+        "message": "HS code must look like 0101.2100",
+    },
+    {
+        "id": "PV006",
+        "column": "uoM",
+        "check": "reference_uom",
+        "code_column": "hsCode",
+        "message": "Unit of measure does not match the HS code",
+    },
+]
+
+MISSING_VALUES = ["", "nan", "none", "nat"]
+
+
+def as_text(values):
+    return values.fillna("").astype(str).str.strip()
+
+
+def check_required(frame, rule):
+    return as_text(frame[rule["column"]]).str.lower().isin(MISSING_VALUES)
+
+
+def check_digit_length(frame, rule):
+    digits = as_text(frame[rule["column"]]).str.replace(r"[\s-]", "", regex=True)
+    return ~(digits.str.fullmatch(r"\d+") & digits.str.len().isin(rule["lengths"]))
+
+
+def check_one_of(frame, rule):
+    allowed = [value.lower() for value in rule["values"]]
+    return ~as_text(frame[rule["column"]]).str.lower().isin(allowed)
+
+
+def check_pattern(frame, rule):
+    # Missing values are left to a "required" rule
+    values = as_text(frame[rule["column"]])
+    present = ~values.str.lower().isin(MISSING_VALUES)
+    return present & ~values.str.fullmatch(rule["pattern"])
+
+
+def check_reference_uom(frame, rule):
+    # Codes missing from the HS code reference list are not checked
+    return get_uom_mismatches(frame[rule["code_column"]], frame[rule["column"]])
+
+
+def check_tax_issues(frame, rule):
+    # Same reconciliation (and tolerance) as the tax check in sales_tax
+    checked = check_taxes(frame[TAX_COLUMNS], rule["tolerance_paisa"])
+    return checked[rule["issues"]].any(axis=1)
+
+
+RULE_CHECKS = {
+    "required": check_required,
+    "digit_length": check_digit_length,
+    "one_of": check_one_of,
+    "tax_issues": check_tax_issues,
+    "pattern": check_pattern,
+    "reference_uom": check_reference_uom,
+}
+
+
+def get_rule_columns(rules):
+    columns = []
+    for rule in rules:
+        names = [rule[key] for key in ("column", "code_column") if key in rule]
+        for column in names + rule.get("columns", []):
+            if column not in columns:
+                columns.append(column)
+    return columns
+
+
+def build_invoice_frame(processed_invoices, columns):
+    """One row per invoice item holding the given payload fields.
+
+    Invoice-level fields are repeated on every item row; the "invoice"
+    column is the invoice's position in processed_invoices.
+    """
+    sources = [
+        (position, invoice_item["invoice_data"], item)
+        for position, invoice_item in enumerate(processed_invoices)
+        for item in invoice_item["invoice_data"].get("items") or [{}]
+    ]
+    data = {"invoice": [position for position, _, _ in sources]}
+    for column in columns:
+        data[column] = [
+            item[column] if column in item else invoice_data.get(column)
+            for _, invoice_data, item in sources
+        ]
+    return pd.DataFrame(data)
+
+
+def evaluate_rules(frame, rules=PREVALIDATION_RULES):
+    """Boolean frame with one column per rule id; True where the row fails"""
+    return pd.DataFrame(
+        {rule["id"]: RULE_CHECKS[rule["check"]](frame, rule) for rule in rules},
+        index=frame.index,
+    )
+
+
+@timed("prevalidation.prevalidate_invoices")
+def prevalidate_invoices(processed_invoices, rules=PREVALIDATION_RULES):
+    """Split processed invoices into (passed, rejected) by the local rules.
+
+    Rejected invoices come back as results shaped like call_invoice_api's,
+    with status_code None and the failed rule ids in response["failedRules"],
+    so they can be listed alongside FBR's own validation results.
+    """
+    if not processed_invoices:
+        return [], []
+
+    frame = build_invoice_frame(processed_invoices, get_rule_columns(rules))
+    failures = evaluate_rules(frame, rules).groupby(frame["invoice"]).any()
+    failed_positions = set(failures.index[failures.any(axis=1)])
+
+    messages = {rule["id"]: rule["message"] for rule in rules}
+    passed = []
+    rejected = []
+    for position, invoice_item in enumerate(processed_invoices):
+        if position not in failed_positions:
+            passed.append(invoice_item)
+            continue
+        row = failures.loc[position]
+        rule_ids = row.index[row].tolist()
+        rejected.append(
+            {
+                "row_number": invoice_item["row_number"],
+                "buyer_name": invoice_item["buyer_name"],
+                "invoice_data": invoice_item["invoice_data"],
+                "status_code": None,
+                "response": {
+                    "error": "; ".join(
+                        f"{rule_id}: {messages[rule_id]}" for rule_id in rule_ids
+                    ),
+                    "failedRules": rule_ids,
+                },
+                "success": False,
+            }
+        )
+
+    return passed, rejected
@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+# Further tax charged on supplies to unregistered buyers, percent of value
+FURTHER_TAX_RATE = 4.0
+
+# Differences up to this many paisa are treated as rounding
+TAX_TOLERANCE_PAISA = 100
+
+# Flag column -> description shown in the issue column
+TAX_ISSUES = {
+    "sales_tax_missing": "sales tax missing",
+    "sales_tax_mismatch": "sales tax does not match rate",
+    "further_tax_missing": "further tax missing",
+    "further_tax_mismatch": "further tax does not match",
+    "total_mismatch": "total does not add up",
+}
+
+
+def to_paisa(values):
+    """Rupee amounts (numbers or numeric strings) as int64 paisa; blanks are 0"""
+    rupees = pd.to_numeric(values, errors="coerce").fillna(0)
+    return (rupees * 100).round().astype("int64")
+
+
+def percent_of(paisa, basis_points):
+    """paisa x basis_points / 10000, rounded half up; NA where the rate is NA"""
+    return (paisa * basis_points + 5000) // 10000
+
+
+# Payload fields the reconciliation reads, item level except for
+# buyerRegistrationType
+TAX_COLUMNS = [
+    "rate",
+    "valueSalesExcludingST",
+    "salesTaxApplicable",
+    "furtherTax",
+    "extraTax",
+    "discount",
+    "totalValues",
+    "buyerRegistrationType",
+]
+
+
+def is_flagged(condition):
+    return condition.fillna(False).astype(bool)
+
+
+def check_taxes(frame, tolerance_paisa=TAX_TOLERANCE_PAISA):
+    """Expected taxes and issue flags for a frame of TAX_COLUMNS, one row per
+    invoice item.
+
+    Returns a frame with the amounts in paisa (value, sales_tax,
+    expected_sales_tax, further_tax, expected_further_tax, extra_tax,
+    discount, total), the rate text and a flag column per TAX_ISSUES entry.
+    Expected sales tax is value excluding ST x rate; only percentage rates
+    are checked. Unregistered buyers are expected to carry further tax at
+    FURTHER_TAX_RATE on taxable supplies. A tax of 0 where one is expected
+    counts as missing; other differences beyond tolerance_paisa are
+    mismatches.
+    """
+    index = frame.index
+    rate_text = frame["rate"].fillna("").astype(str).str.strip()
+    rate_basis_points = (
+        pd.to_numeric(rate_text.str.rstrip("%"), errors="coerce") * 100
+    ).round().astype("Int64")
+    value = to_paisa(frame["valueSalesExcludingST"])
+    sales_tax = to_paisa(frame["salesTaxApplicable"])
+    further_tax = to_paisa(frame["furtherTax"])
+    extra_tax = to_paisa(frame["extraTax"])
+    discount = to_paisa(frame["discount"])
+    total = to_paisa(frame["totalValues"])
+    unregistered = (
+        frame["buyerRegistrationType"]
+        .fillna("")
+        .astype(str)
+        .str.lower()
+        .str.contains("unregistered", regex=False)
+    )
+
+    expected_sales_tax = percent_of(value, rate_basis_points)
+    expected_further_tax = pd.Series(0, index=index, dtype="Int64").mask(
+        rate_basis_points.isna()
+    )
+    taxable = unregistered & is_flagged(rate_basis_points > 0)
+    expected_further_tax[taxable] = percent_of(
+        value[taxable], int(round(FURTHER_TAX_RATE * 100))
+    )
+
+    checked = pd.DataFrame(
+        {
+            "rate": rate_text,
+            "value": value,
+            "sales_tax": sales_tax,
+            "expected_sales_tax": expected_sales_tax,
+            "further_tax": further_tax,
+            "expected_further_tax": expected_further_tax,
+            "extra_tax": extra_tax,
+            "discount": discount,
+            "total": total,
+        },
+        index=index,
+    )
+    checked["sales_tax_missing"] = is_flagged(
+        (sales_tax == 0) & (expected_sales_tax > 0)
+    )
+    checked["sales_tax_mismatch"] = ~checked["sales_tax_missing"] & is_flagged(
+        (sales_tax - expected_sales_tax).abs() > tolerance_paisa
+    )
+    checked["further_tax_missing"] = is_flagged(
+        (further_tax == 0) & (expected_further_tax > 0)
+    )
+    checked["further_tax_mismatch"] = ~checked["further_tax_missing"] & is_flagged(
+        (further_tax - expected_further_tax).abs() > tolerance_paisa
+    )
+    checked["total_mismatch"] = (
+        total - (value + sales_tax + further_tax + extra_tax - discount)
+    ).abs() > tolerance_paisa
+    return checked
+
+
+@timed("tax.reconcile_taxes")
+def reconcile_taxes(
+    processed_invoices, tolerance_paisa=TAX_TOLERANCE_PAISA, auto_fill=False
+):
+    """Recompute sales tax, further tax and totals for every invoice item.
+
+    All arithmetic is done on whole paisa for the whole batch at once, by
+    check_taxes(). With auto_fill, missing taxes are filled in and the
+    item total and invoice amount are updated in place. Values that are
+    present but differ by more than tolerance_paisa are flagged, never
+    changed.
+
+    Returns one row per item with the amounts in rupees, a flag column per
+    TAX_ISSUES entry, a "filled" column and a readable "issues" column.
+    """
+    sources = [
+        (invoice_item, invoice_item["invoice_data"], item)
+        for invoice_item in processed_invoices
+        for item in invoice_item["invoice_data"].get("items") or []
+    ]
+    index = pd.RangeIndex(len(sources))
+    invoice_level = ["buyerRegistrationType"]
+    frame = pd.DataFrame(
+        {
+            column: [
+                (invoice_data if column in invoice_level else item).get(column)
+                for _, invoice_data, item in sources
+            ]
+            for column in TAX_COLUMNS
+        },
+        index=index,
+        dtype=object,
+    )
+    checked = check_taxes(frame, tolerance_paisa)
+    value = checked["value"]
+    sales_tax = checked["sales_tax"]
+    expected_sales_tax = checked["expected_sales_tax"]
+    further_tax = checked["further_tax"]
+    expected_further_tax = checked["expected_further_tax"]
+    extra_tax = checked["extra_tax"]
+    discount = checked["discount"]
+    total = checked["total"]
+    flags = checked[list(TAX_ISSUES)]
+
+    filled = pd.Series(False, index=index)
+    if auto_fill:
+        fill_sales_tax = flags["sales_tax_missing"]
+        fill_further_tax = flags["further_tax_missing"]
+        sales_tax = sales_tax.where(~fill_sales_tax, expected_sales_tax).astype("int64")
+        further_tax = further_tax.where(
+            ~fill_further_tax, expected_further_tax
+        ).astype("int64")
+        filled = fill_sales_tax | fill_further_tax
+        new_total = value + sales_tax + further_tax + extra_tax - discount
+
+        for position in np.flatnonzero(filled.to_numpy()):
+            invoice_item, _, item = sources[position]
+            item["salesTaxApplicable"] = int(sales_tax[position]) / 100
+            item["furtherTax"] = int(further_tax[position]) / 100
+            item["totalValues"] = int(new_total[position]) / 100
+            invoice_item["amount"] += float(new_total[position] - total[position]) / 100
+        total = total.where(~filled, new_total)
+
+    issues = pd.Series("", index=index)
+    for flag, description in TAX_ISSUES.items():
+        issues = issues.where(
+            ~flags[flag], issues + np.where(issues == "", "", "; ") + description
+        )
+
+    reconciliation = pd.DataFrame(
+        {
+            "row_number": [invoice_item["row_number"] for invoice_item, _, _ in sources],
+            "rate": checked["rate"],
+            "value_excl_st": value / 100,
+            "sales_tax": sales_tax / 100,
+            "expected_sales_tax": expected_sales_tax / 100,
+            "further_tax": further_tax / 100,
+            "expected_further_tax": expected_further_tax / 100,
+            "total_values": total / 100,
+        },
+        index=index,
+    )
+    return pd.concat(
+        [reconciliation, flags, filled.rename("filled"), issues.rename("issues")],
+        axis=1,
+    )
+
+
+def get_tax_issues(reconciliation):
+    """Rows of a reconcile_taxes() frame with at least one flagged issue"""
+    return reconciliation[reconciliation[list(TAX_ISSUES)].any(axis=1)]
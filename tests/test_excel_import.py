@@ -0,0 +1,74 @@
+import pandas as pd
+
+import db
+from excel_import import parse_invoice_dates, process_excel_rows
+from invoice_batch import InvoiceBatch
+from prevalidation import prevalidate_invoices
+
+
+def test_ambiguous_dates_are_read_month_first():
+    # Every day is 12 or less, so the column fits MM/DD and DD/MM equally well
+    parsed, label = parse_invoice_dates(
+        pd.Series(["05/08/2025", "05/08/2025", "12/01/2025"])
+    )
+    assert label == "MM/DD/YYYY"
+    assert parsed.dt.strftime("%Y-%m-%d").tolist() == [
+        "2025-05-08",
+        "2025-05-08",
+        "2025-12-01",
+    ]
+
+
+def test_day_first_dates_are_read_day_first():
+    parsed, label = parse_invoice_dates(pd.Series(["05/08/2025", "21/08/2025"]))
+    assert label == "DD/MM/YYYY"
+    assert parsed.dt.strftime("%Y-%m-%d").tolist() == ["2025-08-05", "2025-08-21"]
+
+
+def test_float_ntn_column_passes_prevalidation(tmp_path, monkeypatch):
+    # A blank NTN cell makes Excel's NTN/CNIC column float: 1234567.0
+    monkeypatch.chdir(tmp_path)
+    db.init_database()
+    main_df = pd.DataFrame(
+        {
+            "NTN": [1234567.0, 4210112345671.0, float("nan")],
+            "Buyer": ["Alpha Traders", "Beta Stores", "Gamma Mart"],
+            "Type": ["Registered", "Registered", "Registered"],
+            "Province": ["Sindh", "Punjab", "Sindh"],
+            "Date": ["08/21/2025", "08/21/2025", "08/21/2025"],
+            "HS Code": ["0101.2100", "0101.2100", "0101.2100"],
+            "Description": ["Horse", "Horse", "Horse"],
+            "Qty": [1, 1, 1],
+            "UoM": ["Numbers, pieces, units"] * 3,
+            "Rate": ["18%", "18%", "18%"],
+            "Value": [100.0, 200.0, 300.0],
+            "Sales Tax": [18.0, 36.0, 54.0],
+        }
+    )
+    mapping = {
+        "buyer_reg_no": "NTN",
+        "buyer_name": "Buyer",
+        "buyer_type": "Type",
+        "buyer_province": "Province",
+        "invoice_date": "Date",
+        "hs_code": "HS Code",
+        "product_desc": "Description",
+        "quantity": "Qty",
+        "uom": "UoM",
+        "rate": "Rate",
+        "value_excl_st": "Value",
+        "sales_tax": "Sales Tax",
+    }
+    seller = (1, "7654321", "Seller", "Sindh", "Karachi", "token", None)
+
+    processed_invoices, errors = process_excel_rows(main_df, mapping, seller)
+    passed, rejected = prevalidate_invoices(InvoiceBatch(processed_invoices))
+
+    assert errors == []
+    assert [invoice["invoice_data"]["buyerNTNCNIC"] for invoice in passed] == [
+        "1234567",
+        "4210112345671",
+    ]
+    assert [(r["row_number"], r["response"]["failedRules"]) for r in rejected] == [
+        (3, ["PV003"])
+    ]
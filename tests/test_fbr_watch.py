@@ -0,0 +1,35 @@
+import os
+
+import db
+import fbr_watch
+
+
+def test_scan_retries_a_locked_workbook(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db.init_database()
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "sales.xlsx").write_bytes(b"workbook")
+
+    watcher = fbr_watch.WatchFolder(
+        str(inbox), "1234567", workers=1, concurrency=1, post=False, fill_taxes=False
+    )
+    enqueued = []
+    monkeypatch.setattr(
+        watcher, "enqueue", lambda *args: enqueued.append(args), raising=False
+    )
+
+    def locked_open(*args, **kwargs):
+        raise PermissionError("file is locked")
+
+    monkeypatch.setattr(fbr_watch, "open", locked_open, raising=False)
+    watcher.scan()
+    watcher.scan()
+    assert enqueued == []
+
+    monkeypatch.delattr(fbr_watch, "open")
+    watcher.scan()
+    watcher.scan()
+    assert [(ntn, os.path.basename(path)) for ntn, path, _ in enqueued] == [
+        ("1234567", "sales.xlsx")
+    ]
@@ -0,0 +1,57 @@
+import json
+
+from invoice_batch import InvoiceBatch, to_payload_dict
+
+
+def test_payloads_round_trip_with_different_key_sets():
+    processed_invoices = [
+        {
+            "row_number": 1,
+            "buyer_name": "A",
+            "amount": 118.0,
+            "invoice_data": {
+                "invoiceRefNo": "R1",
+                "buyerNTNCNIC": "1234567",
+                "scenarioId": None,
+                "items": [
+                    {"hsCode": "0101.2100", "quantity": 1, "rate": "18%"},
+                    {"hsCode": "0102.2100", "quantity": 2.5, "discount": 0.0},
+                ],
+            },
+        },
+        {
+            "row_number": 2,
+            "buyer_name": "B",
+            "amount": 50,
+            "error_note": "late",
+            "invoice_data": {
+                "invoiceRefNo": "R2",
+                "buyerProvince": "Sindh",
+                "items": [{"quantity": 3, "sroScheduleNo": ""}],
+            },
+        },
+        {
+            "row_number": 3,
+            "buyer_name": "C",
+            "amount": 0.0,
+            "invoice_data": {"invoiceRefNo": "R3"},
+        },
+    ]
+    expected = json.loads(json.dumps(processed_invoices))
+
+    batch = InvoiceBatch(processed_invoices)
+
+    assert len(batch) == 3
+    for record, original in zip(batch, expected):
+        payload = to_payload_dict(record["invoice_data"])
+        assert json.dumps(payload, sort_keys=True) == json.dumps(
+            original["invoice_data"], sort_keys=True
+        )
+        assert dict(record["invoice_data"]) == original["invoice_data"]
+        for key, value in original.items():
+            if key != "invoice_data":
+                assert record[key] == value
+    assert batch[0].get("error_note") is None
+    assert "buyerProvince" not in batch[0]["invoice_data"]
+    assert batch[0]["invoice_data"]["scenarioId"] is None
+    assert "items" not in batch[2]["invoice_data"]
@@ -0,0 +1,425 @@
+import time
+
+import streamlit as st
+
+from instrumentation import format_progress
+
+
+# Enhanced CSS Styling
+def load_css():
+    st.markdown(
+        """
+    <style>
+    /* Main App Styling */
+    .main .block-container {
+        padding-top: 2rem;
+        padding-bottom: 2rem;
+        max-width: 1200px;
+    }
+    
+    /* Custom Header Styling */
+    .custom-header {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 2rem;
+        border-radius: 15px;
+        margin-bottom: 2rem;
+        box-shadow: 0 10px 25px rgba(102, 126, 234, 0.2);
+    }
+    
+    .custom-header h1 {
+        color: white;
+        font-size: 2.5rem;
+        font-weight: 700;
+        margin: 0;
+        text-align: center;
+    }
+    
+    .custom-header p {
+        color: rgba(255, 255, 255, 0.9);
+        text-align: center;
+        font-size: 1.1rem;
+        margin-top: 0.5rem;
+    }
+    
+    /* Card Styling */
+    .custom-card {
+        background: white;
+        padding: 2rem;
+        border-radius: 15px;
+        box-shadow: 0 8px 25px rgba(0, 0, 0, 0.1);
+        border: 1px solid #e1e5e9;
+        margin-bottom: 1.5rem;
+        transition: transform 0.3s ease, box-shadow 0.3s ease;
+    }
+    
+    .custom-card:hover {
+        transform: translateY(-5px);
+        box-shadow: 0 15px 35px rgba(0, 0, 0, 0.15);
+    }
+    
+    /* Action Cards */
+    .action-card {
+        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 12px;
+        text-align: center;
+        margin-bottom: 1rem;
+        cursor: pointer;
+        transition: all 0.3s ease;
+        border: none;
+    }
+    
+    .action-card:hover {
+        transform: scale(1.05);
+        box-shadow: 0 10px 25px rgba(245, 87, 108, 0.3);
+    }
+    
+    .action-card h3 {
+        margin: 0 0 0.5rem 0;
+        font-size: 1.3rem;
+    }
+    
+    .action-card p {
+        margin: 0;
+        opacity: 0.9;
+    }
+    
+    /* Stats Cards */
+    .stats-card {
+        background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 12px;
+        text-align: center;
+        margin-bottom: 1rem;
+    }
+    
+    .stats-number {
+        font-size: 2.5rem;
+        font-weight: 700;
+        margin: 0;
+    }
+    
+    .stats-label {
+        font-size: 0.9rem;
+        opacity: 0.9;
+        margin: 0;
+    }
+    
+    /* Success/Error Cards */
+    .success-card {
+        background: linear-gradient(135deg, #a8edea 0%, #fed6e3 100%);
+        border-left: 5px solid #10b981;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 1rem 0;
+    }
+    
+    .error-card {
+        background: linear-gradient(135deg, #ffecd2 0%, #fcb69f 100%);
+        border-left: 5px solid #ef4444;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 1rem 0;
+    }
+    
+    /* Form Enhancements */
+    .stSelectbox > div > div {
+        background: #f8fafc;
+        border-radius: 8px;
+    }
+    
+    .stTextInput > div > div {
+        background: #f8fafc;
+        border-radius: 8px;
+    }
+    
+    .stTextArea > div > div {
+        background: #f8fafc;
+        border-radius: 8px;
+    }
+    
+    /* Button Enhancements */
+    .stButton > button {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 0.5rem 1rem;
+        font-weight: 600;
+        transition: all 0.3s ease;
+    }
+    
+    .stButton > button:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
+    }
+    
+    /* Sidebar Enhancements */
+    .css-1d391kg {
+        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
+    }
+    
+    .css-1d391kg .css-1d391kg {
+        color: white;
+    }
+    
+    /* Navigation Breadcrumb */
+    .nav-breadcrumb {
+        background: #f1f5f9;
+        padding: 1rem;
+        border-radius: 8px;
+        margin-bottom: 2rem;
+        font-size: 0.9rem;
+        color: #64748b;
+    }
+    
+    /* Table Enhancements */
+    .dataframe {
+        border-radius: 8px;
+        overflow: hidden;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+    
+    /* Progress Bar */
+    .stProgress > div > div {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        border-radius: 10px;
+    }
+    
+    /* Metric Cards */
+    .metric-card {
+        background: white;
+        padding: 1.5rem;
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        text-align: center;
+        border-left: 4px solid #667eea;
+    }
+    
+    /* Upload Zone */
+    .uploadedFile {
+        background: linear-gradient(135deg, #a8edea 0%, #fed6e3 100%);
+        border-radius: 10px;
+        padding: 1rem;
+    }
+    
+    /* Footer */
+    .footer {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 2rem;
+        text-align: center;
+        border-radius: 10px;
+        margin-top: 3rem;
+    }
+    
+    /* Animation Classes */
+    .fade-in {
+        animation: fadeIn 0.8s ease-in;
+    }
+    
+    @keyframes fadeIn {
+        from { opacity: 0; transform: translateY(20px); }
+        to { opacity: 1; transform: translateY(0); }
+    }
+    
+    .slide-up {
+        animation: slideUp 0.6s ease-out;
+    }
+    
+    @keyframes slideUp {
+        from { transform: translateY(30px); opacity: 0; }
+        to { transform: translateY(0); opacity: 1; }
+    }
+    </style>
+    """,
+        unsafe_allow_html=True,
+    )
+
+
+# Enhanced Components
+def create_header(title, subtitle=""):
+    st.markdown(
+        f"""
+    <div class="custom-header fade-in">
+        <h1>{title}</h1>
+        {f'<p>{subtitle}</p>' if subtitle else ''}
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+
+def create_action_card(title, description, icon="🚀"):
+    return st.markdown(
+        f"""
+    <div class="action-card slide-up">
+        <h3>{icon} {title}</h3>
+        <p>{description}</p>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+
+def create_stats_card(number, label):
+    return st.markdown(
+        f"""
+    <div class="stats-card">
+        <p class="stats-number">{number}</p>
+        <p class="stats-label">{label}</p>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+
+def create_success_message(message):
+    st.markdown(
+        f"""
+    <div class="success-card">
+        <strong>✅ Success:</strong> {message}
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+
+def create_error_message(message):
+    st.markdown(
+        f"""
+    <div class="error-card">
+        <strong>❌ Error:</strong> {message}
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+
+def create_pagination(total_rows, key, page_size=20):
+    """Render a page selector and return the (start, end) slice for the current page"""
+    page_count = max(1, (total_rows + page_size - 1) // page_size)
+    # Clamp a stale page number left over from a longer result set
+    if st.session_state.get(key, 1) > page_count:
+        st.session_state[key] = 1
+
+    col_page, col_info = st.columns([1, 3])
+    with col_page:
+        page = st.number_input("Page", min_value=1, max_value=page_count, key=key)
+    with col_info:
+        st.markdown(
+            f"<div style='margin-top: 2.2rem;'>Page {page} of {page_count} • "
+            f"{total_rows} rows</div>",
+            unsafe_allow_html=True,
+        )
+
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total_rows)
+
+
+class ProgressReporter:
+    """Progress bar and status line for bulk loops that coalesces UI updates.
+
+    Every st.progress / st.text call is a websocket delta, so updates are only
+    sent when both min_interval seconds and 1% of the items have passed since
+    the last one. The status line shows throughput and an ETA.
+    """
+
+    def __init__(self, total, label, min_interval=0.1):
+        self.total = total
+        self.label = label
+        self.min_interval = min_interval
+        self.min_items = max(1, total // 100)
+        self.progress_bar = st.progress(0)
+        self.status_text = st.empty()
+        self.started_at = time.perf_counter()
+        self.last_update_at = 0.0
+        self.last_done = 0
+
+    def update(self, done):
+        now = time.perf_counter()
+        if done < self.total and (
+            now - self.last_update_at < self.min_interval
+            or done - self.last_done < self.min_items
+        ):
+            return
+
+        self.last_update_at = now
+        self.last_done = done
+
+        self.progress_bar.progress(done / self.total if self.total else 1.0)
+        self.status_text.text(
+            format_progress(self.label, done, self.total, now - self.started_at)
+        )
+
+    def close(self):
+        self.progress_bar.empty()
+        self.status_text.empty()
+
+
+def create_nav_breadcrumb(current_page):
+    breadcrumbs = {
+        "dashboard": "Dashboard",
+        "invoice_method_selection": "Dashboard > Invoice Method",
+        "search_seller": "Dashboard > Search Seller",
+        "excel_seller_search": "Dashboard > Excel Upload > Search Seller",
+        "invoice": "Dashboard > Create Invoice",
+        "excel_invoice": "Dashboard > Excel Processing",
+        "update": "Dashboard > Update Seller",
+        "diagnostics": "Dashboard > Diagnostics",
+    }
+
+    breadcrumb = breadcrumbs.get(current_page, "Dashboard")
+    st.markdown(
+        f"""
+    <div class="nav-breadcrumb">
+        <strong>📍 Navigation:</strong> {breadcrumb}
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+
+# Navigation functions
+def go_to_dashboard():
+    st.session_state.page = "dashboard"
+    st.session_state.selected_seller_id = None
+    st.session_state.search_purpose = None
+    st.session_state.invoice_method = None
+    st.session_state.excel_data = None
+    st.session_state.column_mapping = {}
+    st.session_state.invoices_prepared = []
+
+
+def go_to_method_selection():
+    st.session_state.page = "invoice_method_selection"
+
+
+def go_to_search_seller(purpose):
+    st.session_state.page = "search_seller"
+    st.session_state.search_purpose = purpose
+
+
+def go_to_excel_seller_search():
+    st.session_state.page = "excel_seller_search"
+
+
+def go_to_invoice_page(seller_id):
+    st.session_state.page = "invoice"
+    st.session_state.selected_seller_id = seller_id
+
+
+def go_to_update_page(seller_id):
+    st.session_state.page = "update"
+    st.session_state.selected_seller_id = seller_id
+
+
+def go_to_excel_invoice(seller_id):
+    st.session_state.page = "excel_invoice"
+    st.session_state.selected_seller_id = seller_id
+
+
+def go_to_diagnostics():
+    st.session_state.page = "diagnostics"
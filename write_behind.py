@@ -0,0 +1,151 @@
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+from instrumentation import timer
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """Buffers SQLite writes in memory and applies them from a single thread.
+
+    Callers enqueue (sql, params) pairs and return immediately, so SQLite
+    writer-lock waits never add to API latency. The writer thread drains
+    whatever has accumulated (up to batch_size) and commits it as one
+    transaction. The queue is bounded: put() blocks when max_pending writes
+    are outstanding, which slows producers down instead of growing memory.
+    Pending writes are flushed at interpreter shutdown. If a batch fails,
+    its writes are retried one at a time and only the ones that still fail
+    are dropped (and logged).
+    """
+
+    def __init__(self, db_path, max_pending=10000, batch_size=500, max_retries=3):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.closed = False
+        self.written = 0
+        self.failed = 0
+        self.last_error = None
+        self.thread = threading.Thread(
+            target=self.run, name="write-behind", daemon=True
+        )
+        self.thread.start()
+        atexit.register(self.close)
+
+    @property
+    def pending(self):
+        return self.queue.unfinished_tasks
+
+    def put(self, sql, params, timeout=None):
+        """Enqueue one write, blocking while the queue is full"""
+        if self.closed:
+            raise RuntimeError("write-behind queue is closed")
+        self.queue.put((sql, params), timeout=timeout)
+
+    def flush(self, timeout=None):
+        """Wait until every enqueued write is committed; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(_STOP)
+        self.thread.join()
+
+    def run(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self.queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                if _STOP in batch:
+                    stopping = True
+                writes = [item for item in batch if item is not _STOP]
+                try:
+                    if writes:
+                        self.write_batch(conn, writes)
+                except Exception as e:
+                    # Never let the writer thread die: flush() and put() rely on it
+                    self.last_error = str(e)
+                    self.failed += len(writes)
+                    logger.exception("Dropped %d write-behind writes", len(writes))
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+        finally:
+            conn.close()
+
+    def execute_writes(self, conn, writes):
+        """Commit writes as one transaction, retrying while the database is
+        locked or busy; other errors are raised straight away"""
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with timer("db.write_behind_batch"), conn:
+                    # Consecutive writes with the same statement share one executemany
+                    start = 0
+                    while start < len(writes):
+                        sql = writes[start][0]
+                        end = start
+                        while end < len(writes) and writes[end][0] == sql:
+                            end += 1
+                        conn.executemany(sql, [p for _, p in writes[start:end]])
+                        start = end
+                return
+            except sqlite3.OperationalError:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(0.1 * attempt)
+
+    def write_batch(self, conn, writes):
+        try:
+            self.execute_writes(conn, writes)
+            self.written += len(writes)
+            return
+        except Exception as e:
+            self.last_error = str(e)
+            if len(writes) == 1:
+                self.drop_write(writes[0], e)
+                return
+
+        # One bad row must not cost the rest of the batch
+        for write in writes:
+            try:
+                self.execute_writes(conn, [write])
+                self.written += 1
+            except Exception as e:
+                self.last_error = str(e)
+                self.drop_write(write, e)
+
+    def drop_write(self, write, error):
+        self.failed += 1
+        sql, params = write
+        logger.error(
+            "Dropped write-behind write %s with params %.200r: %s",
+            " ".join(sql.split())[:80],
+            params,
+            error,
+        )